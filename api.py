@@ -1,26 +1,331 @@
 from fastapi import FastAPI, UploadFile, File
-import tempfile
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
+from typing import List, Optional
+import asyncio
+import mmap
 import os
-from main import parse_dekont 
+import time
+import zipfile
+import executor
+import extract
+import limits
+import metrics
+import samples
+from cache import result_cache, content_key
+from jobs import job_store, JOBS_CONCURRENCY
+from main import parse_traced, extract_range, cached_result, result_key, parse_segments, read_segments
+from parsers.base import parse_fields
+from result import dumps
 
 app = FastAPI()
 
+
+class FastJSONResponse(JSONResponse):
+    # Parser sonuçları (Result) doğrudan orjson ile (yoksa json) serileştirilir;
+    # endpoint bu yanıtı döndüğü için FastAPI'nin jsonable_encoder turu da atlanır
+    def render(self, content):
+        return dumps(content)
+
+# /parse/batch'te aynı anda işlenen (belleğe alınmış) belge sayısı üst sınırı
+BATCH_CONCURRENCY = int(os.environ.get("PARSE_BATCH_CONCURRENCY", "0")) or 2 * (os.cpu_count() or 1)
+
+# Worker'lar (ya da thread modunda API süreci) parser'ları yükleyip ısıtınca dolar
+_warmup = {"ready": False, "report": None}
+_jobs = {"task": None}
+# Sürmekte olan parse'lar: sonuç anahtarı -> Task. Aynı PDF (tekrar deneyen
+# istemciler) aynı anda birden çok kez gelirse tek parse yapılır, hepsi bekler.
+_inflight = {}
+
+async def _warm():
+    try:
+        _warmup["report"] = await executor.warmup()
+        _warmup["ready"] = True
+    except Exception as e:
+        _warmup["report"] = {"error": str(e)}
+
+@app.on_event("startup")
+async def startup():
+    # Süreç havuzu API ayağa kalkarken ısıtılır, ilk istek beklemez. Isınma
+    # arka planda sürer; /ready tamamlandığını bildirir.
+    executor.start()
+    loop = asyncio.get_running_loop()
+    loop.create_task(_warm())
+    # /jobs kuyruğu: önceki çalışmadan kalan belgeler de buradan devam eder
+    _jobs["task"] = loop.create_task(job_store.dispatch(
+        _parse_job, JOBS_CONCURRENCY or executor.info()["pool_size"] or BATCH_CONCURRENCY))
+
+@app.on_event("shutdown")
+def shutdown():
+    if _jobs["task"] is not None:
+        _jobs["task"].cancel()
+    executor.stop()
+
+def _upload_source(upload):
+    # UploadFile bir SpooledTemporaryFile: küçük dosyalar bellekte (BytesIO),
+    # büyükler diske taşınmış durumda. Bellektekini kopyalamadan, diskteki
+    # dosyayı da mmap ile okuyoruz; temp dosyaya yeniden yazma yok.
+    spooled = upload.file
+    spooled.seek(0)
+    inner = getattr(spooled, "_file", spooled)
+    if getattr(spooled, "_rolled", False) and hasattr(inner, "fileno"):
+        inner.flush()
+        try:
+            return mmap.mmap(inner.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # boş dosya mmap edilemez
+            return b""
+    if hasattr(inner, "getbuffer"):
+        inner.seek(0)
+        return inner
+    return spooled.read()
+
+def _as_bytes(source):
+    if isinstance(source, bytes):
+        return source
+    return source.getvalue() if hasattr(source, "getvalue") else source[:]
+
+async def _parse_source(source, bank=None, fields=None, debug=False):
+    # Aynı dekont tekrar yüklendiyse parse maliyeti hiç ödenmez. debug
+    # sonuçları ham metin taşıdığı için cache'e bakılmaz, yazılmaz.
+    key = content_key(source)
+    # Disk katmanı (SQLite) event loop'u bloklamasın diye cache thread'de okunur/yazılır
+    cached = None if debug else await asyncio.to_thread(cached_result, key, bank, fields)
+    if cached is not None:
+        return cached
+
+    # Aynı anahtarla süren bir parse varsa onun sonucu beklenir. shield: bekleyen
+    # isteklerden biri iptal edilirse ortak iş iptal olmaz.
+    flight = result_key(key, bank, fields) + ("#debug" if debug else "")
+    task = _inflight.get(flight)
+    if task is not None:
+        metrics.coalesced()
+        return await asyncio.shield(task)
+
+    # Süreç havuzuna sadece bytes taşınabilir (pickle), thread modunda
+    # kaynak olduğu gibi (BytesIO / mmap) verilir.
+    payload = _as_bytes(source) if executor.uses_processes() else source
+    task = _inflight[flight] = asyncio.ensure_future(_parse_miss(payload, key, bank, fields, debug))
+    task.add_done_callback(lambda _: _inflight.pop(flight, None))
+    return await asyncio.shield(task)
+
+async def _split_pages(payload, bank):
+    # EXTRACT_SPLIT_PAGES ve üstü sayfalı PDF'lerin metni sayfa aralıklarına
+    # bölünüp worker'larda paralel çıkarılır, sayfa sırasıyla birleştirilir.
+    # {backend: sayfalar} ya da (bölünmediyse) None
+    if not (extract.SPLIT_PAGES and executor.uses_processes() and extract.EXTRACT_MODE == "full"):
+        return None
+    try:
+        count = await asyncio.to_thread(extract.page_count, payload)
+    except Exception:
+        return None  # bozuk PDF'in hatası normal yoldan dönsün
+    if count < extract.SPLIT_PAGES:
+        return None
+    limits.check_pages(count)
+    return await _extract_pages(payload, bank, count)
+
+async def _extract_pages(payload, bank, count):
+    # Sayfasız PDF'te None: metin normal yoldan (worker'da) çıkarılır
+    ranges = extract.split_ranges(count, executor.POOL_SIZE)
+    if not ranges:
+        return None
+    parts = await asyncio.gather(*(executor.run(extract_range, payload, bank, a, b) for a, b in ranges))
+    return {parts[0][0]: [page for _, chunk in parts for page in chunk]}
+
+async def _parse_miss(payload, key, bank, fields, debug):
+    # CPU yoğun parse event loop'u bloklamasın diye worker havuzunda koşar.
+    # Cache'e burada (ana süreçte) yazılır, worker'ın ayrıca bakmasına gerek yok.
+    try:
+        start = time.perf_counter()
+        pages = await _split_pages(payload, bank)
+        split = time.perf_counter() - start
+        result, trace = await executor.run(parse_traced, payload, bank=bank, fields=fields, debug=debug,
+                                           pages=pages)
+    except Exception:
+        metrics.error()
+        raise
+    if pages is not None:
+        # Paralel çıkarma worker trace'inde yok; duvar saati süresi extract'a yazılır
+        trace["stages"]["extract"] = trace["stages"].get("extract", 0.0) + split
+    metrics.observe(trace)
+    samples.record(trace)
+    if not debug:
+        await asyncio.to_thread(result_cache.put, result_key(key, bank, fields), result)
+    return result
+
+async def _parse_opened(open_source, bank=None, fields=None, debug=False):
+    # open_source: kaynağı (bytes / BytesIO / mmap) ancak sırası gelince üretir
+    source = None
+    try:
+        fields = parse_fields(fields)
+        source = open_source()
+        return await _parse_source(source, bank, fields, debug)
+    except limits.LimitExceeded as e:
+        return e.as_dict()
+    except Exception as e:
+        return {"error": str(e)}
+    finally:
+        if isinstance(source, mmap.mmap):
+            source.close()
+
 @app.post("/parse")
-async def parse_pdf(file: UploadFile = File(...)):
-    suffix = os.path.splitext(file.filename)[1]
-    with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as tmp:
-        tmp.write(await file.read())
-        tmp_path = tmp.name
+async def parse_pdf(file: UploadFile = File(...), bank: Optional[str] = None, fields: Optional[str] = None,
+                    debug: bool = False):
+    # bank: istemci bankayı biliyorsa (?bank=garanti) banka tespiti atlanır
+    # fields: sadece istenen alanlar (?fields=tutar,islemtarihi); parser gerisini hiç çıkarmaz
+    # debug: ?debug=1 ile sonuçta ham metnin başı da döner (varsayılan kapalı, PII)
+    return FastJSONResponse(await _parse_opened(lambda: _upload_source(file), bank, fields, debug))
+
+def _batch_items(files):
+    # (ad, yükleyici) üretir. ZIP içindeki PDF'ler sıraları gelene kadar
+    # açılmaz; batch ne kadar büyük olursa olsun bellekte en fazla
+    # BATCH_CONCURRENCY belge bulunur.
+    for upload in files:
+        upload.file.seek(0)
+        if zipfile.is_zipfile(upload.file):
+            upload.file.seek(0)
+            archive = zipfile.ZipFile(upload.file)
+            for info in archive.infolist():
+                if info.is_dir() or not info.filename.lower().endswith(".pdf"):
+                    continue
+                yield f"{upload.filename}/{info.filename}", lambda a=archive, i=info: a.read(i)
+        else:
+            yield upload.filename, lambda u=upload: _upload_source(u)
+
+async def _batch_one(index, name, open_source, bank, fields, debug):
+    result = await _parse_opened(open_source, bank, fields, debug)
+    return {"index": index, "filename": name, **result}
+
+async def _batch_stream(files, bank, fields=None, debug=False):
+    # Belgeler worker havuzunda eş zamanlı işlenir, her biri bitince
+    # (tamamlanma sırasıyla) bir NDJSON satırı olarak gönderilir
+    pending = set()
+    for index, (name, open_source) in enumerate(_batch_items(files)):
+        if len(pending) >= BATCH_CONCURRENCY:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                yield dumps(task.result()) + b"\n"
+        pending.add(asyncio.ensure_future(_batch_one(index, name, open_source, bank, fields, debug)))
+    for task in asyncio.as_completed(pending):
+        yield dumps(await task) + b"\n"
+
+@app.post("/parse/batch")
+async def parse_batch(files: List[UploadFile] = File(...), bank: Optional[str] = None,
+                      fields: Optional[str] = None, debug: bool = False):
+    # Çok sayıda PDF ya da PDF'ler içeren ZIP arşivi(leri); yanıt
+    # application/x-ndjson, her satırda index ve filename alanlarıyla bir sonuç
+    return StreamingResponse(_batch_stream(files, bank, fields, debug), media_type="application/x-ndjson")
+
+async def _multi_group(first, segments, payload, bank, fields, debug, pages):
+    # Bir grup dekont tek worker işinde; satırlar grup bitince gönderilir.
+    # Süre sınırları dekont başına: yumuşak sınır her dekontta ayrı, sert CPU
+    # sınırı dekont sayısıyla ölçekli
+    lines = []
     try:
-        # Yeni kurguladığımız main.py'deki fonksiyonu çağırıyoruz
-        result = parse_dekont(tmp_path)
+        parsed = await executor.run_group(parse_segments, len(segments), payload, segments, bank=bank,
+                                          fields=fields, debug=debug, pages=pages, limited=True)
     except Exception as e:
-        result = {"error": str(e)}
+        metrics.error()
+        error = e.as_dict() if isinstance(e, limits.LimitExceeded) else {"error": str(e)}
+        parsed = [(start, stop, [error], None) for start, stop in segments]
+    for i, (start, stop, results, trace) in enumerate(parsed, first):
+        if trace is not None:
+            metrics.observe(trace)
+            samples.record(trace)
+        for j, result in enumerate(results):
+            lines.append(dumps({"segment": i, "pages": [start + 1, stop], "item": j, **result}) + b"\n")
+    return lines
+
+async def _multi_stream(file, bank, fields, debug):
+    # Sayfalar worker'larda paralel çıkarılır, dekont sınırları ana süreçte
+    # bulunur, dekontlar havuz boyutu kadar gruba bölünüp paralel parse edilir
+    source = None
+    try:
+        fields = parse_fields(fields)
+        source = _upload_source(file)
+        pages = None
+        if executor.uses_processes():
+            source = _as_bytes(source)
+            count = await asyncio.to_thread(extract.page_count, source)
+            limits.check_pages(count)
+            pages = await _extract_pages(source, bank, count)
+        pages, segments = await executor.run(read_segments, source, bank, pages)
+        parts = extract.split_ranges(len(segments), executor.POOL_SIZE if executor.uses_processes() else 1)
+        tasks = [_multi_group(a, segments[a:b], source, bank, fields, debug, pages) for a, b in parts]
+        for task in asyncio.as_completed(tasks):
+            for line in await task:
+                yield line
+    except limits.LimitExceeded as e:
+        yield dumps(e.as_dict()) + b"\n"
+    except Exception as e:
+        yield dumps({"error": str(e)}) + b"\n"
     finally:
-        if os.path.exists(tmp_path):
-            os.remove(tmp_path)
-    return result
+        if isinstance(source, mmap.mmap):
+            source.close()
+
+@app.post("/parse/multi")
+async def parse_multi(file: UploadFile = File(...), bank: Optional[str] = None, fields: Optional[str] = None,
+                      debug: bool = False):
+    # Çok dekontlu tek PDF (toplu e-dekont dökümü, maaş ödeme raporu): her
+    # dekont (ya da rapordaki her işlem) ayrı bir NDJSON satırı; segment
+    # dekontun sırası, pages sayfa aralığı (1'den), item dekont içindeki işlem
+    return StreamingResponse(_multi_stream(file, bank, fields, debug), media_type="application/x-ndjson")
+
+async def _parse_job(payload, bank, fields, debug):
+    return await _parse_opened(lambda: payload, bank, fields, debug)
+
+@app.post("/jobs", status_code=202)
+async def submit_job(files: List[UploadFile] = File(...), bank: Optional[str] = None,
+                     fields: Optional[str] = None, debug: bool = False):
+    # /parse/batch'in asenkron hali: PDF'ler (ZIP'ler açılarak) kuyruğa yazılır,
+    # bağlantı parse'ı beklemez. Sonuç GET /jobs/{id} ile alınır.
+    try:
+        parse_fields(fields)
+    except ValueError as e:
+        return JSONResponse({"error": str(e)}, status_code=400)
+    items = []
+    for name, open_source in _batch_items(files):
+        source = open_source()
+        try:
+            items.append((name, _as_bytes(source)))
+        finally:
+            if isinstance(source, mmap.mmap):
+                source.close()
+    job_id = await asyncio.to_thread(job_store.submit, items, bank, fields, debug)
+    return JSONResponse({"id": job_id, "status": "queued" if items else "done", "total": len(items)},
+                        status_code=202)
+
+@app.get("/jobs/{job_id}")
+def job_status(job_id: str):
+    # status: queued / running / done; results bitmiş belgeleri index sırasıyla içerir
+    job = job_store.get(job_id)
+    if job is None:
+        return JSONResponse({"error": "iş bulunamadı"}, status_code=404)
+    return FastJSONResponse(job)
+
+@app.get("/jobs")
+def jobs_stats():
+    return job_store.stats()
+
+@app.get("/ready")
+def ready():
+    # Readiness probe: ısınma bitene kadar 503
+    body = {"ready": _warmup["ready"], "executor": executor.info(), "warmup": _warmup["report"]}
+    return JSONResponse(body, status_code=200 if _warmup["ready"] else 503)
+
+@app.get("/cache")
+def cache_stats():
+    return result_cache.stats()
+
+@app.get("/debug/samples")
+def debug_samples():
+    # PARSER_DEBUG_SAMPLE ile örneklenen ham metinler (en yeni başta)
+    return {"stats": samples.stats(), "samples": samples.dump()}
+
+@app.get("/metrics", response_class=PlainTextResponse)
+def metrics_text():
+    # Prometheus scrape: aşama süreleri (banka/format dalı etiketli), dekont,
+    # sayfa ve cache sayaçları
+    return PlainTextResponse(metrics.render(result_cache.stats()), media_type="text/plain; version=0.0.4")
 
 @app.get("/")
 def home():
-    return {"status": "API modular system alive", "endpoint": "/parse"}
+    return {"status": "API modular system alive", "endpoint": "/parse", "batch": "/parse/batch", "multi": "/parse/multi", "jobs": "/jobs", "executor": executor.info()}
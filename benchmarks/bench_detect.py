@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*-
+# Banka tespit maliyetinin doküman uzunluğuyla nasıl ölçeklendiğini ölçer.
+#   python benchmarks/bench_detect.py [--repeat 20]
+# "legacy" sütunu eski if-zinciri + satır satır filtre kopyasıdır (karşılaştırma için).
+# "detect" detect_bank'in sıralı anahtar kelime zinciridir.
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from detect import detect_bank
+
+
+def legacy_banka_tespit(text):
+    lines = text.split('\n')
+    head_text = "\n".join(lines[:10]).upper()
+    for bank, kws in [
+        ("vakif", ["VAKIFBANK"]), ("garanti", ["GARANTI", "GARANTİ"]), ("ziraat", ["ZIRAAT", "ZİRAAT"]),
+        ("akbank", ["AKBANK"]), ("yapikredi", ["YAPI KREDI", "YAPIKREDI"]),
+        ("isbank", ["IS BANKASI", "İŞ BANKASI"]), ("enpara", ["ENPARA", "QNB"]), ("kuveytturk", ["KUVEYT"]),
+        ("halkbank", ["HALKBANK"]), ("ing", ["ING"]), ("teb", ["TÜRK EKONOMİ BANKASI", "TEB"]),
+        ("vakifkatilim", ["VAKIF KATILIM", "VAKIFKATILIM"]),
+    ]:
+        if any(k in head_text for k in kws):
+            return bank
+    filtered_lines = []
+    for line in lines:
+        line_up_no_space = line.upper().replace(" ", "")
+        if any(x in line_up_no_space for x in ["ALICIBANKA", "ALICI BANKA", "ALICI", "KATILIMCI"]):
+            continue
+        filtered_lines.append(line)
+    up = "\n".join(filtered_lines).upper()
+    for bank, kws in [
+        ("kuveytturk", ["KUVEYT"]),
+        ("ziraat", ["WWW. ZIRAATBANK.COM.TR", "T.C. ZİRAAT BANKASI A.Ş.", "ZİRAAT MOBİL"]),
+        ("isbank", ["WWW.ISBANK.COM.TR", "İŞCEP", "ISCEP", "TÜRKİYE İŞ BANKASI A.Ş."]),
+        ("denizbank", ["DENIZBANK", "DENİZBANK", "DENIZ GAYRIMENKUL"]),
+        ("enpara", ["ENPARA", "FINANSBANK", "FİNANSBANK", "QNB"]),
+        ("garanti", ["WWW.GARANTIBBVA.COM.TR", "T. GARANTİ BANKASI A.Ş.", "GARANTI", "GARANTİ"]),
+        ("vakif", ["VAKIFBANK", "TÜRKİYE VAKIFLAR BANKASI T.A.O", "WWW.VAKIFBANK.COM.TR", "SİCİL NUMARASI: 776444"]),
+        ("yapikredi", ["WWW.YAPIKREDI.COM.TR", "YAPI VE KREDİ BANKASI A.Ş.", "MERSIS NO: 0937002089200741"]),
+        ("halkbank", ["4560004685", "0456000468500132", "HALKBANK.COM.TR"]),
+        ("ziraat", ["ZIRAATBANK", "ZİRAAT BANKASI", "ZIRAAT MOBIL"]),
+        ("ing", ["WWW. ING.COM.TR", "ING BANK A.Ş."]), ("teb", ["TÜRK EKONOMİ BANKASI", "TEB"]),
+        ("vakifkatilim", ["VAKIF KATILIM", "VAKIFKATILIM"]),
+        ("akbank", ["AKBANK", "AKBANK T.A.Ş", "WWW.AKBANK.COM", "GENEL MÜDÜRLÜK: SABANCI CENTER",
+                    "VERGİ NO: 0150015264"]),
+    ]:
+        if any(k in up for k in kws):
+            return bank
+    return "bilinmiyor"
+
+
+FILLER = (
+    "01.01.2025 HESAPTAN HESABA HAVALE REF 123456 ACIKLAMA KIRA ODEMESI 1.250,00 TL\n"
+    "Alıcı Banka : Denizbank\n"
+    "İşlem Tarihi : 02.01.2025  Tutar : 300,00  Bakiye : 12.000,00\n"
+)
+
+
+def make_doc(size, head, tail):
+    body = head + "\nDEKONT\n" + FILLER * (size // len(FILLER) + 1)
+    return body[:size] + "\n" + tail
+
+
+def bench(fn, text, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        t = time.perf_counter()
+        fn(text)
+        best = min(best, time.perf_counter() - t)
+    return best
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--repeat", type=int, default=20)
+    args = ap.parse_args()
+
+    scenarios = [
+        # Banka header'da: en sık durum
+        ("header", "T. GARANTİ BANKASI A.Ş.", ""),
+        # Header'da banka yok, sadece son satırda geçiyor: en kötü durum
+        ("body", "", "www.vakifbank.com.tr"),
+    ]
+    for name, head, tail in scenarios:
+        print(f"\n[{name}]")
+        print(f"{'chars':>9} {'legacy ms':>10} {'detect ms':>10} {'speedup':>8}")
+        for size in (1_000, 5_000, 20_000, 100_000, 500_000, 2_000_000):
+            text = make_doc(size, head, tail)
+            assert legacy_banka_tespit(text) == detect_bank(text)
+            old = bench(legacy_banka_tespit, text, args.repeat)
+            new = bench(detect_bank, text, args.repeat)
+            print(f"{size:>9} {old * 1000:>10.3f} {new * 1000:>10.3f} {old / new:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
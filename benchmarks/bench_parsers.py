@@ -0,0 +1,225 @@
+# -*- coding: utf-8 -*-
+# Sentetik korpus üzerinde uçtan uca parse benchmark'ı (ağ/gerçek veri gerekmez).
+#   python benchmarks/bench_parsers.py                          # rapor
+#   python benchmarks/bench_parsers.py --save baseline.json     # baseline kaydet
+#   python benchmarks/bench_parsers.py --compare baseline.json  # baseline ile karşılaştır
+#   python benchmarks/bench_parsers.py --corpus-dir /tmp/korpus # PDF'leri diske de yaz (bulk.py için)
+#   python benchmarks/bench_parsers.py --memory                 # dekont başına tepe bellek (tracemalloc)
+#
+# Üç bölüm ölçülür:
+#   pdf   : PDF bytes -> parse_traced (read, extract, detect, parse, finalize aşamaları)
+#   text  : hazır metin -> banka_tespit + parser (PDF maliyeti olmadan detect/parse/finalize)
+#   micro : utils.parse_amount
+# Karşılaştırmada hem sonuçlar (her belgenin çıktısının hash'i) hem de aşama
+# p50/p99 süreleri baseline ile kıyaslanır; sonuç farkı ya da tolerans üstü
+# yavaşlama varsa çıkış kodu 1 olur.
+import argparse
+import hashlib
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import main as pipeline
+import metrics
+import registry
+from corpus import generate, tr_amount, en_amount
+from document import Document
+from pdfgen import build_pdf
+from utils import normalize_text, parse_amount
+
+
+def percentile(sorted_values, q):
+    if not sorted_values:
+        return 0.0
+    i = min(len(sorted_values) - 1, max(0, int(round(q / 100 * len(sorted_values) + 0.5)) - 1))
+    return sorted_values[i]
+
+
+def summarize(samples):
+    # {aşama: [saniye, ...]} -> {aşama: {n, mean, p50, p90, p99, ops}} (süreler ms)
+    out = {}
+    for name, values in samples.items():
+        values = sorted(values)
+        total = sum(values)
+        out[name] = {
+            "n": len(values),
+            "mean": total / len(values) * 1000,
+            "p50": percentile(values, 50) * 1000,
+            "p90": percentile(values, 90) * 1000,
+            "p99": percentile(values, 99) * 1000,
+            "ops": len(values) / total if total else 0.0,
+        }
+    return out
+
+
+def digest(result):
+    clean = {k: v for k, v in result.items() if not k.startswith("_debug")}
+    return hashlib.sha1(json.dumps(clean, sort_keys=True, ensure_ascii=False).encode()).hexdigest()[:16]
+
+
+def _add(samples, trace, prefix):
+    total = 0.0
+    for stage, seconds in trace["stages"].items():
+        samples.setdefault(f"{prefix}/{stage}", []).append(seconds)
+        total += seconds
+    samples.setdefault(f"{prefix}/total", []).append(total)
+
+
+def bench_pdf(docs, repeat, samples, results, memory):
+    for name, bank, branch, pdf, _ in docs:
+        for r in range(repeat):
+            result, trace = pipeline.parse_traced(pdf)
+            _add(samples, trace, "pdf")
+            if r == 0:
+                results[name] = digest(result)
+                if trace["peak_bytes"] is not None:
+                    memory.setdefault(bank, []).append(trace["peak_bytes"])
+
+
+def parse_text(text):
+    with metrics.tracing() as trace:
+        doc = Document(text)
+        bank = pipeline.banka_tespit(doc)
+        with metrics.stage("parse"):
+            instance = registry.get(bank)(doc)
+            result = instance.parse()
+        trace.bank, trace.branch = bank, instance.branch
+    return result, trace.as_dict()
+
+
+def bench_text(docs, repeat, samples, per_branch):
+    misdetected = []
+    for name, bank, branch, _, text in docs:
+        for _ in range(repeat):
+            result, trace = parse_text(text)
+            _add(samples, trace, "text")
+            per_branch.setdefault(f"{bank}/{branch}", []).append(sum(trace["stages"].values()))
+        if trace["bank"] != bank:
+            misdetected.append(f"{name} -> {trace['bank']}")
+    return misdetected
+
+
+def bench_amounts(count, repeat, samples):
+    values = [i * 37.13 for i in range(1, count + 1)]
+    strings = [tr_amount(v) for v in values] + [en_amount(v) for v in values]
+    for _ in range(repeat):
+        for s in strings:
+            t = time.perf_counter()
+            parse_amount(s)
+            samples.setdefault("micro/parse_amount", []).append(time.perf_counter() - t)
+
+
+def print_table(stats):
+    print(f"{'aşama':<22} {'n':>7} {'mean ms':>9} {'p50 ms':>9} {'p90 ms':>9} {'p99 ms':>9} {'ops/sn':>10}")
+    for name in sorted(stats):
+        s = stats[name]
+        print(f"{name:<22} {s['n']:>7} {s['mean']:>9.3f} {s['p50']:>9.3f} {s['p90']:>9.3f} "
+              f"{s['p99']:>9.3f} {s['ops']:>10.1f}")
+
+
+def compare(report, baseline, tolerance):
+    failed = False
+    changed = sorted(name for name, d in report["results"].items()
+                     if name in baseline["results"] and baseline["results"][name] != d)
+    missing = sorted(set(baseline["results"]) - set(report["results"]))
+    if changed or missing:
+        failed = True
+        print(f"\nSONUÇ FARKI: {len(changed)} belge değişti, {len(missing)} belge eksik")
+        for name in changed[:20]:
+            print(f"  {name}")
+    else:
+        print(f"\nSonuçlar baseline ile aynı ({len(report['results'])} belge)")
+
+    print(f"\n{'aşama':<22} {'p50 base':>9} {'p50 yeni':>9} {'oran':>6} {'p99 base':>9} {'p99 yeni':>9} {'oran':>6}")
+    for name in sorted(report["stages"]):
+        if name not in baseline["stages"]:
+            continue
+        old, new = baseline["stages"][name], report["stages"][name]
+        r50 = new["p50"] / old["p50"] if old["p50"] else 1.0
+        r99 = new["p99"] / old["p99"] if old["p99"] else 1.0
+        flag = ""
+        if r50 > 1 + tolerance:
+            flag, failed = "YAVAŞ", True
+        elif r50 < 1 / (1 + tolerance):
+            flag = "HIZLI"
+        print(f"{name:<22} {old['p50']:>9.3f} {new['p50']:>9.3f} {r50:>5.2f}x "
+              f"{old['p99']:>9.3f} {new['p99']:>9.3f} {r99:>5.2f}x  {flag}")
+    return failed
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--per-branch", type=int, default=10, help="her format dalı için belge sayısı")
+    ap.add_argument("--pages", type=int, default=1, help="belge başına sayfa (fazlası hesap hareketi)")
+    ap.add_argument("--repeat", type=int, default=3)
+    ap.add_argument("--seed", type=int, default=1234)
+    ap.add_argument("--skip-pdf", action="store_true", help="sadece metin ve mikro ölçümler")
+    ap.add_argument("--corpus-dir", default=None, help="üretilen PDF'leri bu dizine de yaz")
+    ap.add_argument("--save", default=None, help="raporu baseline olarak kaydet")
+    ap.add_argument("--compare", default=None, help="bu baseline ile karşılaştır")
+    ap.add_argument("--tolerance", type=float, default=0.2, help="p50 için kabul edilen yavaşlama oranı")
+    ap.add_argument("--memory", action="store_true",
+                    help="PDF bölümünde dekont başına tepe belleği ölç (süreleri şişirir, --compare ile kullanmayın)")
+    args = ap.parse_args()
+    metrics.TRACE_MEMORY = metrics.TRACE_MEMORY or args.memory
+    registry.warmup()
+
+    docs = []
+    for name, bank, branch, pages in generate(args.per_branch, args.seed, args.pages):
+        pdf = None if args.skip_pdf and not args.corpus_dir else build_pdf(pages)
+        text = normalize_text("".join(p + "\n" for p in pages))
+        docs.append((name, bank, branch, pdf, text))
+        if args.corpus_dir:
+            os.makedirs(os.path.join(args.corpus_dir, bank), exist_ok=True)
+            with open(os.path.join(args.corpus_dir, bank, name + ".pdf"), "wb") as f:
+                f.write(pdf)
+    print(f"korpus: {len(docs)} belge, {len({(d[1], d[2]) for d in docs})} format dalı, "
+          f"extract backend: {pipeline.backend_for_bank(None)}")
+
+    samples, results, per_branch, memory = {}, {}, {}, {}
+    if not args.skip_pdf:
+        bench_pdf(docs, args.repeat, samples, results, memory)
+    misdetected = bench_text(docs, args.repeat, samples, per_branch)
+    if misdetected:
+        print(f"UYARI: {len(misdetected)} belgede banka yanlış tespit edildi: {', '.join(misdetected[:5])}")
+    bench_amounts(1000, args.repeat, samples)
+
+    stats = summarize(samples)
+    print()
+    print_table(stats)
+    print(f"\n{'banka/dal (text)':<30} {'p50 ms':>9} {'p99 ms':>9}")
+    for key, values in sorted(per_branch.items()):
+        values.sort()
+        print(f"{key:<30} {percentile(values, 50) * 1000:>9.3f} {percentile(values, 99) * 1000:>9.3f}")
+    if memory:
+        print(f"\n{'banka (tepe bellek)':<30} {'p50 MB':>9} {'max MB':>9}")
+        for bank, values in sorted(memory.items()):
+            values.sort()
+            print(f"{bank:<30} {percentile(values, 50) / 2**20:>9.2f} {values[-1] / 2**20:>9.2f}")
+
+    if args.skip_pdf:
+        # PDF aşaması yoksa sonuçlar metin yolundan alınır
+        results = {name: digest(parse_text(text)[0]) for name, _, _, _, text in docs}
+    report = {
+        "meta": {"per_branch": args.per_branch, "pages": args.pages, "seed": args.seed,
+                 "repeat": args.repeat, "skip_pdf": args.skip_pdf},
+        "stages": stats,
+        "results": results,
+    }
+    failed = False
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            failed = compare(report, json.load(f), args.tolerance)
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=1, ensure_ascii=False)
+        print(f"\nbaseline yazıldı: {args.save}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
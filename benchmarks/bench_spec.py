@@ -0,0 +1,356 @@
+# -*- coding: utf-8 -*-
+# spec.py ile bildirilen parser'ların elle yazılmış önceki sürümleriyle
+# eşdeğerliği ve hızı. Önceki sürümler aşağıda karşılaştırma için kopyadır.
+#   python benchmarks/bench_spec.py [--per-branch 50] [--pages 3] [--repeat 5]
+# Her belge tüm alanlarla ve her alan tek başına (fields=) iki sürümle de
+# parse edilir; EXPECTED dışındaki herhangi bir sonuç farkında çıkış kodu 1
+# olur. Süre sadece parse() (Document ve büyük harf görünümü tespitte zaten hazır).
+import argparse
+import os
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import registry
+from corpus import generate
+from document import Document
+from parsers.base import BaseParser, FIELDS, PARTY_FIELDS
+from patterns import table
+from utils import normalize_text, parse_amount
+
+
+P_ING = table(
+    "legacy_ing",
+    tarih=(r"İŞLEM\s*TARİHİ\s*[:\-]?\s*(\d{2}[./]\d{2}[./]\d{4})", re.I),
+    tutar=(r"İŞLEM\s*TUTARI\s*:\s*([\d\.,]+)", re.I),
+    sayin=(r"SAYIN\s+([^\n]+)", re.I),
+    hesap=(r"HESAP\s*:\s*([A-ZÇĞİÖŞÜ ]+)", re.I),
+    iban=(r"IBAN:\s*(TR[0-9 ]+)", re.I),
+)
+
+class LegacyIngParser(BaseParser):
+    def __init__(self, doc, fields=None):
+        super().__init__(doc, "ing", fields)
+
+    def parse(self):
+        raw = self.text
+        up = self.doc.tr_up
+        
+        # 1. Tür Tespiti
+        if "MAAŞ" in up: self.data["is_maas"] = True
+        self.data["is_giden"] = True
+        
+        # 2. Tarih Yakalama (Örn: İşlem Tarihi : 27/02/2026)
+        m_date = P_ING.tarih.search(raw)
+        if m_date: self.data["islemtarihi"] = m_date.group(1).replace("/", ".")
+        
+        # 3. Tutar Yakalama (Örn: İŞLEM TUTARI : 9,826.42 TL)
+        m_tutar = P_ING.tutar.search(raw)
+        if m_tutar:
+            # ING dekontunda virgül binlik ayırıcı ise onu temizleyip parse ediyoruz
+            val = m_tutar.group(1).replace(",", "")
+            self.data["tutar"] = float(val)
+
+        if self.can_stop(*PARTY_FIELDS):
+            return self.finalize()
+
+        # 4. Gönderen (SAYIN ifadesinden sonra gelen kurum adı)
+        m_g = P_ING.sayin.search(raw)
+        if m_g: self.data["gonderen"] = m_g.group(1).strip()
+
+        # 5. Alıcı ve İsim Düzenleme (SOYİSİM İSİM -> İSİM SOYİSİM)
+        m_a = P_ING.hesap.search(raw)
+        if m_a:
+            tam_isim = m_a.group(1).strip()
+            parcalar = tam_isim.split()
+            if len(parcalar) >= 2:
+                # 'ÖZEN FATİH' -> 'FATİH ÖZEN'
+                # Son parçayı (Fatih) başa al, ilk parçayı (Özen) sona koy
+                soyisim = parcalar[0]
+                isim = " ".join(parcalar[1:])
+                self.data["alici"] = f"{isim} {soyisim}"
+            else:
+                self.data["alici"] = tam_isim
+
+        # 6. IBAN
+        m_iban = P_ING.iban.search(raw)
+        if m_iban: self.data["aliciiban"] = m_iban.group(1).replace(" ", "").strip()
+        
+        return self.finalize()
+
+
+P_KUVEYT = table(
+    "legacy_kuveytturk",
+    tutar=(r"Tutar\s*([\d\.,]+)", re.I),
+    tarih=(r"İşlemTarihi\s*(\d{2}\.\d{2}\.\d{4})", re.I),
+    gonderen=(r"GönderenKişi\s*(.*?)\s*(?=Alıcı)", re.I | re.S),
+    alici=(r"Alıcı\s*(.*?)\s*(?=GönderilenIBAN)", re.I | re.S),
+    alici_iban=(r"GönderilenIBAN\s*(TR[0-9 ]+)", re.I),
+)
+
+class LegacyKuveytTurkParser(BaseParser):
+    extract_backend = "pdfplumber"  # satır kırılımlarına göre çalışıyor
+
+    def __init__(self, doc, fields=None):
+        super().__init__(doc, "kuveytturk", fields)
+
+    def parse(self):
+        raw = self.text
+        up = self.up
+
+        # 1. Tür Tespiti
+        if "FAST" in up: self.data["is_fast"] = True
+        if "GİDEN" in up or "GIDEN" in up: self.data["is_giden"] = True
+        
+        # 2. Tutar Yakalama (Örn: Tutar 5.975,00TL)
+        m_tutar = P_KUVEYT.tutar.search(raw)
+        if m_tutar:
+            # Kuveyt Türk'te nokta binlik, virgül kuruş ayırıcıdır
+            self.data["tutar"] = parse_amount(m_tutar.group(1))
+
+        # 3. Tarih Yakalama (Örn: İşlemTarihi 04.11.202509:22)
+        # Tarih ve saat birleşik olduğu için sadece ilk 10 karakteri (gün.ay.yıl) alıyoruz
+        m_date = P_KUVEYT.tarih.search(raw)
+        if m_date: self.data["islemtarihi"] = m_date.group(1)
+
+        if self.can_stop(*PARTY_FIELDS):
+            return self.finalize()
+
+        # 4. Gönderen Kişi
+        # 'GönderenKişi' etiketinden başlayıp 'Alıcı' etiketine kadar olan kısmı alır
+        m_g = P_KUVEYT.gonderen.search(raw)
+        if m_g:
+            # İçindeki alt satırları temizleyip tek satıra indirir
+            self.data["gonderen"] = " ".join(m_g.group(1).split()).strip()
+
+        # 5. Alıcı İsmi
+        # 'Alıcı' etiketinden başlayıp 'GönderilenIBAN' etiketine kadar olan kısmı alır
+        m_a = P_KUVEYT.alici.search(raw)
+        if m_a:
+            self.data["alici"] = " ".join(m_a.group(1).split()).strip()
+
+        # 6. Alıcı IBAN
+        m_iban = P_KUVEYT.alici_iban.search(raw)
+        if m_iban:
+            self.data["aliciiban"] = m_iban.group(1).replace(" ", "").strip()
+
+        return self.finalize()
+
+
+P_VAKIFKATILIM = table(
+    "legacy_vakifkatilim",
+    tarih=(r"İşlem\s*:\s*(\d{2}/\d{2}/\d{4})", re.I),
+    tutar=(r"Tutar\s*([\d\.,]+)\s*TL", re.I),
+    gonderen=(r"Gönderen Kişi\s*:\s*(.+)", re.I),
+    alici=(r"Gönderilen Kişi\s*:\s*(.+)", re.I),
+    alici_hesap_no=(r"Gönderilen\s+Hesap No\s*:\s*([\d-]+)", re.I),
+)
+
+class LegacyVakifKatilimParser(BaseParser):
+    def __init__(self, doc, fields=None):
+        super().__init__(doc, "vakifkatilim", fields)
+
+    def parse(self):
+        raw = self.text
+        up = self.up
+
+        # 1. Tür Tespiti
+        if "HAVALE" in up: self.data["is_havale"] = True
+        if "EFT" in up or "FAST" in up: self.data["is_havale"] = True
+        if "MAAŞ" in up or "MAAS" in up: self.data["is_maas"] = True
+        self.data["is_giden"] = True
+
+        # 2. İşlem Tarihi Yakalama (Satır kırılımına duyarlı)
+        # 'İşlem :' ile başlayıp tarih formatına (03/11/2025) odaklanır
+        m_date = P_VAKIFKATILIM.tarih.search(raw)
+        if m_date:
+            self.data["islemtarihi"] = m_date.group(1).replace("/", ".")
+
+        # 3. Tutar Yakalama
+        m_tutar = P_VAKIFKATILIM.tutar.search(raw)
+        if m_tutar:
+            self.data["tutar"] = parse_amount(m_tutar.group(1))
+
+        if self.can_stop(*PARTY_FIELDS):
+            return self.finalize()
+
+        # 4. Gönderen Kişi
+        # 'Gönderen Kişi :' etiketinden satır sonuna kadar olan kısmı alır
+        m_gond = P_VAKIFKATILIM.gonderen.search(raw)
+        if m_gond:
+            self.data["gonderen"] = m_gond.group(1).strip()
+
+        # 5. Gönderilen (Alıcı) Kişi
+        m_alici = P_VAKIFKATILIM.alici.search(raw)
+        if m_alici:
+            self.data["alici"] = m_alici.group(1).strip()
+
+        # 6. IBAN / Hesap No (Vakıf Katılım'da genellikle Hesap No yazar)
+        m_hno = P_VAKIFKATILIM.alici_hesap_no.search(raw)
+        if m_hno:
+            self.data["aliciiban"] = m_hno.group(1).strip()
+
+        return self.finalize()
+
+
+P_ZIRAAT = table(
+    "legacy_ziraat",
+    # etiket indeksinden gelen değerler (başından eşleşir)
+    tarih_degeri=r"(\d{2}[./]\d{2}[./]\d{4})",
+    tutar_degeri=r"([\d\.,]+)",
+    uzun_iban_degeri=r"(TR[0-9 ]{20,34})",
+    iban_degeri=r"(TR[0-9 ]+)",
+    alici_degeri=r"([^/]+)",
+)
+
+class LegacyZiraatParser(BaseParser):
+    extract_backend = "pdfplumber"  # satır kırılımlarına göre çalışıyor
+
+    def __init__(self, doc, fields=None):
+        super().__init__(doc, "ziraat", fields)
+
+    def parse(self):
+        up = self.up
+        L = self.doc.labels
+
+        # 1. Tür Tespiti
+        is_fast = "HESAPTAN FAST" in up or "FAST İŞLEMİ" in up
+        is_havale = "HESAPTAN HESABA HAVALE" in up or "HAVALE TUTARI" in up
+        self.branch = "havale" if is_havale else "fast"
+        
+        # 2. Tarih ve Tutar (Format Düzeltmeli)
+        m_date = L.match(P_ZIRAAT.tarih_degeri, "İŞLEM TARİHİ")
+        if m_date:
+            # 31/10/2025 -> 31.10.2025 dönüşümü
+            self.data["islemtarihi"] = m_date.group(1).replace("/", ".")
+
+        # Tutar yakalama (Havale vs FAST etiket farkı)
+        m_tutar = L.match(P_ZIRAAT.tutar_degeri, "Havale Tutarı" if is_havale else "İşlem Tutarı")
+        if m_tutar: 
+            self.data["tutar"] = parse_amount(m_tutar.group(1))
+
+        if self.can_stop(*PARTY_FIELDS):
+            return self.finalize()
+
+        # 3. GÖNDEREN BİLGİLERİ (Şube Kodunun Altındaki IBAN)
+        # Ziraat'te gönderen IBAN her zaman belgenin üst bloğundaki 'IBAN :' etiketindedir.
+        m_gib = L.match(P_ZIRAAT.uzun_iban_degeri, "IBAN")
+        if m_gib:
+            self.data["gondereniban"] = m_gib.group(1).replace(" ", "").strip()[:26]
+
+        # Gönderen İsim (Şube adının yanındaki unvan)
+        if is_havale:
+            lines = self.doc.nonempty_lines
+            for ln in lines:
+                if "ŞUBE KODU/ADI" in ln.upper() and "ŞUBESİ" in ln.upper():
+                    self.data["gonderen"] = ln.upper().split("ŞUBESİ", 1)[1].strip()
+                    break
+        else:
+            v = L.first("Gönderen")
+            if v: self.data["gonderen"] = v.strip()
+
+        # 4. ALICI BİLGİLERİ (Alacaklı IBAN Etiketi)
+        if is_havale:
+            # Havale dekontu: Alacaklı Adı Soyadı ve Alacaklı IBAN
+            v = L.first("Alacaklı Adı Soyadı")
+            if v: self.data["alici"] = v.strip()
+            
+            m_aib = L.match(P_ZIRAAT.iban_degeri, "Alacaklı IBAN")
+            if m_aib: self.data["aliciiban"] = m_aib.group(1).replace(" ", "").strip()[:26]
+        else:
+            # FAST dekontu: Alıcı ve Alıcı Hesap etiketleri
+            m_alici = L.match(P_ZIRAAT.alici_degeri, "Alıcı")
+            if m_alici: self.data["alici"] = m_alici.group(1).strip()
+            
+            m_aib = L.match(P_ZIRAAT.iban_degeri, "Alıcı Hesap")
+            if m_aib: self.data["aliciiban"] = m_aib.group(1).replace(" ", "").strip()[:26]
+
+        return self.finalize()
+
+
+# Bilinen, kasıtlı farklar: banka/dal -> farkın beklendiği alanlar.
+# ziraat/havale_alacakli_once: eski sürüm gönderen IBAN'ı ilk "IBAN :"
+# eşleşmesinden okuyordu, bu "Alacaklı IBAN :" satırı da olabiliyordu (alıcının
+# IBAN'ı); spec tarayıcısında uzun etiketin içindeki "IBAN :" tetiklenmez.
+EXPECTED = {"ziraat/havale_alacakli_once": {"gondereniban"}}
+
+LEGACY = {
+    "ing": LegacyIngParser,
+    "kuveytturk": LegacyKuveytTurkParser,
+    "vakifkatilim": LegacyVakifKatilimParser,
+    "ziraat": LegacyZiraatParser,
+}
+
+
+def variants(text):
+    # Korpus metni ve satır düzeni bozulmuş halleri: boş satırlar, etiket
+    # çevresinde fazladan boşluk
+    yield "orijinal", text
+    yield "bos_satir", text.replace("\n", "\n\n")
+    yield "bosluk", re.sub(r"\s*:\s*", "  :  ", text)
+
+
+def timed(cls, text, repeat):
+    best = None
+    for _ in range(repeat):
+        doc = Document(text)
+        doc.up
+        start = time.perf_counter()
+        cls(doc).parse()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--per-branch", type=int, default=20)
+    ap.add_argument("--pages", type=int, default=1, help="belge başına sayfa (fazlası hesap hareketi)")
+    ap.add_argument("--repeat", type=int, default=5)
+    ap.add_argument("--seed", type=int, default=1234)
+    args = ap.parse_args()
+    registry.warmup()
+
+    diffs, expected, checked, times = [], 0, 0, {}
+    for name, bank, branch, pages in generate(args.per_branch, args.seed, args.pages):
+        if bank not in LEGACY:
+            continue
+        new, old = registry.get(bank), LEGACY[bank]
+        text = normalize_text("".join(p + "\n" for p in pages))
+        for kind, variant_text in variants(text):
+            for fields in [None] + [(f,) for f in FIELDS if f != "banka"]:
+                a = new(Document(variant_text), fields)
+                b = old(Document(variant_text), fields)
+                ra, rb = dict(a.parse()), dict(b.parse())
+                checked += 1
+                if ra != rb or a.branch != b.branch:
+                    changed = {k for k in set(ra) | set(rb) if ra.get(k) != rb.get(k)}
+                    if a.branch == b.branch and changed <= EXPECTED.get(f"{bank}/{branch}", set()):
+                        expected += 1
+                    else:
+                        diffs.append((name, kind, fields, ra, rb))
+        row = times.setdefault(f"{bank}/{branch}", ([], []))
+        row[0].append(timed(old, text, args.repeat))
+        row[1].append(timed(new, text, args.repeat))
+
+    print(f"eşdeğerlik: {checked} karşılaştırma, {len(diffs)} fark, {expected} beklenen fark (EXPECTED)")
+    for name, kind, fields, ra, rb in diffs[:10]:
+        print(f"  {name} [{kind}] fields={fields}")
+        for key in sorted(set(ra) | set(rb)):
+            if ra.get(key) != rb.get(key):
+                print(f"    {key}: spec={ra.get(key)!r} eski={rb.get(key)!r}")
+
+    print(f"\n{'banka/dal':<30} {'n':>4} {'eski µs':>9} {'spec µs':>9} {'oran':>6}")
+    for key, (old_t, new_t) in sorted(times.items()):
+        old_t.sort()
+        new_t.sort()
+        o, n = old_t[len(old_t) // 2] * 1e6, new_t[len(new_t) // 2] * 1e6
+        print(f"{key:<30} {len(old_t):>4} {o:>9.1f} {n:>9.1f} {n / o:>5.2f}x")
+    return 1 if diffs else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
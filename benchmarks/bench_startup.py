@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+# Worker soğuk başlangıç maliyeti: her ölçüm temiz bir Python sürecinde yapılır.
+#   python benchmarks/bench_startup.py [--repeat 5] [--top 15]
+# "import main" süresi (parse'a hazır olmayan, sadece modül yükleme) ile
+# registry.warmup() süresi (tüm parser'lar + pdfplumber/fitz) ayrı raporlanır;
+# --top ile -X importtime çıktısından en pahalı modüller listelenir.
+import argparse
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+_PROBE = """
+import time
+t0 = time.perf_counter()
+import main
+t1 = time.perf_counter()
+import registry
+registry.warmup()
+t2 = time.perf_counter()
+print(t1 - t0, t2 - t1)
+"""
+
+
+def probe():
+    out = subprocess.run([sys.executable, "-c", _PROBE], cwd=ROOT, capture_output=True, text=True, check=True)
+    imp, warm = out.stdout.splitlines()[-1].split()
+    return float(imp), float(warm)
+
+
+def import_profile(top):
+    # -X importtime: her modül için kümülatif mikro saniye (stderr)
+    out = subprocess.run([sys.executable, "-X", "importtime", "-c", "import main, registry; registry.warmup()"],
+                         cwd=ROOT, capture_output=True, text=True, check=True)
+    rows = []
+    for line in out.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        self_us, cum_us, name = line[len("import time:"):].split("|", 2)
+        rows.append((int(cum_us), int(self_us), name.strip()))
+    rows.sort(reverse=True)
+    return rows[:top]
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--repeat", type=int, default=5)
+    ap.add_argument("--top", type=int, default=15)
+    args = ap.parse_args()
+
+    samples = [probe() for _ in range(args.repeat)]
+    imports = sorted(s[0] for s in samples)
+    warms = sorted(s[1] for s in samples)
+    print(f"{'':<16} {'min ms':>9} {'median ms':>10}")
+    print(f"{'import main':<16} {imports[0] * 1000:>9.1f} {imports[len(imports) // 2] * 1000:>10.1f}")
+    print(f"{'warmup':<16} {warms[0] * 1000:>9.1f} {warms[len(warms) // 2] * 1000:>10.1f}")
+
+    print(f"\n{'kümülatif ms':>12} {'kendi ms':>9}  modül")
+    for cum, own, name in import_profile(args.top):
+        print(f"{cum / 1000:>12.1f} {own / 1000:>9.1f}  {name}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,345 @@
+# -*- coding: utf-8 -*-
+# Sentetik, anonim dekont korpusu. Her banka parser'ının her format dalı için
+# bir şablon var; isimler, tarihler, tutarlar ve (mod-97 geçerli) IBAN'lar
+# sabit bir seed ile üretilir, yani aynı seed her çalıştırmada birebir aynı
+# korpusu verir. Gerçek müşteri verisi içermez.
+import random
+from datetime import date, timedelta
+
+FIRST_NAMES = ["AHMET", "MEHMET", "AYŞE", "FATMA", "ZEYNEP", "EMRE", "ELİF", "BURAK", "SELİN", "OĞUZ",
+               "DERYA", "CAN", "GÖKHAN", "SEDA", "PINAR", "ESRA", "HAKAN", "İREM", "ŞULE", "ÇAĞRI"]
+LAST_NAMES = ["YILMAZ", "DEMİR", "KAYA", "ÇELİK", "ARSLAN", "YÜCEL", "ŞAHİN", "ERDEM", "YILDIZ", "KARA",
+              "KOÇ", "ÖZTÜRK", "TEKİN", "KILIÇ", "POLAT", "YURT", "AYDIN", "GÜNEŞ", "ERSOY", "ÇINAR"]
+COMPANIES = ["ACME YAZILIM A.Ş.", "BETA LOJİSTİK LTD", "GAMMA İNŞAAT SANAYİ VE TİCARET A.Ş.",
+             "DELTA TEKNOLOJİ A.Ş.", "OMEGA GIDA LTD"]
+
+# EFT kodları (iban.BANK_CODES ile aynı)
+CODES = {"ziraat": "00010", "halkbank": "00012", "vakif": "00015", "teb": "00032", "akbank": "00046",
+         "garanti": "00062", "isbank": "00064", "yapikredi": "00067", "ing": "00099", "enpara": "00111",
+         "denizbank": "00134", "kuveytturk": "00205", "vakifkatilim": "00210"}
+
+
+def tr_lower(s):
+    return s.replace("I", "ı").replace("İ", "i").lower()
+
+
+def make_iban(code, rng):
+    bban = code + "0" + "".join(rng.choice("0123456789") for _ in range(16))
+    check = 98 - int(bban + "292700") % 97
+    return f"TR{check:02d}{bban}"
+
+
+def spaced(iban):
+    return " ".join(iban[i:i + 4] for i in range(0, len(iban), 4))
+
+
+def tr_amount(v):
+    # 12345.6 -> "12.345,60"
+    return f"{v:,.2f}".replace(",", "_").replace(".", ",").replace("_", ".")
+
+
+def en_amount(v):
+    return f"{v:,.2f}"
+
+
+# (banka, dal, şablon). Şablon alanları:
+#   {G} {A}: gönderen/alıcı adı büyük harf, {g} {a}: küçük harf,
+#   {G1} {G2} / {A1} {A2}: ad ve soyad ayrı, {F}: firma ünvanı,
+#   {dot} gg.aa.yyyy, {slash} gg/aa/yyyy, {tr} 1.234,56, {en} 1,234.56,
+#   {ig} {ia}: gönderen/alıcı IBAN (4'lü gruplar), {ia_top} {ia_bottom}: alıcı IBAN iki satırda
+TEMPLATES = [
+    ("enpara", "qnb", """QNB Finansbank A.Ş.
+Enpara.com Müşteri Hizmetleri
+İşlem Tarihi {slash}
+GİDEN EFT DEKONTU
+MUSTERI UNVANI : {G}
+IBAN : {ig}
+GONDEREN {G} AÇIKLAMA kira
+ALICI ÜNVANI : {A} ALICI IBAN : {ia}
+ALICI IBAN : {ia}
+EFT TUTARI : {en}
+"""),
+    ("enpara", "legacy_giden", """ENPARA
+Dekont
+İşlem tarihi ve saati : {dot} 10:11
+GİDEN HAVALE
+TL {tr}
+MÜŞTERİ ÜNVANI : {G}
+Şube : Merkez
+IBAN : {ig}
+GÖNDEREN : {G} AÇIKLAMA: fatura
+ALICI ÜNVANI : {A} ALICI IBAN : {ia}
+ALICI IBAN : {ia}
+"""),
+    ("enpara", "legacy_gelen", """ENPARA
+GELEN HAVALE
+İşlem tarihi : {slash}
+TL {tr}
+Şube adı : Merkez Sayın {a}
+Vadesiz TL {ia}
+GÖNDEREN : {G} AÇIKLAMA kira
+"""),
+    ("garanti", "gelen_fast", """T. Garanti Bankası A.Ş.
+GELEN FAST DEKONTU
+SAYIN {A} MÜŞTERİ NO: 123456
+IBAN : {ia}
+İŞLEM TARİHİ : {slash}
+TUTAR : {tr} TL
+GÖNDEREN : {G} ****/**** MAH. ATATÜRK
+www.garantibbva.com.tr
+"""),
+    ("garanti", "fast", """GARANTİ BBVA
+FAST GİDEN
+SAYIN {G} TCKN: 12345678901
+IBAN: {ig}
+İŞLEM TARİHİ: {dot}
+TUTAR: {tr}
+ALACAKLI : {A} CAD. NO 5
+ALACAKLI IBAN : {ia}
+"""),
+    ("garanti", "maas", """GARANTI BBVA
+MAAS ÖDEMESİ DEKONTU
+SAYIN {G}
+KURUM : {F} SOK. 3
+ADI : {A}
+ALICI IBAN : {ia}
+DÜZENLENME TARİHİ : {slash}
+TUTAR : {tr}
+"""),
+    ("garanti", "havale", """GARANTİ BBVA
+HAVALE DEKONTU
+SAYIN {A}
+IBAN {ia}
+İŞLEM TARİHİ : {dot}
+BORÇLU HESAP : {G} MAH. CUMHURİYET
+TUTAR : {tr}
+"""),
+    ("garanti", "havale_alacakli", """GARANTİ BBVA
+HAVALE DEKONTU
+SAYIN {G}
+İŞLEM TARİHİ : {dot}
+ALACAKLI HESAP : {A}
+ALACAKLI IBAN : {ia}
+BORÇLU IBAN : TR64 0006 **** **** 0006 2987 65
+TUTAR : {tr}
+"""),
+    ("vakif", "tur1", """VAKIFBANK
+GİDEN EFT
+İŞLEM TARİHİ : {dot}
+İŞLEM TUTARI : {tr} TL
+ALICI AD SOYAD/UNVAN {A}
+{ia_top}
+{ia_bottom}
+{G}
+TR32 0001 5*** **** 7300 1234 56
+"""),
+    ("vakif", "tur2", """VAKIFBANK
+HAVALE
+İŞLEM TARİHİ {slash}
+{tr} TL
+{ia_top}
+HESAP NUMARASI ADSOYAD/UNVAN1 {G}
+{ia_bottom}
+"""),
+    ("vakif", "tur3", """VAKIFBANK
+GELEN HAVALE
+İŞLEM TARİHİ : {dot}
+İŞLEM TUTARI : {tr} TL
+GÖNDEREN AD SOYAD ALICI AD SOYAD
+{G} VELİ {a}
+MÜŞTERİ ÜNVANI : {A}
+"""),
+    ("yapikredi", "havale_borc", """www.yapikredi.com.tr
+HESAPTAN HESABA HAVALE-BORÇ
+İŞLEM TARİHİ : {dot}
+ISLEM TUTARI : -{tr}
+IBAN NO : {ig}
+ALACAKLI ADI : {A}
+ALACAKLI HESAP : 1234 IBAN : {ia}
+{G} Ticari Unvan
+"""),
+    ("yapikredi", "maas_raporu", """www.yapikredi.com.tr
+MAAŞ ÖDEME RAPORU
+Firma Ünvanı : {F}
+1 {slash} ÖDENDİ {tr} TL {A} 12345
+"""),
+    ("yapikredi", "standart", """www.yapikredi.com.tr
+FAST GİDEN
+İŞLEM TARİHİ : {dot}
+TUTARI : -{tr}
+GÖNDEREN ADI : {G} ÖDEMENİN
+ALICI ADI : {A} ALICI TCKN 123
+GÖNDEREN HESAP NO : 123 IBAN : {ig}
+ALICI HESAP : {ia}
+"""),
+    ("yapikredi", "gelen", """www.yapikredi.com.tr
+ALACAK DEKONTU
+İŞLEM TARİHİ : {dot}
+TUTAR : {tr}
+ÖDEME YAPAN İSİM/ÜNVAN : {G} YUKARIDAKİ
+{ig}
+"""),
+    ("ziraat", "fast", """T.C. ZİRAAT BANKASI A.Ş.
+HESAPTAN FAST
+İŞLEM TARİHİ : {slash}
+IBAN : {ig}
+Gönderen : {G}
+İşlem Tutarı : {tr}
+Alıcı : {A} / ACIKLAMA
+Alıcı Hesap : {ia}
+"""),
+    ("ziraat", "havale", """ZİRAAT BANKASI
+HESAPTAN HESABA HAVALE
+İŞLEM TARİHİ : {dot}
+Şube Kodu/Adı : 1234 / KIZILAY ŞUBESİ {G}
+IBAN : {ig}
+Havale Tutarı : {tr}
+Alacaklı Adı Soyadı : {A}
+Alacaklı IBAN : {ia}
+"""),
+    # Alacaklı bilgileri gönderen IBAN satırından önce: "Alacaklı IBAN :"
+    # içindeki "IBAN :" gönderen IBAN'ı sayılmamalı
+    ("ziraat", "havale_alacakli_once", """ZİRAAT BANKASI
+HESAPTAN HESABA HAVALE
+İŞLEM TARİHİ : {dot}
+Alacaklı Adı Soyadı : {A}
+Alacaklı IBAN : {ia}
+Şube Kodu/Adı : 1234 / KIZILAY ŞUBESİ {G}
+IBAN : {ig}
+Havale Tutarı : {tr}
+"""),
+    ("akbank", "default", """AKBANK T.A.Ş.
+MAAŞ ÖDEMESİ
+İşlem Tarihi/Saati : {dot} 14:00
+Adı Soyadı/Unvan : {F} Adı Soyadı/Unvan : {A}
+{ig}
+{ia}
+TOPLAM {tr} TL
+"""),
+    ("isbank", "para_aktarma", """TÜRKİYE İŞ BANKASI A.Ş.
+PARA AKTARMA
+İşlem Zamanı : {dot} 09:30
+Gönderici Hesap : {g} Alıcı Hesap : {a}
+{ig}
+{ia}
+Aktarılan Tutar : {tr}
+"""),
+    ("isbank", "default", """www.isbank.com.tr
+FAST
+Dekont Tarihi : {dot}
+İşlem Tutarı : {tr}
+Gönderici İsim/Ünvan : {g}
+Alıcı İsim /Ünvan : {a} Açıklama kira
+IBAN : {ig}
+Alıcı IBAN : {ia}
+"""),
+    ("denizbank", "default", """DENİZBANK A.Ş.
+FAST
+İşlem Tarihi {dot}
+Adı Soyadı {G1}
+{G2} İşlem Türü FAST
+Alıcı Adı Soyadı {A1}
+{A2} Alıcı IBAN {ia}
+IBAN {ig}
+Tutar {tr}
+"""),
+    ("halkbank", "default", """HALKBANK
+FAST PARA TRANSFERİ
+İŞLEM TARİHİ : {slash}
+İŞLEM TUTARI (TL) : {tr}
+GÖNDEREN : {G}
+GÖNDEREN IBAN : {ig}
+ALICI : {A}
+ALICI IBAN : {ia}
+"""),
+    ("halkbank", "amir_lehdar", """HALKBANK
+halkbank.com.tr
+Tarih : {slash}
+AMİR : 1234
+987 {G} 1234
+IBAN : {ig}
+LEHDAR : 5678
+55 {A}
+IBAN : {ia}
+TOPLAM {tr}
+"""),
+    ("ing", "default", """ING
+İşlem Tarihi : {slash}
+MAAŞ ÖDEMESİ
+SAYIN {F}
+HESAP : {A}
+IBAN: {ia}
+İŞLEM TUTARI : {en} TL
+"""),
+    ("teb", "default", """TÜRK EKONOMİ BANKASI A.Ş.
+GÖNDERILEN HAVALE
+Tarih-Saat: {dot} 10:00
+TL {tr}-
+Hesap Sahibi: {g}
+IBAN: {ig}
+Alacaklı Adı: {a}
+Alacaklı Hesap: {ia}
+Açıklama: aidat
+"""),
+    ("kuveytturk", "default", """KUVEYT TÜRK
+FAST GİDEN
+İşlemTarihi {dot}09:22
+GönderenKişi {G1}
+{G2}
+Alıcı {A1}
+{A2}
+GönderilenIBAN {ia}
+Tutar {tr}TL
+"""),
+    ("vakifkatilim", "default", """VAKIF KATILIM
+HAVALE
+İşlem : {slash} 11:11
+Gönderen Kişi : {G}
+Gönderilen Kişi : {A}
+Gönderilen Hesap No : 1234-5678
+Tutar {tr} TL
+"""),
+    ("bilinmiyor", "default", """Dekont
+Tarih {slash}
+Tutar {tr} TL
+{ia}
+{ig}
+"""),
+]
+
+# Çok sayfalı belgelerde ilk sayfadan sonra gelen hesap hareketi sayfası
+FILLER_PAGE = "Hesap hareketleri sayfa {page}\n" + "01.01.2025 ACIKLAMA 100,00\n" * 40
+
+
+def _fields(bank, rng):
+    g1, g2 = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+    a1, a2 = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+    day = date(2025, 1, 1) + timedelta(days=rng.randrange(420))
+    amount = rng.randrange(100, 5_000_000) / 100
+    other = rng.choice([b for b in CODES if b != bank])
+    # Bankasız (generic) şablonda iki IBAN farklı bankalardan olmalı
+    own = bank if bank in CODES else rng.choice([b for b in CODES if b != other])
+    ig = make_iban(CODES[own], rng)
+    ia = make_iban(CODES[other], rng)
+    ia_sp = spaced(ia)
+    return {
+        "G": f"{g1} {g2}", "A": f"{a1} {a2}", "g": tr_lower(f"{g1} {g2}"), "a": tr_lower(f"{a1} {a2}"),
+        "G1": g1, "G2": g2, "A1": a1, "A2": a2, "F": rng.choice(COMPANIES),
+        "dot": day.strftime("%d.%m.%Y"), "slash": day.strftime("%d/%m/%Y"),
+        "tr": tr_amount(amount), "en": en_amount(amount),
+        "ig": spaced(ig), "ia": ia_sp, "ia_top": ia_sp[:24], "ia_bottom": ia_sp[25:],
+    }
+
+
+def generate(per_branch=10, seed=1234, pages=1):
+    # (ad, banka, dal, sayfa metinleri) üretir; ad "garanti-fast-003" biçiminde
+    rng = random.Random(seed)
+    for bank, branch, template in TEMPLATES:
+        for i in range(per_branch):
+            first = template.format(**_fields(bank, rng))
+            texts = [first] + [FILLER_PAGE.format(page=p + 1) for p in range(1, pages)]
+            yield f"{bank}-{branch}-{i:03d}", bank, branch, texts
+
+
+def branches():
+    return [(bank, branch) for bank, branch, _ in TEMPLATES]
@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+# Benchmark korpusu için bağımlılıksız, minimal PDF yazıcı. Metin standart
+# Helvetica ile basılır; Türkçe harfler ISO-8859-9 kod noktalarına
+# /Differences ile eşlenir, böylece font dosyası gömmeye gerek kalmaz ve
+# pdfplumber/PyMuPDF metni aynen geri okur.
+
+# ISO-8859-9'un Latin-1'den farklı olduğu altı konum
+_DIFFERENCES = "[208 /Gbreve 221 /Idotaccent /Scedilla 240 /gbreve 253 /dotlessi /scedilla]"
+
+FONT_SIZE = 9
+LINE_HEIGHT = 14
+PAGE_WIDTH, PAGE_HEIGHT = 595, 842  # A4, pt
+MARGIN = 40
+
+
+def _escape(line):
+    data = line.encode("iso8859_9", errors="replace")
+    return data.replace(b"\\", b"\\\\").replace(b"(", b"\\(").replace(b")", b"\\)")
+
+
+def _content(text):
+    out = [b"BT", b"/F1 %d Tf" % FONT_SIZE, b"%d TL" % LINE_HEIGHT,
+           b"%d %d Td" % (MARGIN, PAGE_HEIGHT - MARGIN)]
+    for line in text.splitlines():
+        out.append(b"(" + _escape(line) + b") Tj T*")
+    out.append(b"ET")
+    return b"\n".join(out)
+
+
+def build_pdf(pages):
+    # pages: sayfa başına bir metin (satırlar "\n" ile). PDF'i bytes olarak döner.
+    objects = []  # 1'den başlayan nesne numaraları sırasıyla
+
+    def add(body):
+        objects.append(body)
+        return len(objects)
+
+    font = add(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding "
+               b"<< /Type /Encoding /BaseEncoding /WinAnsiEncoding /Differences "
+               + _DIFFERENCES.encode() + b" >> >>")
+    pages_id = len(objects) + 1
+    add(None)  # Pages, kids belli olunca doldurulur
+    kids = []
+    for text in pages:
+        stream = _content(text)
+        content = add(b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream")
+        kids.append(add(b"<< /Type /Page /Parent %d 0 R /MediaBox [0 0 %d %d] "
+                        b"/Resources << /Font << /F1 %d 0 R >> >> /Contents %d 0 R >>"
+                        % (pages_id, PAGE_WIDTH, PAGE_HEIGHT, font, content)))
+    objects[pages_id - 1] = (b"<< /Type /Pages /Count %d /Kids [" % len(kids)
+                             + b" ".join(b"%d 0 R" % k for k in kids) + b"] >>")
+    catalog = add(b"<< /Type /Catalog /Pages %d 0 R >>" % pages_id)
+
+    out = bytearray(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+    offsets = []
+    for i, body in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n" % i + body + b"\nendobj\n"
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    for off in offsets:
+        out += b"%010d 00000 n \n" % off
+    out += b"trailer\n<< /Size %d /Root %d 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, catalog, xref)
+    return bytes(out)
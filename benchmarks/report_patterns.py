@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+# Sentetik korpus üzerinde parser regex'lerinin profili (patterns.py sayaçları).
+#   python benchmarks/report_patterns.py [--per-branch 10] [--top 5] [--json out.json]
+# Her banka için en pahalı pattern'ler (çağrı, eşleşme oranı, toplam ms, ortalama µs),
+# çağrıldığı halde hiç eşleşmeyenler ve korpusta hiç çağrılmayanlar listelenir.
+import argparse
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import main as pipeline
+import patterns
+import registry
+from corpus import generate
+from document import Document
+from utils import normalize_text
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--per-branch", type=int, default=10)
+    ap.add_argument("--pages", type=int, default=1)
+    ap.add_argument("--seed", type=int, default=1234)
+    ap.add_argument("--top", type=int, default=5)
+    ap.add_argument("--json", default=None, help="ham istatistikleri bu dosyaya yaz")
+    args = ap.parse_args()
+
+    registry.warmup()
+    patterns.instrument(True)
+    patterns.reset()
+    count = 0
+    for _, _, _, pages in generate(args.per_branch, args.seed, args.pages):
+        doc = Document(normalize_text("".join(p + "\n" for p in pages)))
+        registry.get(pipeline.banka_tespit(doc))(doc).parse()
+        count += 1
+    patterns.instrument(False)
+
+    print(f"korpus: {count} belge")
+    for bank, r in patterns.report(args.top).items():
+        print(f"\n{bank}  (toplam {r['total_ms']:.3f} ms)")
+        print(f"  {'pattern':<24} {'çağrı':>7} {'eşleşme':>8} {'toplam ms':>10} {'ort µs':>8}")
+        for row in r["slowest"]:
+            print(f"  {row['name']:<24} {row['calls']:>7} {row['match_rate']:>8.2f} "
+                  f"{row['total_ms']:>10.3f} {row['avg_us']:>8.2f}")
+        if r["never_matched"]:
+            print(f"  hiç eşleşmeyen: {', '.join(r['never_matched'])}")
+        if r["unused"]:
+            print(f"  çağrılmayan: {', '.join(r['unused'])}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(patterns.stats(), f, indent=1, ensure_ascii=False)
+
+
+if __name__ == "__main__":
+    main()
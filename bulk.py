@@ -0,0 +1,175 @@
+# -*- coding: utf-8 -*-
+# Arşivler için toplu parse: HTTP API'ye tek tek PDF göndermeden bir dizin
+# ağacındaki tüm dekontları süreç havuzunda işler.
+#
+#   python bulk.py arsiv/ -o sonuc.jsonl
+#   python bulk.py arsiv/ -o sonuc.csv --format csv --order completion -w 8
+#
+# Manifest (varsayılan: <çıktı>.manifest) işlenen dosyaların içerik hash'lerini
+# tutar; yarıda kalan bir çalışma aynı komutla devam ettirilir, işlenmiş
+# (ya da aynı içerikli) dosyalar atlanır. Hash'ler cache anahtarıyla aynı
+# (içerik + parser sürümü): parser kodu değişince arşiv yeniden işlenir.
+#
+# Hata ile bitenler çıktıya ve manifest'e yazılmaz, sonraki çalışmada yeniden
+# denenir. Hataları ayrı bir dosya (varsayılan: <çıktı>.errors, çıktıyla aynı
+# biçimde) tutar; her çalışmada baştan yazılır, sadece o çalışmanın hatalarını
+# içerir (kalıcı bozuk bir PDF çıktıda her çalışmada yeni bir satır açmaz).
+import argparse
+import csv
+import json
+import multiprocessing
+import os
+import sys
+import time
+
+import limits
+from cache import content_key
+from main import parse_dekont
+from parsers.base import parse_fields
+
+CSV_FIELDS = [
+    "path", "key", "banka", "is_fast", "is_havale", "is_maas", "is_gelen", "is_giden",
+    "gonderen", "gondereniban", "alici", "aliciiban", "tutar", "islemtarihi", "error", "code",
+]
+
+
+def find_pdfs(root):
+    # Girdi sırası: dizin ağacı alfabetik sırayla gezilir
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames.sort()
+        for name in sorted(filenames):
+            if name.lower().endswith(".pdf"):
+                yield os.path.join(dirpath, name)
+
+
+def load_manifest(path):
+    done = set()
+    if os.path.exists(path):
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                key = line.split("\t", 1)[0].strip()
+                if key:
+                    done.add(key)
+    return done
+
+
+def _hash_file(path):
+    with open(path, "rb") as f:
+        return content_key(f)
+
+
+def _work(job):
+    # Worker'da koşar: (path, key, bank, fields) -> (path, key, sonuç, süre)
+    path, key, bank, fields = job
+    start = time.perf_counter()
+    try:
+        # Sert sınır (worker'ı öldürme) yok: Pool.imap kaybolan işi hiç döndürmez
+        with open(path, "rb") as f, limits.deadline(hard=False):
+            result = parse_dekont(f.read(), use_cache=False, bank=bank, fields=fields)
+    except limits.LimitExceeded as e:
+        result = e.as_dict()
+    except Exception as e:
+        result = {"error": str(e)}
+    return path, key, result, time.perf_counter() - start
+
+
+class _Writer:
+    def __init__(self, path, fmt, append=True):
+        # append: devam eden çalışmada çıktının sonuna eklenir; False ise baştan yazılır
+        exists = append and path != "-" and os.path.exists(path) and os.path.getsize(path) > 0
+        self._f = sys.stdout if path == "-" else open(path, "a" if append else "w", encoding="utf-8", newline="")
+        self._csv = None
+        if fmt == "csv":
+            self._csv = csv.DictWriter(self._f, fieldnames=CSV_FIELDS, extrasaction="ignore")
+            if not exists:
+                self._csv.writeheader()
+
+    def write(self, path, key, result):
+        row = {"path": path, "key": key, **result}
+        if self._csv:
+            self._csv.writerow(row)
+        else:
+            self._f.write(json.dumps(row, ensure_ascii=False) + "\n")
+        self._f.flush()
+
+    def close(self):
+        if self._f is not sys.stdout:
+            self._f.close()
+
+
+def run(root, output, fmt="jsonl", order="input", workers=None, manifest=None, bank=None, fields=None,
+        errors_path=None):
+    fields = parse_fields(fields)
+    manifest = manifest or (output + ".manifest" if output != "-" else "bulk.manifest")
+    errors_path = errors_path or (output + ".errors" if output != "-" else "bulk.errors")
+    done = load_manifest(manifest)
+
+    jobs, skipped = [], 0
+    for path in find_pdfs(root):
+        key = _hash_file(path)
+        if key in done:
+            skipped += 1
+            continue
+        done.add(key)  # aynı içerikli ikinci dosya da atlanır
+        jobs.append((path, key, bank, fields))
+
+    writer = _Writer(output, fmt)
+    error_writer = _Writer(errors_path, fmt, append=False)
+    per_bank = {}  # banka -> [adet, worker süresi]
+    errors = 0
+    start = time.perf_counter()
+    ctx = multiprocessing.get_context()
+    with ctx.Pool(processes=workers or os.cpu_count() or 1) as pool, \
+            open(manifest, "a", encoding="utf-8") as mf:
+        results = pool.imap(_work, jobs) if order == "input" else pool.imap_unordered(_work, jobs)
+        for path, key, result, elapsed in results:
+            if "error" in result:
+                # Çıktıya ve manifest'e yazılmaz: hatalı dosya (zaman aşımı,
+                # geçici çıkarma hatası) sonraki çalışmada yeniden denenir
+                error_writer.write(path, key, result)
+                errors += 1
+            else:
+                writer.write(path, key, result)
+                # Manifest'e sonuç yazıldıktan sonra eklenir: yarıda kesilirse iş tekrarlanır, kaybolmaz
+                mf.write(f"{key}\t{path}\n")
+                mf.flush()
+            stats = per_bank.setdefault(result.get("banka", "hata"), [0, 0.0])
+            stats[0] += 1
+            stats[1] += elapsed
+    writer.close()
+    error_writer.close()
+    wall = time.perf_counter() - start
+
+    total = len(jobs)
+    out = sys.stderr
+    print(f"{total} dekont, {skipped} atlandı, {errors} hata, {wall:.2f} sn, "
+          f"{total / wall if wall else 0:.1f} dekont/sn", file=out)
+    for name, (count, busy) in sorted(per_bank.items(), key=lambda kv: -kv[1][0]):
+        # Banka bazında worker başına verim (dekont / worker-saniye)
+        print(f"  {name:<14} {count:>7}  {count / busy if busy else 0:8.1f} dekont/sn/worker", file=out)
+    return total, skipped, errors
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Dizin ağacındaki PDF dekontları toplu parse eder")
+    ap.add_argument("root", help="PDF'lerin bulunduğu dizin")
+    ap.add_argument("-o", "--output", default="-", help="çıktı dosyası (varsayılan: stdout)")
+    ap.add_argument("--format", choices=("jsonl", "csv"), default=None,
+                    help="çıktı biçimi (varsayılan: uzantıdan, yoksa jsonl)")
+    ap.add_argument("--order", choices=("input", "completion"), default="input",
+                    help="sonuç sırası: girdi sırası ya da bitiş sırası")
+    ap.add_argument("-w", "--workers", type=int, default=None, help="süreç sayısı (varsayılan: CPU)")
+    ap.add_argument("--manifest", default=None, help="işlenen hash'lerin tutulduğu dosya")
+    ap.add_argument("--errors", default=None, help="hata ile biten dosyaların yazıldığı dosya (her çalışmada baştan)")
+    ap.add_argument("--bank", default=None, help="tüm dosyalar tek bankaya aitse banka anahtarı")
+    ap.add_argument("--fields", default=None, help="sadece bu alanlar (virgülle: tutar,islemtarihi)")
+    args = ap.parse_args(argv)
+
+    fmt = args.format or ("csv" if args.output.lower().endswith(".csv") else "jsonl")
+    _, _, errors = run(args.root, args.output, fmt, args.order, args.workers, args.manifest, args.bank, args.fields,
+                       args.errors)
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,194 @@
+# -*- coding: utf-8 -*-
+import glob
+import hashlib
+import json
+import mmap
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+from result import Result, dumps
+
+# Bellek katmanı: en çok PARSE_CACHE_SIZE sonuç (0 -> cache kapalı)
+CACHE_SIZE = int(os.environ.get("PARSE_CACHE_SIZE", "1024"))
+# Disk katmanı: SQLite dosyası verilirse açılır, toplam boyut PARSE_CACHE_DB_MAX_MB ile sınırlı
+CACHE_DB = os.environ.get("PARSE_CACHE_DB", "")
+CACHE_DB_MAX_BYTES = int(float(os.environ.get("PARSE_CACHE_DB_MAX_MB", "256")) * 1024 * 1024)
+# Sınır aşılınca en eski kayıtlar bu büyüklükte gruplarla silinir
+CACHE_DB_EVICT_BATCH = 64
+
+_BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def _source_stamp():
+    # Parser/detection kodu değişince eski sonuçlar kendiliğinden geçersiz olsun
+    h = hashlib.sha256()
+    files = sorted(glob.glob(os.path.join(_BASE_DIR, "*.py")))
+    files += sorted(glob.glob(os.path.join(_BASE_DIR, "parsers", "*.py")))
+    for path in files:
+        try:
+            with open(path, "rb") as f:
+                h.update(f.read())
+        except OSError:
+            continue
+    return h.hexdigest()[:12]
+
+
+PARSER_VERSION = os.environ.get("PARSER_VERSION") or _source_stamp()
+
+
+def content_key(data):
+    # bytes/memoryview/mmap doğrudan, dosya nesneleri parça parça hash'lenir
+    h = hashlib.sha256()
+    if hasattr(data, "getbuffer"):
+        with data.getbuffer() as buf:
+            h.update(buf)
+    elif hasattr(data, "read") and not isinstance(data, mmap.mmap):
+        pos = data.tell()
+        for chunk in iter(lambda: data.read(1 << 20), b""):
+            h.update(chunk)
+        data.seek(pos)
+    else:
+        h.update(data)
+    return h.hexdigest() + ":" + PARSER_VERSION
+
+
+class ResultCache:
+    def __init__(self, size=CACHE_SIZE, db_path=CACHE_DB, db_max_bytes=CACHE_DB_MAX_BYTES):
+        self.size = size
+        self.db_path = db_path
+        self.db_max_bytes = db_max_bytes
+        self._mem = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = None
+        self._db_pid = None
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.disk_evictions = 0
+
+    @property
+    def enabled(self):
+        return self.size > 0 or bool(self.db_path)
+
+    def _conn(self):
+        # SQLite bağlantısı fork sonrası paylaşılamaz, her süreç kendi bağlantısını açar
+        if not self.db_path:
+            return None
+        if self._db is None or self._db_pid != os.getpid():
+            db = sqlite3.connect(self.db_path, timeout=5, check_same_thread=False)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS results ("
+                " key TEXT PRIMARY KEY, value TEXT NOT NULL,"
+                " size INTEGER NOT NULL, accessed REAL NOT NULL)"
+            )
+            db.execute("CREATE INDEX IF NOT EXISTS results_accessed ON results(accessed)")
+            # Toplam boyut her put'ta SUM(size) ile taranmasın diye ayrı bir
+            # satırda tutulur; tetikleyiciler ekleme/güncelleme/silmede günceller,
+            # böylece aynı dosyayı kullanan bütün süreçlerde doğru kalır
+            db.executescript(
+                "BEGIN IMMEDIATE;"
+                "CREATE TABLE IF NOT EXISTS results_size (total INTEGER NOT NULL);"
+                "INSERT INTO results_size SELECT COALESCE(SUM(size), 0) FROM results"
+                " WHERE NOT EXISTS (SELECT 1 FROM results_size);"
+                "CREATE TRIGGER IF NOT EXISTS results_size_insert AFTER INSERT ON results"
+                " BEGIN UPDATE results_size SET total = total + new.size; END;"
+                "CREATE TRIGGER IF NOT EXISTS results_size_update AFTER UPDATE OF size ON results"
+                " BEGIN UPDATE results_size SET total = total + new.size - old.size; END;"
+                "CREATE TRIGGER IF NOT EXISTS results_size_delete AFTER DELETE ON results"
+                " BEGIN UPDATE results_size SET total = total - old.size; END;"
+                "COMMIT;"
+            )
+            self._db, self._db_pid = db, os.getpid()
+        return self._db
+
+    def _remember(self, key, value):
+        if self.size <= 0:
+            return
+        self._mem[key] = value
+        self._mem.move_to_end(key)
+        while len(self._mem) > self.size:
+            self._mem.popitem(last=False)
+            self.evictions += 1
+
+    def get(self, key):
+        if not self.enabled:
+            return None
+        with self._lock:
+            value = self._mem.get(key)
+            if value is not None:
+                self._mem.move_to_end(key)
+                self.hits += 1
+                return value.copy()
+
+            db = self._conn()
+            if db is not None:
+                row = db.execute("SELECT value FROM results WHERE key = ?", (key,)).fetchone()
+                if row:
+                    db.execute("UPDATE results SET accessed = ? WHERE key = ?", (time.time(), key))
+                    db.commit()
+                    value = Result.of(json.loads(row[0]))
+                    self._remember(key, value)
+                    self.hits += 1
+                    self.disk_hits += 1
+                    return value.copy()
+
+            self.misses += 1
+            return None
+
+    def put(self, key, value):
+        if not self.enabled:
+            return
+        # Bellekte de kompakt Result olarak tutulur
+        value = Result.of(value)
+        with self._lock:
+            self._remember(key, value)
+
+            db = self._conn()
+            if db is None:
+                return
+            blob = dumps(value).decode("utf-8")
+            # REPLACE silme tetikleyicisini çalıştırmaz, upsert güncelleme tetikleyicisini çalıştırır
+            db.execute(
+                "INSERT INTO results (key, value, size, accessed) VALUES (?, ?, ?, ?)"
+                " ON CONFLICT(key) DO UPDATE SET value = excluded.value, size = excluded.size,"
+                " accessed = excluded.accessed",
+                (key, blob, len(blob), time.time()),
+            )
+            self._evict_disk(db)
+            db.commit()
+
+    def _evict_disk(self, db):
+        # Boyut sınırı aşıldıysa en uzun süredir okunmayan kayıtlar silinir.
+        # Tablonun tamamı okunmaz: her turda accessed indeksinden en eski
+        # CACHE_DB_EVICT_BATCH kayıt silinir, toplam sınırın altına inene kadar
+        while db.execute("SELECT total FROM results_size").fetchone()[0] > self.db_max_bytes:
+            deleted = db.execute(
+                "DELETE FROM results WHERE key IN (SELECT key FROM results ORDER BY accessed LIMIT ?)",
+                (CACHE_DB_EVICT_BATCH,),
+            ).rowcount
+            if deleted <= 0:
+                break
+            self.disk_evictions += deleted
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "parser_version": PARSER_VERSION,
+            "memory_entries": len(self._mem),
+            "memory_size": self.size,
+            "disk": bool(self.db_path),
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "disk_evictions": self.disk_evictions,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+result_cache = ResultCache()
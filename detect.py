@@ -0,0 +1,121 @@
+# -*- coding: utf-8 -*-
+from document import Document
+from iban import bank_votes
+
+# Banka tespiti: ayarlanmış, sıralı bir anahtar kelime zinciri. Sıralama
+# eski if-zincirindeki öncelik sırasıdır: bir aşamada birden çok banka
+# eşleşirse listede önce gelen kazanır. Her anahtar kelime büyük harf metinde
+# `in` / str.find ile (C hızında) aranır; ilk tutan banka karardır.
+
+# 1. aşama: ilk 10 satır (header). ALICI/KATILIMCI filtresi uygulanmaz.
+HEADER_RULES = [
+    ("vakif", ["VAKIFBANK"]),
+    ("garanti", ["GARANTI", "GARANTİ"]),
+    ("ziraat", ["ZIRAAT", "ZİRAAT"]),
+    ("akbank", ["AKBANK"]),
+    ("yapikredi", ["YAPI KREDI", "YAPIKREDI"]),
+    ("isbank", ["IS BANKASI", "İŞ BANKASI"]),
+    ("enpara", ["ENPARA", "QNB"]),
+    ("kuveytturk", ["KUVEYT"]),
+    ("halkbank", ["HALKBANK"]),
+    ("ing", ["ING"]),
+    ("teb", ["TÜRK EKONOMİ BANKASI", "TEB"]),
+    ("vakifkatilim", ["VAKIF KATILIM", "VAKIFKATILIM"]),
+]
+
+# 2. aşama: tüm metin, alıcı bankası geçen satırlar (ALICI, KATILIMCI) hariç.
+BODY_RULES = [
+    ("kuveytturk", ["KUVEYT"]),
+    ("ziraat", ["WWW. ZIRAATBANK.COM.TR", "T.C. ZİRAAT BANKASI A.Ş.", "ZİRAAT MOBİL"]),
+    ("isbank", ["WWW.ISBANK.COM.TR", "İŞCEP", "ISCEP", "TÜRKİYE İŞ BANKASI A.Ş."]),
+    ("denizbank", ["DENIZBANK", "DENİZBANK", "DENIZ GAYRIMENKUL"]),
+    ("enpara", ["ENPARA", "FINANSBANK", "FİNANSBANK", "QNB"]),
+    ("garanti", ["WWW.GARANTIBBVA.COM.TR", "T. GARANTİ BANKASI A.Ş.", "GARANTI", "GARANTİ"]),
+    ("vakif", ["VAKIFBANK", "TÜRKİYE VAKIFLAR BANKASI T.A.O", "WWW.VAKIFBANK.COM.TR", "SİCİL NUMARASI: 776444"]),
+    ("yapikredi", ["WWW.YAPIKREDI.COM.TR", "YAPI VE KREDİ BANKASI A.Ş.", "MERSIS NO: 0937002089200741"]),
+    ("halkbank", ["4560004685", "0456000468500132", "HALKBANK.COM.TR"]),
+    ("ziraat", ["ZIRAATBANK", "ZİRAAT BANKASI", "ZIRAAT MOBIL"]),
+    ("ing", ["WWW. ING.COM.TR", "ING BANK A.Ş."]),
+    ("teb", ["TÜRK EKONOMİ BANKASI", "TEB"]),
+    ("vakifkatilim", ["VAKIF KATILIM", "VAKIFKATILIM"]),
+    ("akbank", ["AKBANK", "AKBANK T.A.Ş", "WWW.AKBANK.COM", "GENEL MÜDÜRLÜK: SABANCI CENTER",
+                "VERGİ NO: 0150015264"]),
+]
+
+HEADER_LINES = 10
+EXCLUDED_LINE_TOKENS = ("ALICI", "KATILIMCI")  # boşluksuz büyük harf satırda aranır
+
+
+def _header_end(up):
+    pos = -1
+    for _ in range(HEADER_LINES):
+        pos = up.find("\n", pos + 1)
+        if pos < 0:
+            return len(up)
+    return pos
+
+
+def _line_excluded(up, pos, cache):
+    start = up.rfind("\n", 0, pos) + 1
+    if start not in cache:
+        end = up.find("\n", pos)
+        line = up[start:end if end >= 0 else len(up)].replace(" ", "")
+        cache[start] = any(tok in line for tok in EXCLUDED_LINE_TOKENS)
+    return cache[start]
+
+
+def _header_winner(head):
+    for bank, keywords in HEADER_RULES:
+        for kw in keywords:
+            if kw in head:
+                return bank
+    return None
+
+
+def header_bank(doc):
+    # Sadece ilk 10 satırda (header) geçen anahtar kelimelerden banka, kurallar
+    # detect_bank'teki sırayla; bulunamazsa None
+    text = Document.of(doc).text
+    head = text[:_header_end(text)].upper()
+    return _header_winner(head) or _body_winner(head, 0, {})
+
+
+def _body_winner(up, start, excluded):
+    # Gövde kuralları öncelik sırasıyla; her anahtar kelime str.find ile (C
+    # hızında) aranır, ALICI/KATILIMCI satırında olmayan ilk geçişte banka
+    # bulunmuş olur. Önceliği yüksek banka bulununca kalan kurallara bakılmaz.
+    for bank, keywords in BODY_RULES:
+        for kw in keywords:
+            pos = up.find(kw, start)
+            while pos >= 0:
+                if not _line_excluded(up, pos, excluded):
+                    return bank
+                pos = up.find(kw, pos + 1)
+    return None
+
+
+def detect_bank(doc):
+    # banka_key döner. Önce header kuralları öncelik sırasıyla, sonra
+    # ALICI/KATILIMCI satırları hariç gövde kuralları; anahtar kelime tutmazsa
+    # IBAN banka kodları karar verir. IBAN'lar anahtar kelimelerin önüne
+    # geçmez: dekontta karşı tarafın IBAN'ı da yazıyor.
+    # Sadece ilk 10 satır büyük harfe çevrilir, header'da banka bulunursa
+    # gövdeye bakılmaz.
+    doc = Document.of(doc)
+    text = doc.text
+    # str.upper karakter karakter çalışır: başın büyük harfi büyük harfin başıdır
+    head = doc.__dict__.get("up") or text[:_header_end(text)].upper()
+    bank = _header_winner(head[:_header_end(head)])
+    if bank:
+        return bank
+    # Gövde kuralları header satırlarını da kapsar (eski zincirdeki gibi)
+    bank = _body_winner(doc.up, 0, {})
+    if bank:
+        return bank
+
+    votes = bank_votes(doc.ibans)
+    if len(votes) == 1:
+        # Tüm geçerli IBAN'lar aynı bankanınsa yeterince kesin; karışıksa
+        # (gönderen/alıcı farklı banka) GenericParser'a bırakılır
+        return next(iter(votes))
+    return "bilinmiyor"
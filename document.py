@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+import unicodedata
+from functools import cached_property
+
+from iban import extract_ibans, find_ibans
+from labels import LabelIndex
+from utils import to_turkish_upper
+
+HEADER_LINES = 10
+
+
+class Document:
+    # Bir dekont metninin parse_dekont içinde bir kez kurulan ortak görünümü.
+    # Tespit ve parser'ların ihtiyaç duyduğu dönüşümler (büyük harf, satırlar,
+    # tek satır...) ilk erişimde hesaplanıp saklanır, aynı O(n) kopya tekrar
+    # üretilmez.
+
+    def __init__(self, text):
+        self.text = text
+
+    @classmethod
+    def of(cls, source):
+        return source if isinstance(source, cls) else cls(source)
+
+    def __len__(self):
+        return len(self.text)
+
+    @cached_property
+    def up(self):
+        # str.upper(): "i" -> "I" (banka_tespit ve çoğu parser bunu kullanıyor)
+        return self.text.upper()
+
+    @cached_property
+    def tr_up(self):
+        # Türkçe büyük harf: "i" -> "İ", "ı" -> "I"
+        return to_turkish_upper(self.text)
+
+    @cached_property
+    def lines(self):
+        return self.text.split("\n")
+
+    @cached_property
+    def header_lines(self):
+        return self.lines[:HEADER_LINES]
+
+    @cached_property
+    def stripped_lines(self):
+        return [ln.strip() for ln in self.text.splitlines()]
+
+    @cached_property
+    def nonempty_lines(self):
+        return [ln for ln in self.stripped_lines if ln]
+
+    @cached_property
+    def nonempty_lines_tr_up(self):
+        return [to_turkish_upper(ln) for ln in self.nonempty_lines]
+
+    @cached_property
+    def single_line(self):
+        # Satır sonları tek boşluk
+        return self.text.replace("\n", " ")
+
+    @cached_property
+    def flat(self):
+        # Satır sonları çift boşluk: satır sınırı regex'lerde hâlâ ayırt edilebilir
+        return self.text.replace("\n", "  ").replace("\t", " ")
+
+    @cached_property
+    def flat_tr_up(self):
+        return to_turkish_upper(self.flat)
+
+    @cached_property
+    def no_space(self):
+        return self.text.replace(" ", "")
+
+    @cached_property
+    def iban_candidates(self):
+        return find_ibans(self.text)
+
+    @cached_property
+    def ibans(self):
+        return extract_ibans(self.text, self.iban_candidates)
+
+    @cached_property
+    def labels(self):
+        # "ETİKET : değer" indeksi (labels.py)
+        return LabelIndex(self.text, self.up)
+
+    @cached_property
+    def nfkc(self):
+        # NFKC normalize edilmiş görünüm; extract_text çıktısı zaten normalize
+        # olduğu için çoğunlukla kendisini döner
+        if unicodedata.is_normalized("NFKC", self.text):
+            return self
+        return Document(unicodedata.normalize("NFKC", self.text))
@@ -0,0 +1,234 @@
+# -*- coding: utf-8 -*-
+import asyncio
+import functools
+import itertools
+import multiprocessing
+import os
+import threading
+import time
+
+import limits
+
+# Çalışma modu:
+#   "process" -> parse işleri önceden ısıtılmış bir süreç havuzunda koşar (varsayılan)
+#   "thread"  -> eski davranış, sadece event loop dışına (thread) alınır
+PARSE_MODE = os.environ.get("PARSE_MODE", "process")
+POOL_SIZE = int(os.environ.get("PARSE_POOL_SIZE", "0")) or os.cpu_count() or 1
+MAX_TASKS_PER_CHILD = int(os.environ.get("PARSE_MAX_TASKS_PER_CHILD", "0")) or None
+JOB_TIMEOUT = float(os.environ.get("PARSE_JOB_TIMEOUT", "60"))
+START_METHOD = os.environ.get("PARSE_START_METHOD") or None
+# warmup(): henüz cevap vermemiş worker kalırsa durum sorguları bu aralıkla tekrarlanır (sn)
+WARMUP_POLL = 0.05
+# Sert CPU sınırında ölen worker'ların yoklanma aralığı (sn)
+WATCH_INTERVAL = 0.2
+
+_pool = None
+# multiprocessing.Pool ölen bir worker'ın işi için callback'leri hiç çağırmaz.
+# Bu yüzden worker her işin başını ve sonunu _started kuyruğuna yazar:
+# (iş no, pid) / (iş no, None). _watch thread'i işi süren worker'ı ölmüş
+# bulursa işi hemen hatayla sonlandırır (istek JOB_TIMEOUT'u beklemez,
+# ApplyResult havuzun cache'inde kalmaz).
+_started = None
+_jobs = itertools.count()
+_pids = {}  # iş no -> işi süren worker'ın pid'i
+_results = {}  # iş no -> ApplyResult (sonuç gelene kadar)
+_docs = {}  # iş no -> dekont sayısı (birden çok dekontluk işler)
+_lock = threading.Lock()
+
+
+class JobTimeout(limits.LimitExceeded):
+    # İstek tarafı süre sınırı (kuyrukta bekleme dahil)
+    def __init__(self, limit):
+        super().__init__("timeout", f"parse {limit:g} saniye içinde tamamlanamadı", limit)
+
+
+class WorkerLost(limits.LimitExceeded):
+    # İşi süren worker öldü; çekirdek onu sert CPU sınırında (PARSE_DOC_CPU) öldürür
+    def __init__(self, limit):
+        super().__init__("timeout", f"parse {limit:g} saniye CPU süresini aştı, worker sonlandırıldı", limit)
+
+
+def _init_worker(started):
+    # pdfplumber ve tüm parser modülleri her worker'da bir kez yüklenir,
+    # sonraki işler import maliyeti ödemez.
+    global _started
+    import registry
+
+    _started = started
+    registry.warmup()
+
+
+def _guarded(job, func, args, kwargs, docs):
+    # Worker'da dekont başına süre sınırları (limits.deadline). Birden çok
+    # dekontluk işte (run_group) yumuşak sınırı func her dekontta kendisi uygular
+    _started.put((job, os.getpid()))
+    try:
+        with limits.deadline(soft=docs == 1, docs=docs):
+            return func(*args, **kwargs)
+    finally:
+        _started.put((job, None))
+
+
+def _drain(started):
+    # Kuyruktaki başladı/bitti kayıtlarını _pids'e işler
+    while not started.empty():
+        job, pid = started.get()
+        with _lock:
+            if pid is None:
+                _pids.pop(job, None)
+            else:
+                _pids[job] = pid
+
+
+def _alive(pid):
+    # Havuz ölen worker'ı ~0.1 sn içinde toplar (join), sonra pid kaybolur
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except OSError:
+        pass
+    return True
+
+
+def _watch(pool, started):
+    while _pool is pool:
+        time.sleep(WATCH_INTERVAL)
+        _drain(started)
+        dead = [job for job, pid in list(_pids.items()) if not _alive(pid)]
+        if not dead:
+            continue
+        # Worker ölmeden önce bitirdiği işi bildirmiş olabilir (maxtasksperchild)
+        _drain(started)
+        for job in dead:
+            with _lock:
+                if _pids.pop(job, None) is None:
+                    continue
+                result = _results.get(job)
+            if result is not None and not result.ready():
+                # error_callback'i çağırır ve işi havuzun cache'inden siler
+                result._set(result._job, (False, WorkerLost(limits.DOC_CPU * _docs.get(job, 1))))
+
+
+def _worker_status(_):
+    import registry
+
+    return dict(registry.status(), pid=os.getpid())
+
+
+def start():
+    global _pool
+    if PARSE_MODE != "process" or _pool is not None:
+        return
+    ctx = multiprocessing.get_context(START_METHOD)
+    # SimpleQueue'ya put arka plan thread'i olmadan yazar: GIL'i bırakmayan
+    # C kodunda takılan worker'ın "başladı" kaydı da kuyruğa ulaşmış olur
+    started = ctx.SimpleQueue()
+    # Pool tüm worker'ları hemen ayağa kaldırır ve initializer'ı çalıştırır (pre-warm)
+    _pool = ctx.Pool(
+        processes=POOL_SIZE,
+        initializer=_init_worker,
+        initargs=(started,),
+        maxtasksperchild=MAX_TASKS_PER_CHILD,
+    )
+    threading.Thread(target=_watch, args=(_pool, started), name="executor-watch", daemon=True).start()
+
+
+def stop():
+    global _pool
+    if _pool is None:
+        return
+    pool, _pool = _pool, None
+    pool.terminate()
+    pool.join()
+    _pids.clear()
+    _results.clear()
+
+
+def uses_processes():
+    return _pool is not None
+
+
+def _resolve(fut, value=None, error=None):
+    if fut.done():  # timeout ile iptal edilmiş olabilir
+        return
+    if error is not None:
+        fut.set_exception(error)
+    else:
+        fut.set_result(value)
+
+
+async def run(func, *args, **kwargs):
+    return await _run(func, args, kwargs, 1)
+
+
+async def run_group(func, docs, *args, **kwargs):
+    # docs dekontu tek işte işleyen func (ör. main.parse_segments): sert CPU
+    # sınırı ve JOB_TIMEOUT dekont sayısıyla çarpılır, yumuşak sınırı func her
+    # dekont için limits.deadline(hard=False) ile uygular
+    return await _run(func, args, kwargs, docs)
+
+
+async def _run(func, args, kwargs, docs):
+    loop = asyncio.get_running_loop()
+    timeout = JOB_TIMEOUT * docs
+
+    if _pool is None:
+        fut = loop.run_in_executor(None, functools.partial(func, *args, **kwargs))
+    else:
+        fut = loop.create_future()
+        job = next(_jobs)
+
+        def done(value=None, error=None):
+            with _lock:
+                _results.pop(job, None)
+                _docs.pop(job, None)
+            loop.call_soon_threadsafe(_resolve, fut, value, error)
+
+        # Callback ApplyResult kaydedilmeden çalışmasın (kayıt geride kalmasın)
+        with _lock:
+            if docs > 1:
+                _docs[job] = docs
+            _results[job] = _pool.apply_async(
+                _guarded, (job, func, args, kwargs, docs),
+                callback=done,
+                error_callback=lambda e: done(None, e),
+            )
+
+    try:
+        return await asyncio.wait_for(fut, timeout)
+    except asyncio.TimeoutError:
+        raise JobTimeout(timeout)
+
+
+async def warmup():
+    # Havuz modunda her worker initializer'da kendini ısıtır (initializer
+    # bitmeden worker iş almaz). Durum sorguları her worker (farklı pid)
+    # cevap verene kadar gönderilir: önce ısınan bir worker aynı turda birden
+    # çok sorguyu alabileceği için tek tur her worker'ın hazır olduğunu
+    # göstermez. Thread modunda parser'lar API sürecinde ısıtılır.
+    import registry
+
+    loop = asyncio.get_running_loop()
+    if _pool is None:
+        return await loop.run_in_executor(None, registry.warmup)
+    statuses = {}
+    while True:
+        for status in await loop.run_in_executor(
+                None, functools.partial(_pool.map, _worker_status, range(POOL_SIZE), 1)):
+            statuses[status["pid"]] = status
+        if len(statuses) >= POOL_SIZE:
+            break
+        await asyncio.sleep(WARMUP_POLL)
+    return max(statuses.values(), key=lambda s: s["warmup_seconds"] or 0)
+
+
+def info():
+    return {
+        "mode": PARSE_MODE if _pool is not None else "thread",
+        "pool_size": POOL_SIZE if _pool is not None else 0,
+        "max_tasks_per_child": MAX_TASKS_PER_CHILD,
+        "job_timeout": JOB_TIMEOUT,
+        "limits": {"max_pages": limits.MAX_PAGES, "max_text_chars": limits.MAX_TEXT_CHARS,
+                   "doc_timeout": limits.DOC_TIMEOUT, "doc_cpu": limits.DOC_CPU},
+    }
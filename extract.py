@@ -0,0 +1,297 @@
+# -*- coding: utf-8 -*-
+import io
+import mmap
+import os
+
+import limits
+import metrics
+from utils import normalize_page
+
+# Varsayılan backend ve banka bazlı istisnalar:
+#   EXTRACT_BACKEND=fitz
+#   EXTRACT_BACKEND_BANKS="garanti=fitz,enpara=fitz,vakif=pdfplumber"
+DEFAULT_BACKEND = os.environ.get("EXTRACT_BACKEND", "pdfplumber")
+# "full": tüm sayfalar baştan okunur, "lazy": önce 1. sayfa, gerisi parser isterse
+EXTRACT_MODE = os.environ.get("EXTRACT_MODE", "full")
+# Süreç havuzu modunda (full) bu kadar ya da daha çok sayfalı PDF'lerin metni
+# sayfa aralıklarına bölünüp worker'larda paralel çıkarılır (0 -> kapalı)
+SPLIT_PAGES = int(os.environ.get("EXTRACT_SPLIT_PAGES", "0"))
+
+
+def _parse_bank_map(raw):
+    out = {}
+    for item in raw.split(","):
+        if "=" in item:
+            bank, name = item.split("=", 1)
+            out[bank.strip()] = name.strip()
+    return out
+
+
+BANK_BACKENDS = _parse_bank_map(os.environ.get("EXTRACT_BACKEND_BANKS", ""))
+
+
+def open_source(source):
+    # Dosya yolu, bytes/memoryview ya da okunabilir dosya nesnesi (BytesIO, mmap...) kabul edilir
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return io.BytesIO(source)
+    if hasattr(source, "seek"):
+        source.seek(0)
+    return source
+
+
+class ExtractBackend:
+    # Her backend bir PDF'i açar, sayfa sayısını ve sayfa metnini verir.
+    # Sayfa metni satırları "kelime kelime" boşlukla birleştirilmiş, pdfplumber
+    # extract_text() çıktısıyla aynı biçimde olmalı.
+    name = None
+
+    def __init__(self, source):
+        self.page_count = 0
+
+    def page_text(self, index):
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class PdfplumberBackend(ExtractBackend):
+    name = "pdfplumber"
+
+    def __init__(self, source):
+        import pdfplumber
+
+        self._pdf = pdfplumber.open(open_source(source))
+        self.page_count = len(self._pdf.pages)
+
+    def page_text(self, index):
+        page = self._pdf.pages[index]
+        try:
+            return page.extract_text() or ""
+        finally:
+            # Karakter/layout cache'leri (get_textmap'in sınıf seviyesindeki
+            # lru_cache'i dahil) sayfa bitince bırakılır, belge sonuna kadar tutulmaz
+            page.close()
+
+    def close(self):
+        self._pdf.close()
+
+
+class FitzBackend(ExtractBackend):
+    # PyMuPDF: sayfa başına pdfplumber'dan çok daha hızlı. Kelimeleri pdfplumber
+    # gibi "top" koordinatına göre satırlara kümeleyip soldan sağa diziyoruz ki
+    # parser'ların beklediği "ETİKET : değer" satırları aynı kalsın.
+    name = "fitz"
+    y_tolerance = 3
+
+    def __init__(self, source):
+        import fitz
+
+        self._view = None
+        if isinstance(source, (str, os.PathLike)):
+            self._doc = fitz.open(source)
+        else:
+            if isinstance(source, mmap.mmap):
+                data = self._view = memoryview(source)
+            elif hasattr(source, "getbuffer"):
+                data = self._view = source.getbuffer()
+            elif hasattr(source, "read"):
+                source.seek(0)
+                data = source.read()
+            else:
+                data = source
+            self._doc = fitz.open(stream=data, filetype="pdf")
+        self.page_count = self._doc.page_count
+
+    def page_text(self, index):
+        words = self._doc[index].get_text("words")
+        if not words:
+            return ""
+        words.sort(key=lambda w: (w[1], w[0]))
+
+        lines, current, line_top = [], [], None
+        for w in words:
+            if line_top is not None and w[1] - line_top > self.y_tolerance:
+                lines.append(current)
+                current, line_top = [], None
+            if line_top is None:
+                line_top = w[1]
+            current.append(w)
+        lines.append(current)
+
+        return "\n".join(" ".join(w[4] for w in sorted(ln, key=lambda w: w[0])) for ln in lines)
+
+    def close(self):
+        self._doc.close()
+        if self._view is not None:
+            self._view.release()
+            self._view = None
+
+
+BACKENDS = {
+    PdfplumberBackend.name: PdfplumberBackend,
+    FitzBackend.name: FitzBackend,
+}
+
+
+def register_backend(cls):
+    BACKENDS[cls.name] = cls
+    return cls
+
+
+def get_backend(name=None):
+    name = name or DEFAULT_BACKEND
+    try:
+        return BACKENDS[name]
+    except KeyError:
+        raise ValueError(f"bilinmeyen extract backend: {name}")
+
+
+def backend_for_bank(bank_key, parser_class=None):
+    # Öncelik: banka bazlı ayar > parser'ın zorunlu backend'i > global varsayılan
+    if bank_key in BANK_BACKENDS:
+        return BANK_BACKENDS[bank_key]
+    required = getattr(parser_class, "extract_backend", None)
+    return required or DEFAULT_BACKEND
+
+
+class PageReader:
+    # Sayfaları ihtiyaç oldukça çıkaran okuyucu. text(1) sadece ilk sayfayı,
+    # text() tüm sayfaları döner; daha önce okunan sayfalar tekrar çıkarılmaz.
+    # Sayfalar çıkarıldıkça normalleştirilip saklanır (boş sayfalar None).
+    # pages: {backend: [sayfa, ...]} önceden (paralel, extract_range ile)
+    # çıkarılmış sayfalar; o backend için PDF hiç açılmaz.
+    # window: (başlangıç, bitiş) sadece bu sayfa aralığı okunur (çok dekontlu
+    # PDF'te tek bir dekont); sayfa numaraları aralığa göredir, pages tüm
+    # belgenin sayfalarıdır.
+    def __init__(self, source, backend=None, pages=None, window=None):
+        self.source = source
+        self._prefetched = pages or {}
+        self._window = window
+        self._doc = None
+        self._open(backend or DEFAULT_BACKEND)
+
+    def _open(self, backend):
+        self.backend = backend
+        self._chars = 0
+        pages = self._prefetched.get(backend)
+        if pages is not None:
+            if self._window:
+                pages = pages[slice(*self._window)]
+            self._pages = list(pages)
+            self._count = len(pages)
+            limits.check_pages(self._count)
+            limits.check_text(sum(len(p) for p in pages if p))
+            return
+        with metrics.stage("read"):
+            self._doc = get_backend(backend)(self.source)
+        self._pages = []
+        self._offset, self._count = 0, self._doc.page_count
+        if self._window:
+            start, stop = self._window
+            self._offset, self._count = start, max(0, min(stop, self._count) - start)
+        try:
+            limits.check_pages(self._count)
+        except limits.LimitExceeded:
+            self.close()
+            raise
+
+    @property
+    def page_count(self):
+        return self._count
+
+    @property
+    def pages_read(self):
+        return len(self._pages)
+
+    def _page(self, index):
+        page = self._doc.page_text(self._offset + index)
+        # Sayfa sayısı sınırın altında olsa da tek sayfadan dev metin çıkabilir
+        self._chars += len(page) if page else 0
+        limits.check_text(self._chars)
+        return normalize_page(page) + "\n" if page else None
+
+    def _next_page(self):
+        page = self._page(len(self._pages))
+        self._pages.append(page)
+        return page
+
+    def page_range(self, start, stop):
+        # [start, stop) sayfaları, PageReader'ın sakladığı biçimde (extract_range)
+        with metrics.stage("extract"):
+            return [self._page(i) for i in range(start, min(stop, self._count))]
+
+    def pages(self):
+        # Normalleştirilmiş sayfa metinleri ("\n" ile biten; boş sayfalar atlanır),
+        # sayfa sayfa çıkarılarak
+        for i in range(self.page_count):
+            if i < len(self._pages):
+                page = self._pages[i]
+            else:
+                with metrics.stage("extract"):
+                    page = self._next_page()
+            if page:
+                yield page
+
+    def text(self, pages=None):
+        wanted = self.page_count if pages is None else min(pages, self.page_count)
+        with metrics.stage("extract"):
+            while len(self._pages) < wanted:
+                self._next_page()
+            return "".join(p for p in self._pages[:wanted] if p).strip()
+
+    def switch(self, backend):
+        # Parser başka bir backend'in satır düzenini istiyorsa baştan o backend ile oku
+        if backend == self.backend:
+            return
+        self.close()
+        self._open(backend)
+
+    def close(self):
+        if self._doc is not None:
+            self._doc.close()
+            self._doc = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def iter_pages(source, backend=None):
+    # Sayfa metinlerini tek tek üreten generator; okuyucu tükenince ya da
+    # generator kapatılınca kapanır
+    with PageReader(source, backend) as reader:
+        yield from reader.pages()
+
+
+def extract_text(source, backend=None):
+    return "".join(iter_pages(source, backend)).strip()
+
+
+def extract_range(source, backend, start, stop):
+    # Paralel çıkarmanın bir parçası: worker'da [start, stop) sayfaları
+    with PageReader(source, backend) as reader:
+        return reader.page_range(start, stop)
+
+
+def page_count(source):
+    # Bölme kararı için sayfa sayısı. PyMuPDF sayfaları çözmeden sayar,
+    # pdfplumber'ın tüm sayfa nesnelerini kurmasından çok daha ucuz.
+    with FitzBackend(source) as doc:
+        return doc.page_count
+
+
+def split_ranges(count, parts):
+    # [0, count) sayfalarını en fazla parts eşit parçaya böler (count 0: hiç parça yok)
+    if count <= 0:
+        return []
+    size = -(-count // max(1, parts))
+    return [(start, min(start + size, count)) for start in range(0, count, size)]
@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+import os
+
+# Banka içi format varyantlarının parmak izi. Parser'lar formatı `in up`
+# zincirleriyle sırayla denemek yerine belgeyi bir kez sınıflandırıp doğrudan
+# o varyantın koduna gider:
+#
+#   FORMATS = Formats(
+#       Format("qnb", when=("QNB", P.qnb_gonderen), tokens=("EFT TUTARI", "ALICI IBAN")),
+#       Format("legacy", tokens=("MÜŞTERİ ÜNVANI", "ALICI ÜNVANI")),
+#   )
+#   fp = FORMATS.classify(doc)   # fp.variant, fp.confidence, fp.has("QNB")
+#
+# when: varyantı seçen kelimeler, biri yeterli. also: verilirse bu
+#       kelimelerden biri de bulunmalı (VE). Varyantlar sırayla denenir, when'i
+#       boş olan varsayılandır; seçim parser'ların önceki if zincirleriyle aynı.
+# tokens: formatın şablonunda hep bulunan sabit kelime ve etiketler (kanıt).
+# confidence: seçilen varyantın parmak izinden (when ve also birer özellik
+#       sayılır, tokens'taki her kelime bir özellik) belgede bulunanların oranı. Şablonu değişmiş ya da henüz tanımlanmamış bir varyant
+#       olan dekontlar düşük skor alır; metriklerde görünür, ham metin
+#       örneklemesi (samples.py) bunları her zaman alır.
+# Kelimeler Formats'ın görünümünde (view: Document.up, tr_up, flat_tr_up) sabit
+# alt dizgi olarak aranır, o görünümdeki yazımla verilmeli (up'ta "i" -> "I":
+# "İŞLEM TARIHI"); derlenmiş pattern verilirse ham metinde search edilir.
+# Her kelimeye belge başına en fazla bir kez bakılır.
+#
+# PARSER_LOW_CONFIDENCE: bu skorun altındaki sınıflandırmalar düşük güvenli sayılır
+LOW_CONFIDENCE = float(os.environ.get("PARSER_LOW_CONFIDENCE", "0.5"))
+
+
+def is_low(confidence):
+    # None: parser parmak izi tanımlamıyor
+    return confidence is not None and confidence < LOW_CONFIDENCE
+
+
+class Format:
+    __slots__ = ("name", "when", "also", "tokens", "features")
+
+    def __init__(self, name, when=(), also=(), tokens=()):
+        self.name = name
+        self.when = tuple(when)
+        self.also = tuple(also)
+        self.tokens = tuple(tokens)
+        # Güven skorunda sayılan özellikler: kelime grupları, biri yeterli
+        self.features = tuple(group for group in (self.when, self.also) if group)
+        self.features += tuple((t,) for t in dict.fromkeys(self.tokens))
+
+
+class Fingerprint:
+    # Tek bir belgenin sınıflandırması; has() sonuçları saklanır
+    __slots__ = ("variant", "_doc", "_view", "_hits")
+
+    def __init__(self, doc, view):
+        self.variant = None
+        self._doc = doc
+        self._view = view
+        self._hits = {}
+
+    def has(self, token):
+        hit = self._hits.get(token)
+        if hit is None:
+            if isinstance(token, str):
+                hit = token in getattr(self._doc, self._view)
+            else:
+                hit = token.search(self._doc.text) is not None
+            self._hits[token] = hit
+        return hit
+
+    def any(self, tokens):
+        return any(self.has(t) for t in tokens)
+
+    @property
+    def confidence(self):
+        features = self.variant.features
+        if not features:
+            return 1.0
+        return round(sum(self.any(group) for group in features) / len(features), 3)
+
+
+
+class Formats:
+    def __init__(self, *formats, view="up"):
+        self.formats = formats
+        self.view = view
+
+    def classify(self, doc):
+        fp = Fingerprint(doc, self.view)
+        for f in self.formats:
+            if not f.when or (fp.any(f.when) and (not f.also or fp.any(f.also))):
+                fp.variant = f
+                break
+        else:
+            fp.variant = self.formats[-1]
+        return fp
@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+import re
+
+# TR IBAN: TR + 2 kontrol hanesi + 5 haneli banka (EFT) kodu + 1 rezerv + 16 hesap
+# Banka kodu -> banka_tespit anahtarı
+BANK_CODES = {
+    "00010": "ziraat",
+    "00012": "halkbank",
+    "00015": "vakif",
+    "00032": "teb",
+    "00046": "akbank",
+    "00062": "garanti",
+    "00064": "isbank",
+    "00067": "yapikredi",
+    "00099": "ing",
+    "00111": "enpara",
+    "00134": "denizbank",
+    "00205": "kuveytturk",
+    "00210": "vakifkatilim",
+}
+
+IBAN_LENGTH = 26
+
+# Boşluklu/satır kırılımlı yazımlar dahil aday; fazladan yakalanan rakamlar
+# (ör. arkadan gelen tutar) ilk 24 haneden sonra kesilir.
+_CANDIDATE = re.compile(r"TR[0-9][0-9\s]{20,40}")
+_SPACES = re.compile(r"\s+")
+
+
+def is_valid(iban):
+    # ISO 13616 mod-97: ilk 4 karakter sona alınır, harfler sayıya çevrilir (T=29, R=27)
+    if len(iban) != IBAN_LENGTH or not iban[2:].isdigit():
+        return False
+    return int(iban[4:] + "2927" + iban[2:4]) % 97 == 1
+
+
+def find_ibans(text):
+    # Metindeki TR IBAN adayları geçtikleri sırayla, boşluksuz; doğrulanmaz,
+    # tekrarlar kalır. "İlk IBAN gönderen, ikinci alıcı" gibi sıraya bağlı
+    # atamalar bunu kullanır: belgede tekrarlanan ya da geçersiz bir IBAN
+    # sonraki IBAN'ların yerini kaydırmaz.
+    return [_SPACES.sub("", m.group())[:IBAN_LENGTH] for m in _CANDIDATE.finditer(text)]
+
+
+def extract_ibans(text, candidates=None):
+    # Metindeki geçerli TR IBAN'ları belge sırasıyla, boşluksuz ve tekrarsız döner
+    out = []
+    for iban in find_ibans(text) if candidates is None else candidates:
+        if iban not in out and is_valid(iban):
+            out.append(iban)
+    return out
+
+
+def bank_of(iban):
+    return BANK_CODES.get(iban[4:9])
+
+
+def bank_votes(ibans):
+    # {banka: IBAN sayısı}, IBAN sırası korunur (ilk görülen önce)
+    votes = {}
+    for iban in ibans:
+        bank = bank_of(iban)
+        if bank:
+            votes[bank] = votes.get(bank, 0) + 1
+    return votes
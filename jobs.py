@@ -0,0 +1,244 @@
+# -*- coding: utf-8 -*-
+import asyncio
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+import uuid
+
+from result import dumps
+from utils import dbg
+
+# Asenkron parse işleri: POST /jobs belgeleri SQLite'taki kuyruğa yazıp hemen
+# bir iş kimliği döner, API sürecindeki dağıtıcı (dispatch) kuyruktaki
+# belgeleri parse havuzuna verir, GET /jobs/{id} durum ve sonuçları okur.
+# Kuyruk diskte olduğu için yeniden başlatmada yarım kalan işler kaldığı
+# yerden devam eder. Sonuçlar iş bittikten PARSE_JOBS_TTL saniye sonra silinir.
+JOBS_DB = os.environ.get("PARSE_JOBS_DB") or os.path.join(tempfile.gettempdir(), "parser_jobs.db")
+JOBS_TTL = float(os.environ.get("PARSE_JOBS_TTL", "86400"))
+# Aynı anda parse edilen kuyruk belgesi (0 -> parse havuzu boyutu)
+JOBS_CONCURRENCY = int(os.environ.get("PARSE_JOBS_CONCURRENCY", "0"))
+# Bir belgeyi alan sürecin kiralama süresi (sn). Bu süreyi aşan "running"
+# belgeler sahibi çökmüş sayılır ve yeniden kuyruğa alınır; bu yüzden
+# dekont başına parse süresinden (PARSE_JOB_TIMEOUT) uzun olmalı.
+JOBS_LEASE = float(os.environ.get("PARSE_JOBS_LEASE", "600"))
+# Kuyrukta iş yokken ve süresi dolan sonuçların temizliği için bakma aralığı (sn)
+POLL_INTERVAL = 1.0
+PURGE_INTERVAL = 60.0
+
+
+class JobStore:
+    def __init__(self, db_path=JOBS_DB, ttl=JOBS_TTL, lease=JOBS_LEASE):
+        self.db_path = db_path
+        self.ttl = ttl
+        self.lease = lease
+        # Bu sürecin aldığı belgeler items.owner'da bununla işaretlenir
+        self.owner = uuid.uuid4().hex
+        self._db = None
+        self._db_pid = None
+        self._lock = threading.Lock()
+        self._wakeup = None
+        self._loop = None
+
+    def _conn(self):
+        if self._db is None or self._db_pid != os.getpid():
+            # isolation_level=None: işlemler BEGIN IMMEDIATE ile elle açılır,
+            # aynı dosyayı paylaşan birden çok API süreci aynı belgeyi almaz
+            db = sqlite3.connect(self.db_path, timeout=5, check_same_thread=False, isolation_level=None)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS jobs ("
+                " id TEXT PRIMARY KEY, status TEXT NOT NULL, bank TEXT, fields TEXT,"
+                " debug INTEGER NOT NULL, total INTEGER NOT NULL, completed INTEGER NOT NULL,"
+                " created REAL NOT NULL, finished REAL)"
+            )
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS items ("
+                " job_id TEXT NOT NULL, idx INTEGER NOT NULL, filename TEXT, state TEXT NOT NULL,"
+                " payload BLOB, result TEXT, owner TEXT, claimed REAL, PRIMARY KEY (job_id, idx))"
+            )
+            columns = {row[1] for row in db.execute("PRAGMA table_info(items)")}
+            if "owner" not in columns:
+                # Kiralama sütunlarından önce oluşturulmuş kuyruk dosyası
+                db.execute("ALTER TABLE items ADD COLUMN owner TEXT")
+                db.execute("ALTER TABLE items ADD COLUMN claimed REAL")
+            db.execute("CREATE INDEX IF NOT EXISTS items_state ON items(state)")
+            db.execute("CREATE INDEX IF NOT EXISTS jobs_finished ON jobs(finished)")
+            self._db, self._db_pid = db, os.getpid()
+        return self._db
+
+    def submit(self, items, bank=None, fields=None, debug=False):
+        # items: [(dosya adı, PDF bytes)] -> iş kimliği
+        job_id = uuid.uuid4().hex
+        with self._lock:
+            db = self._conn()
+            db.execute("BEGIN IMMEDIATE")
+            try:
+                db.execute(
+                    "INSERT INTO jobs (id, status, bank, fields, debug, total, completed, created)"
+                    " VALUES (?, ?, ?, ?, ?, ?, 0, ?)",
+                    (job_id, "queued" if items else "done", bank, fields, int(debug), len(items), time.time()),
+                )
+                db.executemany(
+                    "INSERT INTO items (job_id, idx, filename, state, payload) VALUES (?, ?, ?, 'queued', ?)",
+                    [(job_id, i, name, payload) for i, (name, payload) in enumerate(items)],
+                )
+                if not items:
+                    db.execute("UPDATE jobs SET finished = created WHERE id = ?", (job_id,))
+                db.execute("COMMIT")
+            except Exception:
+                db.execute("ROLLBACK")
+                raise
+        if self._wakeup is not None:
+            # submit API'de asyncio.to_thread ile çağrılır; Event döngü thread'inde set edilir
+            self._loop.call_soon_threadsafe(self._wakeup.set)
+        return job_id
+
+    def claim(self, limit):
+        # Sıradaki (en eski işin) belgeleri bu süreç adına "running" yapıp döner:
+        # [(job_id, idx, payload, bank, fields, debug)]
+        with self._lock:
+            db = self._conn()
+            db.execute("BEGIN IMMEDIATE")
+            try:
+                rows = db.execute(
+                    "SELECT i.job_id, i.idx, i.payload, j.bank, j.fields, j.debug"
+                    " FROM items i JOIN jobs j ON j.id = i.job_id"
+                    " WHERE i.state = 'queued' ORDER BY j.created, i.idx LIMIT ?",
+                    (limit,),
+                ).fetchall()
+                now = time.time()
+                for job_id, idx, *_ in rows:
+                    db.execute("UPDATE items SET state = 'running', owner = ?, claimed = ? WHERE job_id = ? AND idx = ?",
+                               (self.owner, now, job_id, idx))
+                    db.execute("UPDATE jobs SET status = 'running' WHERE id = ? AND status = 'queued'", (job_id,))
+                db.execute("COMMIT")
+            except Exception:
+                db.execute("ROLLBACK")
+                raise
+        return rows
+
+    def finish(self, job_id, idx, result):
+        # Belgenin sonucu yazılır, PDF silinir; son belgeyse iş "done" olur
+        blob = dumps(result).decode("utf-8")
+        with self._lock:
+            db = self._conn()
+            db.execute("BEGIN IMMEDIATE")
+            try:
+                cur = db.execute(
+                    "UPDATE items SET state = 'done', payload = NULL, result = ?"
+                    " WHERE job_id = ? AND idx = ? AND state != 'done'",
+                    (blob, job_id, idx),
+                )
+                if cur.rowcount:
+                    db.execute("UPDATE jobs SET completed = completed + 1 WHERE id = ?", (job_id,))
+                    db.execute(
+                        "UPDATE jobs SET status = 'done', finished = ? WHERE id = ? AND completed >= total",
+                        (time.time(), job_id),
+                    )
+                db.execute("COMMIT")
+            except Exception:
+                db.execute("ROLLBACK")
+                raise
+
+    def get(self, job_id):
+        # İşin durumu ve bitmiş belgelerin sonuçları (index sırasıyla); yoksa None
+        with self._lock:
+            db = self._conn()
+            job = db.execute(
+                "SELECT status, total, completed, created, finished FROM jobs WHERE id = ?", (job_id,)
+            ).fetchone()
+            if job is None:
+                return None
+            rows = db.execute(
+                "SELECT idx, filename, result FROM items WHERE job_id = ? AND state = 'done' ORDER BY idx",
+                (job_id,),
+            ).fetchall()
+        status, total, completed, created, finished = job
+        return {
+            "id": job_id, "status": status, "total": total, "completed": completed,
+            "created": created, "finished": finished,
+            "expires": finished + self.ttl if finished is not None else None,
+            "results": [{"index": idx, "filename": name, **json.loads(result)} for idx, name, result in rows],
+        }
+
+    def requeue(self):
+        # Sahibi yarıda kesilen belgeler yeniden kuyruğa alınır: kiralama süresi
+        # dolmuş "running" belgeler. Aynı dosyayı paylaşan başka bir API
+        # sürecinin hâlâ işlediği belgelere dokunulmaz.
+        with self._lock:
+            db = self._conn()
+            return db.execute(
+                "UPDATE items SET state = 'queued', owner = NULL, claimed = NULL"
+                " WHERE state = 'running' AND (claimed IS NULL OR claimed < ?)",
+                (time.time() - self.lease,),
+            ).rowcount
+
+    def purge(self):
+        # TTL'i dolan bitmiş işler ve sonuçları silinir
+        cutoff = time.time() - self.ttl
+        with self._lock:
+            db = self._conn()
+            db.execute("BEGIN IMMEDIATE")
+            try:
+                db.execute("DELETE FROM items WHERE job_id IN (SELECT id FROM jobs WHERE finished < ?)", (cutoff,))
+                n = db.execute("DELETE FROM jobs WHERE finished < ?", (cutoff,)).rowcount
+                db.execute("COMMIT")
+            except Exception:
+                db.execute("ROLLBACK")
+                raise
+        return n
+
+    def stats(self):
+        with self._lock:
+            db = self._conn()
+            counts = dict(db.execute("SELECT state, COUNT(*) FROM items GROUP BY state").fetchall())
+            jobs = dict(db.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall())
+        return {"jobs": jobs, "items": counts, "ttl": self.ttl}
+
+    async def dispatch(self, parse, concurrency):
+        # API sürecinde arka planda koşar. parse(payload, bank, fields, debug)
+        # bir coroutine; sonucu (hata dahil) dict olarak döner. SQLite erişimi
+        # olay döngüsünü bloklamasın diye thread'de yapılır.
+        self._loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+        pending = set()
+        last_purge = 0.0
+
+        async def one(job_id, idx, payload, bank, fields, debug):
+            try:
+                result = await parse(payload, bank, fields, bool(debug))
+            except Exception as e:
+                result = {"error": str(e)}
+            await asyncio.to_thread(self.finish, job_id, idx, result)
+
+        while True:
+            try:
+                if time.monotonic() - last_purge > PURGE_INTERVAL:
+                    # Kiralaması dolan belgeler de (ilk turda: önceki çalışmadan kalanlar)
+                    await asyncio.to_thread(self.requeue)
+                    await asyncio.to_thread(self.purge)
+                    last_purge = time.monotonic()
+                if len(pending) < concurrency:
+                    for row in await asyncio.to_thread(self.claim, concurrency - len(pending)):
+                        pending.add(asyncio.ensure_future(one(*row)))
+            except Exception as e:
+                # Ör. "database is locked": dağıtıcı durmaz, bir süre sonra yeniden dener
+                dbg(f"jobs: {e!r}")
+                await asyncio.sleep(POLL_INTERVAL)
+                continue
+            self._wakeup.clear()
+            waiters = pending | {asyncio.ensure_future(self._wakeup.wait())}
+            done, _ = await asyncio.wait(waiters, timeout=POLL_INTERVAL, return_when=asyncio.FIRST_COMPLETED)
+            for task in waiters - pending:
+                task.cancel()
+            for task in done & pending:
+                pending.discard(task)
+                if task.exception() is not None:
+                    # Sonuç yazılamadı; belge "running" kalır, kiralaması dolunca tekrar işlenir
+                    dbg(f"jobs: {task.exception()!r}")
+
+
+job_store = JobStore()
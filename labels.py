@@ -0,0 +1,130 @@
+# -*- coding: utf-8 -*-
+import re
+from functools import lru_cache
+
+# "ETİKET : değer" alanları için belge başına etiket indeksi. Parser'lar
+# "İŞLEM TARİHİ", "Alıcı IBAN" gibi etiketleri burada sorar:
+#
+#   L = doc.labels
+#   L.first("ALACAKLI ADI")                   # ilk değer ya da None
+#   L.match(P.iban_degeri, "ALACAKLI IBAN")   # değeri pattern'le başlayan ilk kayıt
+#
+# Etiket büyük/küçük harf ve Türkçe aksan farkı gözetmeden (İ/I, Ş/S, Ç/C...)
+# ve kelimeler arası boşluktan bağımsız eşleşir. Değer regex'teki
+# `ETİKET\s*:\s*([^\n]+)` ile aynıdır: satırın geri kalanı, satır boşsa sonraki
+# boş olmayan satır.
+#
+# Metni Python'da bir kez satır satır ayrıştırmak, bu boydaki dekontlarda
+# etiket başına C'de çalışan tek bir regex taramasından daha pahalı çıktı.
+# Bu yüzden indeks tembel dolar: her etiket için derlenmiş tek pattern
+# Document.up (banka tespitinde zaten hesaplanmış) üzerinde çalışır, bulunanlar
+# belge üzerinde saklanır; aynı etiketi tekrar soran kod yeniden taramaz.
+
+_FOLD = {"Ç": "C", "Ğ": "G", "İ": "I", "Ö": "O", "Ş": "S", "Ü": "U", "Â": "A", "Î": "I", "Û": "U"}
+# str.upper() çıktısında aksanlı/aksansız her iki yazım
+_VARIANTS = {"C": "[CÇ]", "G": "[GĞ]", "I": "[IİÎ]", "O": "[OÖ]", "S": "[SŞ]", "U": "[UÜÛ]", "A": "[AÂ]",
+             "/": r"\s*/\s*"}
+
+
+def fold(label):
+    # "İşlem  Tarihi/Saati" -> "ISLEM TARIHI/SAATI"
+    return " ".join("".join(_FOLD.get(c, c) for c in label.upper()).split())
+
+
+def label_regex(label):
+    # Etiketin büyük harf metinde aranacak regex kaynağı (":" hariç);
+    # kelimeler arasında istenen kadar boşluk
+    words = ["".join(_VARIANTS.get(c, re.escape(c)) for c in word) for word in fold(label).split(" ")]
+    return r"\s*".join(words)
+
+
+def label_initials(label):
+    # Etiketin büyük harf metinde başlayabileceği harfler (karakter sınıfı içeriği)
+    c = fold(label)[:1]
+    variant = _VARIANTS.get(c, "")
+    return variant[1:-1] if variant.startswith("[") else re.escape(c)
+
+
+@lru_cache(maxsize=1024)
+def _pattern(label, line_start, flags=0):
+    # Etiketin arkasında ":"; line_start: etiket satır başında. Önüne \b
+    # konmaz: sre'nin ilk harfe göre hızlı atlaması bozuluyor (parser
+    # regex'lerinde de sınır yoktu).
+    prefix = r"^[^\S\n]*" if line_start else ""
+    return re.compile(prefix + label_regex(label) + r"\s*:", re.M | flags)
+
+
+def line_value(text, end):
+    # ":" sonrası değer: satırın geri kalanı, satır boşsa sonraki boş olmayan satır
+    nl = text.find("\n", end)
+    value = text[end:nl if nl != -1 else len(text)].lstrip()
+    while not value and nl != -1:
+        start = nl + 1
+        nl = text.find("\n", start)
+        value = text[start:nl if nl != -1 else len(text)].lstrip()
+    return value
+
+
+class LabelIndex:
+    def __init__(self, text, up=None):
+        # up: text.upper(). Konumlar metinle birebir olmalı; "ß" -> "SS" gibi
+        # uzunluk değiştiren harf varsa tarama metnin kendisinde re.I ile yapılır.
+        self.text = text
+        up = text.upper() if up is None else up
+        self._haystack, self._flags = (up, 0) if len(up) == len(text) else (text, re.I)
+        # (etiket, line_start) -> bulunan [(konum, değer)] ve taramanın kaldığı yer
+        # (None: belge sonuna kadar tarandı)
+        self._found = {}
+        self._resume = {}
+
+    def _iter(self, label, line_start):
+        # Bulunanları önbellekten, gerisini gerektiği kadar tarayarak döner
+        key = (label, line_start)
+        found = self._found.setdefault(key, [])
+        yield from found
+        pos = self._resume.get(key, 0)
+        if pos is None:
+            return
+        pattern = _pattern(label, line_start, self._flags)
+        while True:
+            m = pattern.search(self._haystack, pos)
+            if not m:
+                self._resume[key] = None
+                return
+            entry = (m.start(), line_value(self.text, m.end()))
+            found.append(entry)
+            pos = self._resume[key] = m.end()
+            yield entry
+
+    def entries(self, *labels, line_start=False):
+        # Etiketlerin (herhangi birinin) belge sırasıyla (konum, değer) listesi
+        found = []
+        for label in labels:
+            found.extend(self._iter(label, line_start))
+        if len(labels) > 1:
+            found = sorted(set(found))
+        return found
+
+    def _ordered(self, labels, line_start):
+        return self._iter(labels[0], line_start) if len(labels) == 1 else self.entries(*labels, line_start=line_start)
+
+    def first(self, *labels, line_start=False):
+        # İlk değer; yoksa None. line_start=True: etiket satır başında olmalı
+        # (regex'teki ^\s*ETİKET\s*:)
+        for _, value in self._ordered(labels, line_start):
+            return value
+        return None
+
+    def match_all(self, pattern, *labels):
+        # Değeri derlenmiş pattern'le başından eşleşen kayıtlar (belge sırasıyla);
+        # regex'teki `ETİKET\s*:\s*(TR[0-9 ]+)` gibi değer biçimi şartlı aramalar için
+        for _, value in self._ordered(labels, False):
+            m = pattern.match(value)
+            if m:
+                yield m
+
+    def match(self, pattern, *labels):
+        return next(self.match_all(pattern, *labels), None)
+
+    def __contains__(self, label):
+        return self.first(label) is not None
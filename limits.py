@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+import os
+import signal
+import threading
+from contextlib import contextmanager
+
+# Dekont başına kaynak sınırları (0 -> sınırsız):
+#   PARSE_MAX_PAGES       sayfa sayısı; aşan PDF metni çıkarılmadan reddedilir
+#   PARSE_MAX_TEXT_CHARS  çıkarılan metin uzunluğu; aşınca çıkarma durur
+#   PARSE_DOC_TIMEOUT     worker'da dekont başına duvar saati (sn). Süre dolunca
+#                         parse kesilir, worker sağlam kalır (yumuşak sınır).
+#   PARSE_DOC_CPU         worker'da dekont başına CPU süresi (sn). C içinde takılan
+#                         kod (ör. geri izlemeye düşen bir regex) Python'a dönmediği
+#                         için yumuşak sınırla kesilemez; bu sınırda çekirdek
+#                         worker'ı öldürür (SIGPROF), havuz yenisini açar (sert sınır);
+#                         istek beklemeden timeout hatası alır (executor._watch).
+# Süre sınırları sadece süreç havuzu worker'larında (ana thread'de, setitimer
+# ile) uygulanır; thread modunda istek tarafındaki PARSE_JOB_TIMEOUT geçerlidir.
+MAX_PAGES = int(os.environ.get("PARSE_MAX_PAGES", "100"))
+MAX_TEXT_CHARS = int(os.environ.get("PARSE_MAX_TEXT_CHARS", "1000000"))
+DOC_TIMEOUT = float(os.environ.get("PARSE_DOC_TIMEOUT", "20"))
+DOC_CPU = float(os.environ.get("PARSE_DOC_CPU", "0")) or (DOC_TIMEOUT + 10 if DOC_TIMEOUT else 0)
+
+
+class LimitExceeded(Exception):
+    # Yanıtta {"error": ..., "code": ..., "limit": ...} olarak döner
+    def __init__(self, code, message, limit=None):
+        super().__init__(message)
+        self.code = code
+        self.limit = limit
+
+    def __reduce__(self):
+        # Süreç havuzundan pickle ile taşınabilsin
+        return type(self), (self.code, str(self), self.limit)
+
+    def as_dict(self):
+        return {"error": str(self), "code": self.code, "limit": self.limit}
+
+
+def check_pages(count):
+    if MAX_PAGES and count > MAX_PAGES:
+        raise LimitExceeded("too_many_pages", f"PDF {count} sayfa, en fazla {MAX_PAGES} sayfa işlenir", MAX_PAGES)
+
+
+def check_text(length):
+    if MAX_TEXT_CHARS and length > MAX_TEXT_CHARS:
+        raise LimitExceeded("text_too_long", f"çıkarılan metin {MAX_TEXT_CHARS} karakteri aştı", MAX_TEXT_CHARS)
+
+
+def _on_alarm(signum, frame):
+    raise LimitExceeded("timeout", f"parse {DOC_TIMEOUT:g} saniye içinde tamamlanamadı", DOC_TIMEOUT)
+
+
+@contextmanager
+def deadline(hard=True, soft=True, docs=1):
+    # Worker'da tek bir dekontun işlenmesini sarar. hard=False: sadece yumuşak
+    # sınır (işi kaybolan worker'ı fark etmeyen havuzlar için, ör. bulk.py).
+    # Birden çok dekontluk iş: soft=False, docs=dekont sayısı ile sadece
+    # (dekont sayısıyla çarpılmış) sert sınır; yumuşak sınır her dekontta
+    # deadline(hard=False) ile ayrıca uygulanır.
+    if not hasattr(signal, "setitimer") or threading.current_thread() is not threading.main_thread():
+        yield
+        return
+    soft = soft and DOC_TIMEOUT
+    hard = hard and DOC_CPU
+    if soft:
+        previous = signal.signal(signal.SIGALRM, _on_alarm)
+        signal.setitimer(signal.ITIMER_REAL, DOC_TIMEOUT)
+    if hard:
+        signal.signal(signal.SIGPROF, signal.SIG_DFL)
+        signal.setitimer(signal.ITIMER_PROF, DOC_CPU * docs)
+    try:
+        yield
+    finally:
+        if hard:
+            signal.setitimer(signal.ITIMER_PROF, 0)
+        if soft:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+            signal.signal(signal.SIGALRM, previous)
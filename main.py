@@ -1,147 +1,210 @@
-import pdfplumber
+import contextlib
+import os
 import re
+import fingerprint
+import limits
+import metrics
+import registry
+import samples
+import segment
 from utils import normalize_text, dbg
+from cache import result_cache, content_key
+from detect import detect_bank
+from document import Document
+import extract
+from extract import extract_text, backend_for_bank, PageReader, EXTRACT_MODE, DEFAULT_BACKEND
+from parsers.base import parse_fields, project
+from result import Result
 
-from parsers.enpara import EnparaParser
-from parsers.garanti import GarantiParser
-from parsers.vakif import VakifBankParser
-from parsers.yapikredi import YapiKrediParser
-from parsers.ziraat import ZiraatParser
-from parsers.akbank import AkbankParser
-from parsers.isbank import IsBankParser
-from parsers.denizbank import DenizbankParser
-from parsers.halkbank import HalkbankParser
-from parsers.ing import IngParser
-from parsers.teb import TebParser
-from parsers.kuveytturk import KuveytTurkParser
-from parsers.vakifkatilim import VakifKatilimParser
-from parsers.generic import GenericParser
-
-def extract_text(filepath):
-    text = ""
-    with pdfplumber.open(filepath) as pdf:
-        for page in pdf.pages:
-            p = page.extract_text()
-            if p:
-                text += p + "\n"
-    return normalize_text(text)
+# Parser modülleri registry üzerinden ilk kullanımda (worker'larda warmup'ta) yüklenir
 
 def banka_tespit(text):
-    # 1. Metni satırlara böl
-    lines = text.split('\n')
-
-
-
-    # 🔥 YENİ: HEADER (ilk 10 satır) kontrolü
-    head_lines = lines[:10]
-    head_text = "\n".join(head_lines).upper()
-    
-    # HEADER bazlı güçlü tespit
-    if "VAKIFBANK" in head_text:
-        return "vakif"
-    if "GARANTI" in head_text or "GARANTİ" in head_text:
-        return "garanti"
-    if "ZIRAAT" in head_text or "ZİRAAT" in head_text:
-        return "ziraat"
-    if "AKBANK" in head_text:
-        return "akbank"
-    if "YAPI KREDI" in head_text or "YAPIKREDI" in head_text:
-        return "yapikredi"
-    if "IS BANKASI" in head_text or "İŞ BANKASI" in head_text:
-        return "isbank"
-    if "ENPARA" in head_text or "QNB" in head_text:
-        return "enpara"
-    if "KUVEYT" in head_text:
-        return "kuveytturk"
-    if "HALKBANK" in head_text:
-        return "halkbank"
-    if "ING" in head_text:
-        return "ing"
-    if "TÜRK EKONOMİ BANKASI" in head_text or "TEB" in head_text:
-        return "teb"        
-    if "VAKIF KATILIM" in head_text or "VAKIFKATILIM" in head_text:
-        return "vakifkatilim"
-
-
-
-
-
-    
-    # 2. Yanıltıcı satırları (AlıcıBanka gibi) temizle
-    # Boşluksuz kontrol yaparak "AlıcıBanka" ve "Alıcı Banka" versiyonlarını eliyoruz.
-    filtered_lines = []
-    for line in lines:
-        line_up_no_space = line.upper().replace(" ", "")
-        if any(x in line_up_no_space for x in ["ALICIBANKA", "ALICI BANKA", "ALICI", "KATILIMCI"]):
-            continue
-        filtered_lines.append(line)
-    
-    clean_text = "\n".join(filtered_lines)
-    up = clean_text.upper()
-    
-    # Senin eski kodundaki tespit mantığının özeti:
-    if "KUVEYT" in up: 
-        return "kuveytturk"    
-    if "WWW. ZIRAATBANK.COM.TR" in up or  "T.C. ZİRAAT BANKASI A.Ş." in up or "ZİRAAT MOBİL" in up:
-        return "ziraat"     
-    if "WWW.ISBANK.COM.TR" in up or "İŞCEP" in up or "ISCEP" in up or "TÜRKİYE İŞ BANKASI A.Ş." in up:
-        return "isbank"     
-    if "DENIZBANK" in up or "DENİZBANK" in up or "DENIZ GAYRIMENKUL" in up:
-        return "denizbank"     
-    if any(x in up for x in ["ENPARA", "FINANSBANK", "FİNANSBANK", "QNB"]):
-        return "enpara"
-    if "WWW.GARANTIBBVA.COM.TR" in up or "T. GARANTİ BANKASI A.Ş." in up or "GARANTI" in up or "GARANTİ" in up:
-        return "garanti"  
-    if "VAKIFBANK" in up or "TÜRKİYE VAKIFLAR BANKASI T.A.O" in up or "WWW.VAKIFBANK.COM.TR" in up or "SİCİL NUMARASI: 776444" in up:
-        return "vakif"     
-    if "WWW.YAPIKREDI.COM.TR" in up or "YAPI VE KREDİ BANKASI A.Ş." in  up or "MERSIS NO: 0937002089200741" in up:
-        return "yapikredi"   
-    if "4560004685" in up or "0456000468500132" in up or "HALKBANK.COM.TR" in up:
-        return "halkbank" 
-    if "ZIRAATBANK" in up or "ZİRAAT BANKASI" in up or "ZIRAAT MOBIL" in up:
-        return "ziraat"       
-    if "WWW. ING.COM.TR" in up or "ING BANK A.Ş." in up: 
-        return "ing" 
-    if "TÜRK EKONOMİ BANKASI" in up or "TEB" in up:
-        return "teb"            
-    if any(x in up for x in ["VAKIF KATILIM", "VAKIFKATILIM"]): 
-        return "vakifkatilim"       
-    if ("AKBANK" in up or "AKBANK T.A.Ş" in up or "WWW.AKBANK.COM" 
-        or "GENEL MÜDÜRLÜK: SABANCI CENTER" in up or "VERGİ NO: 0150015264" in up):
-        return "akbank"    
-               
-    # Diğer banka tespitlerini (Garanti, Vakıf vb.) buraya sırayla ekleyeceğiz
-    return "bilinmiyor"
-
-def parse_dekont(filepath):
-    text = extract_text(filepath)
-    banka_key = banka_tespit(text)
-    
-    # Parser eşleştirme sözlüğü
-    parsers = {
-        "enpara": EnparaParser,
-        "garanti": GarantiParser,
-        "vakif": VakifBankParser,
-        "yapikredi": YapiKrediParser,
-        "ziraat": ZiraatParser,
-        "akbank": AkbankParser,
-        "isbank": IsBankParser,
-        "denizbank": DenizbankParser,
-        "halkbank": HalkbankParser,
-        "ing": IngParser,
-        "teb": TebParser,
-        "kuveytturk": KuveytTurkParser,
-        "vakifkatilim": VakifKatilimParser,  
-        "bilinmiyor": GenericParser      
-    }
-    
-    parser_class = parsers.get(banka_key)
-    if parser_class:
-        instance = parser_class(text)
-        return instance.parse()
-    
-    return {
-        "banka": banka_key, 
-        "_debug": "parser_dosyasi_henuz_yok",
-        "raw_preview": text[:200]
-    }
+    # Sıralı anahtar kelime zinciri, header önceliği ve ALICI/KATILIMCI satır
+    # filtresi detect.py'de. Geçerli IBAN'ların banka kodları anahtar kelime
+    # tutmazsa karar verir.
+    # text: str ya da Document (büyük harf görünümü ve IBAN'lar paylaşılır)
+    with metrics.stage("detect"):
+        return detect_bank(text)
+
+def _source_key(source):
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, "rb") as f:
+            return content_key(f.read())
+    return content_key(source)
+
+def result_key(key, bank=None, fields=None):
+    # content_key + banka ipucu + (varsa) istenen alanlar
+    if bank:
+        key += ":" + bank
+    if fields:
+        key += "?fields=" + ",".join(sorted(fields))
+    return key
+
+def cached_result(key, bank=None, fields=None):
+    # Tam sonuç cache'teyse istenen alanlar ondan kesilir, parse gerekmez
+    cached = result_cache.get(result_key(key, bank))
+    if cached is not None:
+        return project(cached, fields) if fields else cached
+    if fields:
+        return result_cache.get(result_key(key, bank, fields))
+    return None
+
+def parse_dekont(source, use_cache=True, bank=None, fields=None, debug=False):
+    # Aynı PDF (aynı parser sürümüyle) daha önce işlendiyse sonucu cache'ten dön.
+    # fields: sadece bu alanlar ("tutar,islemtarihi" ya da liste); parser
+    # istenmeyen alanları hiç çıkarmaz.
+    # debug: sonuca ham metin başı da eklenir (_debug_raw); cache'e girmez.
+    # Her zaman düz dict döner; result.Result sadece API'nin serileştirme
+    # yolunda (parse_traced) ve cache'te kalır.
+    fields = parse_fields(fields)
+    key = None
+    if use_cache and not debug and result_cache.enabled:
+        key = _source_key(source)
+        cached = cached_result(key, bank, fields)
+        if cached is not None:
+            return _as_dict(cached)
+
+    result = _parse_dekont(source, bank, fields, debug)
+    if key:
+        result_cache.put(result_key(key, bank, fields), result)
+    return _as_dict(result)
+
+def _as_dict(result):
+    return result.to_dict() if isinstance(result, Result) else result
+
+def parse_traced(source, bank=None, fields=None, debug=False, pages=None):
+    # parse_dekont + aşama süreleri. Süreç havuzunda koşar; trace düz bir
+    # dict olarak sonuçla birlikte döner, metrikler (ve örneklenen ham metin)
+    # ana süreçte işlenir. pages: extract_range parçalarından birleştirilmiş
+    # {backend: sayfalar}
+    with metrics.tracing() as trace:
+        result = _parse_dekont(source, bank, parse_fields(fields), debug, pages)
+    return result, trace.as_dict()
+
+def _initial_backend(bank=None):
+    # İstemci bankayı biliyorsa tespit atlanır ve doğrudan o bankanın backend'i ile okunur
+    return backend_for_bank(bank, registry.get(bank)) if bank else DEFAULT_BACKEND
+
+def extract_range(source, bank, start, stop):
+    # Paralel çıkarmanın bir parçası (süreç havuzunda): _parse_dekont'un ilk
+    # açacağı backend ile [start, stop) sayfaları -> (backend, sayfalar)
+    backend = _initial_backend(bank)
+    return backend, extract.extract_range(source, backend, start, stop)
+
+def _label_trace(banka_key, instance, reader, text):
+    trace = metrics.current()
+    if trace is not None:
+        trace.bank = banka_key
+        trace.branch = instance.branch if instance else "default"
+        trace.confidence = instance.confidence if instance else None
+        trace.pages = reader.pages_read
+        trace.sample = samples.take(text, banka_key == "bilinmiyor" or fingerprint.is_low(trace.confidence))
+
+def _parse_dekont(source, bank=None, fields=None, debug=False, pages=None):
+    return _parse_window(source, bank, fields, debug, pages)[0]
+
+def _parse_window(source, bank=None, fields=None, debug=False, pages=None, window=None, split=False):
+    # Tek dekont -> [sonuç]. window: çok dekontlu PDF'te dekontun sayfa aralığı;
+    # split: bankanın blok bölücüsü varsa (segment.BLOCK_SPLITTERS) dekont
+    # içindeki her işlem ayrı sonuç olur.
+    if bank and bank not in registry.PARSERS:
+        raise ValueError(f"bilinmeyen banka: {bank}")
+
+    lazy = EXTRACT_MODE == "lazy" and not split
+
+    with PageReader(source, _initial_backend(bank), pages, window) as reader:
+        if bank:
+            banka_key = bank
+        else:
+            # Lazy modda tespit sadece 1. sayfa üzerinden yapılır, banka
+            # bulunamazsa tüm sayfalara bakılır
+            doc = Document(reader.text(1 if lazy else None))
+            banka_key = banka_tespit(doc)
+            if banka_key == "bilinmiyor" and reader.pages_read < reader.page_count:
+                doc = Document(reader.text())
+                banka_key = banka_tespit(doc)
+
+        parser_class = registry.get(banka_key)
+
+        # Parser pdfplumber satır düzenine bağımlıysa (ya da banka için başka bir
+        # backend ayarlandıysa) metni o backend ile yeniden çıkar
+        reader.switch(backend_for_bank(banka_key, parser_class))
+
+        lazy_pages = lazy and not getattr(parser_class, "needs_all_pages", False)
+        text = reader.text(1 if lazy_pages else None)
+        # Metin tespittekiyle aynıysa Document (büyük harf, satırlar, IBAN'lar)
+        # parser'a aynen geçer, hiçbir görünüm ikinci kez hesaplanmaz
+        if bank or doc.text != text:
+            doc = Document(text)
+
+        if parser_class:
+            # split'te tüm sayfalar okunmuştur; metin bloklara bölünüyorsa
+            # bütün belge ayrıca parse edilmez, trace ilk bloğun dalını alır
+            blocks = segment.blocks(banka_key, text) if split else [text]
+            if len(blocks) > 1:
+                with metrics.stage("parse"):
+                    instances = [parser_class(Document(block), fields) for block in blocks]
+                    results = [i.parse() for i in instances]
+                instance = instances[0]
+            else:
+                with metrics.stage("parse"):
+                    instance = parser_class(doc, fields)
+                    result = instance.parse()
+                # 1. sayfada temel alanlar çıkmadıysa parser kalan sayfaları ister
+                if reader.pages_read < reader.page_count and instance.needs_more_pages():
+                    doc = Document(reader.text())
+                    with metrics.stage("parse"):
+                        instance = parser_class(doc, fields)
+                        result = instance.parse()
+                blocks, results = [doc.text], [result]
+            _label_trace(banka_key, instance, reader, doc.text)
+            if debug:
+                for result, block in zip(results, blocks):
+                    result["_debug_raw"] = block[:500]
+            return results
+        _label_trace(banka_key, None, reader, text)
+
+    result = {"banka": banka_key, "_debug": "parser_dosyasi_henuz_yok"}
+    if debug:
+        result["raw_preview"] = text[:200]
+    return [result]
+
+def parse_segments(source, segments, bank=None, fields=None, debug=False, pages=None, limited=False):
+    # Çok dekontlu PDF'in verilen [(başlangıç, bitiş)] sayfa aralıkları,
+    # her biri ayrı dekont olarak (süreç havuzunda bir grup halinde):
+    # -> [(başlangıç, bitiş, [sonuç], trace)]. Bir dekontun hatası diğerlerini
+    # etkilemez, o aralık için tek bir hata sonucu döner.
+    # limited: her dekont kendi yumuşak süre sınırıyla (limits.deadline,
+    # hard=False) işlenir; süreç havuzunda executor.run_group ile
+    fields = parse_fields(fields)
+    out = []
+    for start, stop in segments:
+        with metrics.tracing() as trace:
+            try:
+                with limits.deadline(hard=False) if limited else contextlib.nullcontext():
+                    results = _parse_window(source, bank, fields, debug, pages, (start, stop), split=True)
+            except limits.LimitExceeded as e:
+                results = [e.as_dict()]
+            except Exception as e:
+                results = [{"error": str(e)}]
+        out.append((start, stop, results, trace.as_dict()))
+    return out
+
+def read_segments(source, bank=None, pages=None):
+    # Tüm sayfalar (_parse_window'un ilk açacağı backend ile) ve dekont
+    # sınırları: -> ({backend: sayfalar}, [(başlangıç, bitiş)]).
+    # pages: API'de paralel çıkarılmış sayfalar
+    backend = _initial_backend(bank)
+    if pages is None:
+        with PageReader(source, backend) as reader:
+            pages = {backend: reader.page_range(0, reader.page_count)}
+    return pages, segment.page_segments(pages[backend])
+
+def parse_multi(source, bank=None, fields=None, debug=False):
+    # Çok dekontlu PDF (toplu e-dekont dökümü, maaş ödeme raporu) -> dekont ya
+    # da işlem başına bir sonuç. Seri yol; API süreç havuzunda dekont
+    # gruplarını paralel işler.
+    pages, segments = read_segments(source, bank)
+    return [{"segment": i, "pages": [start + 1, stop], "item": j, **result}
+            for i, (start, stop, results, _) in enumerate(parse_segments(source, segments, bank, fields, debug, pages))
+            for j, result in enumerate(results)]
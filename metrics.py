@@ -0,0 +1,203 @@
+# -*- coding: utf-8 -*-
+import os
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+
+# Parse hattının aşamaları: read (PDF'in açılması), extract (sayfa metni),
+# detect (banka tespiti), parse (parser.parse(), finalize hariç), finalize
+STAGES = ("read", "extract", "detect", "parse", "finalize")
+
+# Saniye cinsinden histogram sınırları (Prometheus varsayılanlarına yakın)
+BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# Dekont başına tepe bellek (bayt) sınırları
+MEMORY_BUCKETS = tuple(mb * 1024 * 1024 for mb in (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000))
+# Format parmak izi skoru (0..1) sınırları
+CONFIDENCE_BUCKETS = (0.25, 0.5, 0.75, 0.9, 1.0)
+
+# PARSER_TRACE_MEMORY=1: her dekontun tepe bellek kullanımı tracemalloc ile
+# ölçülür (Python tahsisleri; PyMuPDF'in C tarafı görünmez). tracemalloc
+# tahsisleri yavaşlattığı için varsayılan kapalı.
+TRACE_MEMORY = os.environ.get("PARSER_TRACE_MEMORY", "0") == "1"
+
+
+class Trace:
+    # Tek bir dekontun aşama süreleri. Süreler "exclusive": iç içe bir aşama
+    # (parse içinde finalize) dıştakinin süresinden düşülür, toplam gerçek
+    # süreyi verir.
+    def __init__(self):
+        self.stages = {}
+        self.bank = "bilinmiyor"
+        self.branch = "default"
+        self.pages = 0
+        self.confidence = None  # format parmak izi skoru (fingerprint.py)
+        self.sample = None  # samples.take() çıktısı (sıkıştırılmış ham metin)
+        self.peak_bytes = None
+        self._stack = []
+
+    @contextmanager
+    def stage(self, name):
+        start = time.perf_counter()
+        self._stack.append(0.0)
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            nested = self._stack.pop()
+            self.stages[name] = self.stages.get(name, 0.0) + elapsed - nested
+            if self._stack:
+                self._stack[-1] += elapsed
+
+    def as_dict(self):
+        # Süreç havuzundan ana sürece pickle ile taşınacak düz hali
+        return {"stages": self.stages, "bank": self.bank, "branch": self.branch, "pages": self.pages,
+                "confidence": self.confidence, "sample": self.sample, "peak_bytes": self.peak_bytes}
+
+
+_local = threading.local()
+
+
+@contextmanager
+def tracing():
+    # Bu thread'de çalışan parse'ın aşamalarını toplayan Trace'i açar
+    previous = getattr(_local, "trace", None)
+    _local.trace = trace = Trace()
+    if TRACE_MEMORY:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+        tracemalloc.reset_peak()
+        base = tracemalloc.get_traced_memory()[0]
+    try:
+        yield trace
+    finally:
+        _local.trace = previous
+        if TRACE_MEMORY:
+            # Süreç genelinde ölçülür: thread modunda eş zamanlı parse'lar birbirine karışır
+            trace.peak_bytes = tracemalloc.get_traced_memory()[1] - base
+
+
+def current():
+    return getattr(_local, "trace", None)
+
+
+def stage(name):
+    # Açık bir trace yoksa (ör. parse_dekont doğrudan çağrıldıysa) maliyetsiz
+    trace = current()
+    return trace.stage(name) if trace is not None else nullcontext()
+
+
+class Counter:
+    def __init__(self, name, help, labels=()):
+        self.name, self.help, self.labels = name, help, labels
+        self._values = {}
+
+    def inc(self, value=1, **labels):
+        key = tuple(labels.get(name, "") for name in self.labels)
+        self._values[key] = self._values.get(key, 0) + value
+
+    def render(self):
+        out = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        values = self._values if self._values or self.labels else {(): 0}
+        for key, value in sorted(values.items()):
+            out.append(f"{self.name}{_labels(self.labels, key)} {value:g}")
+        return out
+
+
+class Histogram:
+    def __init__(self, name, help, labels=(), buckets=BUCKETS):
+        self.name, self.help, self.labels, self.buckets = name, help, labels, buckets
+        self._values = {}  # label değerleri -> [bucket sayaçları..., toplam, adet]
+
+    def observe(self, value, **labels):
+        key = tuple(labels.get(name, "") for name in self.labels)
+        row = self._values.get(key)
+        if row is None:
+            row = self._values[key] = [0] * len(self.buckets) + [0.0, 0]
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                row[i] += 1
+        row[-2] += value
+        row[-1] += 1
+
+    def render(self):
+        out = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        for key, row in sorted(self._values.items()):
+            for bound, count in zip(self.buckets, row):
+                out.append(f"{self.name}_bucket{_labels(self.labels + ('le',), key + (f'{bound:.10g}',))} {count}")
+            out.append(f"{self.name}_bucket{_labels(self.labels + ('le',), key + ('+Inf',))} {row[-1]}")
+            out.append(f"{self.name}_sum{_labels(self.labels, key)} {row[-2]:.6f}")
+            out.append(f"{self.name}_count{_labels(self.labels, key)} {row[-1]}")
+        return out
+
+
+def _labels(names, values):
+    if not names:
+        return ""
+    pairs = ",".join(f'{n}="{v}"' for n, v in zip(names, values))
+    return "{" + pairs + "}"
+
+
+STAGE_SECONDS = Histogram("parser_stage_seconds", "Aşama başına parse süresi",
+                          ("stage", "bank", "branch"))
+DOCUMENT_SECONDS = Histogram("parser_document_seconds", "Dekont başına toplam parse süresi",
+                             ("bank", "branch"))
+DOCUMENTS = Counter("parser_documents_total", "Parse edilen dekont sayısı", ("bank", "branch"))
+PAGES = Counter("parser_pages_total", "Metni çıkarılan sayfa sayısı", ("bank",))
+PEAK_BYTES = Histogram("parser_document_peak_bytes", "Dekont başına tepe Python belleği (PARSER_TRACE_MEMORY=1)",
+                       ("bank",), MEMORY_BUCKETS)
+CONFIDENCE = Histogram("parser_format_confidence", "Seçilen format varyantının parmak izi skoru",
+                       ("bank", "branch"), CONFIDENCE_BUCKETS)
+ERRORS = Counter("parser_errors_total", "Hata ile biten parse sayısı")
+COALESCED = Counter("parser_coalesced_total", "Aynı içerikli, sürmekte olan bir parse'ı bekleyen istek sayısı")
+
+_lock = threading.Lock()
+
+
+def observe(trace):
+    # Worker'dan dönen trace (dict) ana süreçteki sayaçlara işlenir
+    bank, branch = trace["bank"], trace["branch"]
+    with _lock:
+        for name, seconds in trace["stages"].items():
+            STAGE_SECONDS.observe(seconds, stage=name, bank=bank, branch=branch)
+        DOCUMENT_SECONDS.observe(sum(trace["stages"].values()), bank=bank, branch=branch)
+        DOCUMENTS.inc(bank=bank, branch=branch)
+        PAGES.inc(trace["pages"], bank=bank)
+        if trace.get("peak_bytes") is not None:
+            PEAK_BYTES.observe(trace["peak_bytes"], bank=bank)
+        if trace.get("confidence") is not None:
+            CONFIDENCE.observe(trace["confidence"], bank=bank, branch=branch)
+
+
+def error():
+    with _lock:
+        ERRORS.inc()
+
+
+def coalesced():
+    with _lock:
+        COALESCED.inc()
+
+
+def render(cache_stats=None):
+    # Prometheus text exposition formatı (text/plain; version=0.0.4)
+    with _lock:
+        out = []
+        for metric in (STAGE_SECONDS, DOCUMENT_SECONDS, DOCUMENTS, PAGES, PEAK_BYTES, CONFIDENCE, ERRORS, COALESCED):
+            out += metric.render()
+    if cache_stats:
+        outcomes = {
+            "memory_hit": cache_stats["hits"] - cache_stats["disk_hits"],
+            "disk_hit": cache_stats["disk_hits"],
+            "miss": cache_stats["misses"],
+        }
+        out += ["# HELP parser_cache_lookups_total Sonuç cache'i sorguları", "# TYPE parser_cache_lookups_total counter"]
+        for outcome, value in outcomes.items():
+            out.append(f'parser_cache_lookups_total{{outcome="{outcome}"}} {value}')
+        out += ["# HELP parser_cache_evictions_total Cache'ten atılan kayıt sayısı (tier: memory, disk)",
+                "# TYPE parser_cache_evictions_total counter",
+                f'parser_cache_evictions_total{{tier="memory"}} {cache_stats["evictions"]}',
+                f'parser_cache_evictions_total{{tier="disk"}} {cache_stats["disk_evictions"]}',
+                "# HELP parser_cache_entries Bellekteki cache kaydı sayısı", "# TYPE parser_cache_entries gauge",
+                f"parser_cache_entries {cache_stats['memory_entries']}"]
+    return "\n".join(out) + "\n"
@@ -1,11 +1,21 @@
 # -*- coding: utf-8 -*-
 import re
-from parsers.base import BaseParser
+from parsers.base import BaseParser, PARTY_FIELDS
+from patterns import table
 from utils import dbg, parse_amount, to_turkish_upper
 
+P = table(
+    "akbank",
+    tarih=(r"İşlem Tarihi/Saati\s*:\s*(\d{2}\.\d{2}\.\d{4})", re.I),
+    toplam=(r"TOPLAM\s*([\d\.,]+)\s*TL", re.I),
+    unvan_etiketi=(r"Adı Soyadı/Unvan\s*:", re.I),
+)
+
 class AkbankParser(BaseParser):
-    def __init__(self, text):
-        super().__init__(text, "akbank")
+    extract_backend = "pdfplumber"  # satır kırılımlarına göre çalışıyor
+
+    def __init__(self, doc, fields=None):
+        super().__init__(doc, "akbank", fields)
 
     def parse(self):
         raw = self.text
@@ -17,17 +27,20 @@ class AkbankParser(BaseParser):
         self.data["is_giden"] = True
 
         # 2. Tarih ve Tutar
-        m = re.search(r"İşlem Tarihi/Saati\s*:\s*(\d{2}\.\d{2}\.\d{4})", raw, re.I)
+        m = P.tarih.search(raw)
         if m: self.data["islemtarihi"] = m.group(1)
 
-        m = re.search(r"TOPLAM\s*([\d\.,]+)\s*TL", raw, re.I)
+        m = P.toplam.search(raw)
         if m: self.data["tutar"] = parse_amount(m.group(1))
 
+        if self.can_stop(*PARTY_FIELDS):
+            return self.finalize()
+
         # 3. İsim Algoritması (Senin özel mantığın)
-        lines = raw.split("\n")
+        lines = self.doc.lines
         for i, ln in enumerate(lines):
             if "Adı Soyadı/Unvan" in ln or "Adi Soyadi/Unvan" in ln:
-                parts = re.split(r"Adı Soyadı/Unvan\s*:", ln, flags=re.I)
+                parts = P.unvan_etiketi.split(ln)
                 parts = [p.strip() for p in parts if p.strip()]
 
                 if len(parts) == 1:
@@ -49,8 +62,7 @@ class AkbankParser(BaseParser):
                     self.data["alici"] = receiver
 
         # 4. IBAN Yakalama
-        raw_clean = raw.replace("\n", " ")
-        ibans = [re.sub(r"\s+", "", x) for x in re.findall(r"(TR[0-9][0-9\s]{20,34})", raw_clean, flags=re.I)]
+        ibans = self.iban_candidates
         if len(ibans) >= 1: self.data["gondereniban"] = ibans[0]
         if len(ibans) >= 2: self.data["aliciiban"] = ibans[1]
 
@@ -1,17 +1,119 @@
+import metrics
+from document import Document
+from result import Result
 from utils import to_turkish_upper
 
+# Parser sonucundaki alanlar (fields= ile istenebilenler). Bayraklar tür
+# tespitinde hep birlikte belirlenir, diğerleri tek tek çıkarılır.
+# is_eft (Vakıf, TEB) ve aciklama (TEB) sadece bazı bankalarda var.
+FLAGS = ("is_fast", "is_havale", "is_maas", "is_gelen", "is_giden", "is_eft")
+FIELDS = ("banka",) + FLAGS + ("gonderen", "gondereniban", "alici", "aliciiban", "tutar", "islemtarihi",
+                               "aciklama")
+# Parser'ların isim temizleme / IBAN birleştirme yaptığı (en pahalı) kısım
+PARTY_FIELDS = ("gonderen", "gondereniban", "alici", "aliciiban")
+
+
+def parse_fields(fields):
+    # "tutar,islemtarihi" ya da liste -> frozenset; boşsa None (tüm alanlar)
+    if not fields:
+        return None
+    if isinstance(fields, str):
+        fields = fields.split(",")
+    fields = frozenset(f.strip() for f in fields if f.strip())
+    unknown = fields.difference(FIELDS)
+    if unknown:
+        raise ValueError(f"bilinmeyen alan: {', '.join(sorted(unknown))}")
+    return fields or None
+
+
+def project(result, fields):
+    # Tam sonuçtan istenen alanlar; banka her zaman döner
+    return {k: v for k, v in result.items() if k == "banka" or k in fields}
+
+
 class BaseParser:
-    def __init__(self, text, bank_name):
-        self.text = text
-        self.up = text.upper()
-        self.data = {
-            "banka": bank_name, "is_fast": False, "is_havale": False, "is_maas": False,
-            "is_gelen": False, "is_giden": False, "gonderen": "", "gondereniban": "",
-            "alici": "", "aliciiban": "", "tutar": "", "islemtarihi": "",
-            "_debug_raw": text[:500]
-        }
+    # Parser belirli bir extract backend'inin satır düzenine bağımlıysa adı (ör. "pdfplumber")
+    extract_backend = None
+    # Lazy extraction modunda parser tüm sayfaları baştan istiyorsa True
+    needs_all_pages = False
+    # Birden çok dekont formatı olan parser'lar parse() içinde hangi dalın
+    # çalıştığını yazar; metriklerde etiket olarak kullanılır
+    branch = "default"
+    # Format varyantları fingerprint.Formats ile tanımlıysa classify() seçilen
+    # varyantı branch, parmak izi skorunu (0..1) confidence yapar
+    formats = None
+    confidence = None
+
+    def __init__(self, doc, bank_name, fields=None):
+        # doc: parse_dekont'un tespitle paylaştığı Document (düz str de olur)
+        # fields: sadece bu alanlar isteniyor (parse_fields); None ise hepsi
+        self.doc = doc = Document.of(doc)
+        self.fields = parse_fields(fields)
+        self.text = doc.text
+        self.up = doc.up
+        self.data = Result(bank_name)
+
+    def classify(self):
+        fp = self.formats.classify(self.doc)
+        self.branch = fp.variant.name
+        self.confidence = fp.confidence
+        return fp
+
+    @property
+    def ibans(self):
+        # Belgedeki geçerli (mod-97) IBAN'lar, belge sırasıyla; tespitte
+        # çıkarıldıysa Document'tan aynen gelir
+        return self.doc.ibans
+
+    @property
+    def iban_candidates(self):
+        # Sıraya bağlı atamalar için (ilk IBAN gönderen, ikinci alıcı): tüm TR
+        # IBAN adayları belge sırasıyla, tekrarlar ve geçersizler dahil
+        return self.doc.iban_candidates
+
+    def wants(self, *names):
+        # İstenen alanlardan biri mi (fields verilmediyse hepsi isteniyor)
+        return self.fields is None or not self.fields.isdisjoint(names)
+
+    def complete(self):
+        # fields ile istenen alanların hepsi dolu mu (bayraklar tür tespitinde
+        # belirlendiği için dolu sayılır)
+        return self.fields is not None and all(
+            f in FLAGS or f == "banka" or self.data.get(f) not in ("", None) for f in self.fields)
+
+    def can_stop(self, *remaining):
+        # parse() içinde erken çıkış: istenenler doldu ya da bundan sonra
+        # çıkarılacak alanların (remaining) hiçbiri istenmiyor
+        return self.fields is not None and (self.complete() or not self.wants(*remaining))
+
+    def needs_more_pages(self):
+        # Lazy modda 1. sayfadan tutar/tarih (fields verildiyse istenen
+        # alanlar) çıkmadıysa kalan sayfalar da okunur
+        if self.fields is not None:
+            return not self.complete()
+        return not self.data.get("tutar") or not self.data.get("islemtarihi")
 
     def finalize(self):
-        self.data["gonderen"] = to_turkish_upper(self.data.get("gonderen", ""))
-        self.data["alici"] = to_turkish_upper(self.data.get("alici", ""))
+        with metrics.stage("finalize"):
+            self.data["gonderen"] = to_turkish_upper(self.data.get("gonderen", ""))
+            self.data["alici"] = to_turkish_upper(self.data.get("alici", ""))
+            if self.fields is not None:
+                return project(self.data, self.fields)
         return self.data
+
+
+class SpecParser(BaseParser):
+    # Formatı spec.Spec ile bildirilen parser'lar: tek geçişlik tarama,
+    # seçilen varyant branch, istenen alanlardan bulunanların oranı confidence olur
+    spec = None
+
+    def __init__(self, doc, fields=None):
+        super().__init__(doc, self.spec.bank, fields)
+
+    def parse(self):
+        self.branch, flags, values, self.confidence = self.spec.scan(self.doc, self.fields)
+        for flag in flags:
+            self.data[flag] = True
+        for name, value in values.items():
+            self.data[name] = value
+        return self.finalize()
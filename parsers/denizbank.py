@@ -1,16 +1,27 @@
 # -*- coding: utf-8 -*-
 import re
-from parsers.base import BaseParser
+from parsers.base import BaseParser, PARTY_FIELDS
+from patterns import table
 from utils import parse_amount, to_turkish_upper
 
+P = table(
+    "denizbank",
+    tutar=(r"Tutar\s+([\d\.,]+)", re.I),
+    tarih=(r"İşlem\s*Tarihi\s*(\d{2}\.\d{2}\.\d{4})", re.I),
+    gonderen=(r"Adı\s*Soyadı\s+(.*?)(?=\s*İşlem\s*Türü)", re.I | re.S),
+    alici=(r"Alıcı\s*Adı\s*Soyadı\s+(.*?)(?=\s*Alıcı\s*IBAN|\s*Alıcı\s*Şube|\s*Tutar|$)", re.I | re.S),
+    alici_iban=(r"Alıcı\s*IBAN\s*(TR[0-9 ]+)", re.I),
+    gonderen_iban=(r"(?<!Alıcı\s)IBAN\s*(TR[0-9 ]+)", re.I),
+)
+
 class DenizbankParser(BaseParser):
-    def __init__(self, text):
-        super().__init__(text, "denizbank")
+    def __init__(self, doc, fields=None):
+        super().__init__(doc, "denizbank", fields)
 
     def parse(self):
         raw = self.text
-        clean_raw = raw.replace("\n", "  ")
-        up = to_turkish_upper(clean_raw)
+        clean_raw = self.doc.flat
+        up = self.doc.flat_tr_up
 
         # 1. Tür Tespiti
         if "FAST" in up:
@@ -19,36 +30,35 @@ class DenizbankParser(BaseParser):
         self.data["is_giden"] = True
 
         # 2. Tutar
-        m_tutar = re.search(r"Tutar\s+([\d\.,]+)", clean_raw, re.I)
+        m_tutar = P.tutar.search(clean_raw)
         if m_tutar:
             self.data["tutar"] = parse_amount(m_tutar.group(1))
 
         # 3. Tarih
-        m_date = re.search(r"İşlem\s*Tarihi\s*(\d{2}\.\d{2}\.\d{4})", clean_raw, re.I)
+        m_date = P.tarih.search(clean_raw)
         if m_date:
             self.data["islemtarihi"] = m_date.group(1)
 
+        if self.can_stop(*PARTY_FIELDS):
+            return self.finalize()
+
         # 4. Gönderen
-        m_g = re.search(r"Adı\s*Soyadı\s+(.*?)(?=\s*İşlem\s*Türü)", clean_raw, re.I | re.S)
+        m_g = P.gonderen.search(clean_raw)
         if m_g:
             self.data["gonderen"] = to_turkish_upper(" ".join(m_g.group(1).split()).strip())
 
         # 5. Alıcı (YENİ + GERİ UYUMLU)
-        m_a = re.search(
-            r"Alıcı\s*Adı\s*Soyadı\s+(.*?)(?=\s*Alıcı\s*IBAN|\s*Alıcı\s*Şube|\s*Tutar|$)",
-            clean_raw,
-            re.I | re.S
-        )
+        m_a = P.alici.search(clean_raw)
         if m_a:
             self.data["alici"] = to_turkish_upper(" ".join(m_a.group(1).split()).strip())
 
         # 6. Alıcı IBAN
-        m_a_iban = re.search(r"Alıcı\s*IBAN\s*(TR[0-9 ]+)", clean_raw, re.I)
+        m_a_iban = P.alici_iban.search(clean_raw)
         if m_a_iban:
             self.data["aliciiban"] = m_a_iban.group(1).replace(" ", "").strip()
 
         # 7. Gönderen IBAN
-        m_g_iban = re.search(r"(?<!Alıcı\s)IBAN\s*(TR[0-9 ]+)", clean_raw, re.I)
+        m_g_iban = P.gonderen_iban.search(clean_raw)
         if m_g_iban:
             self.data["gondereniban"] = m_g_iban.group(1).replace(" ", "").strip()
 
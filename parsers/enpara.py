@@ -1,11 +1,52 @@
 # -*- coding: utf-8 -*-
 import re
-from parsers.base import BaseParser
+from fingerprint import Format, Formats
+from parsers.base import BaseParser, PARTY_FIELDS
+from patterns import table
 from utils import dbg, parse_amount, to_turkish_upper
 
+P = table(
+    "enpara",
+    qnb_gonderen=(r"GONDEREN\s+[^:]", re.I),
+    tarih_genel=r"(\d{2}[./]\d{2}[./]\d{4})",
+    # QNB formatı
+    qnb_tarih=(r"İşlem\s+Tarihi\s+(\d{2}/\d{2}/\d{4})", re.I),
+    qnb_eft_tutari=(r"EFT\s*TUTARI\s*:\s*([\d\.,]+)", re.I),
+    qnb_tutari=(r"TUTARI\s*:\s*([\d\.,]+)", re.I),
+    qnb_tl_tutar=r"TL\s+([\d\.,]+)",
+    qnb_giden_gonderen=(r"G[ÖO]NDEREN\s*[:\s]\s*([^\n]+)", re.I),
+    qnb_aciklama_iban=(r"AÇIKLAMA|IBAN", re.I),
+    qnb_iban_tr10=r"TR10\d{22}",
+    qnb_musteri_iban=(r"MUSTERI\s+UNVANI.*?IBAN\s*:\s*(TR[0-9 ]+)", re.S | re.I),
+    qnb_alici=(r"ALICI\s+Ü?NVANI\s*:\s*([^\n]+)", re.I),
+    qnb_alici_iban_ayrac=(r"ALICI\s+IBAN|IBAN", re.I),
+    qnb_alici2=(r"Alıcı\s*:\s*([^\n]+?)(?:\s+Türkiye|\s+TL|\s+IBAN|$)", re.I),
+    qnb_alici_iban=(r"ALICI\s+IBAN\s*:\s*(TR[0-9 ]+)", re.I),
+    # Eski format
+    tarih=(r"[İIıi]şlem\s+tarihi(?:\s+ve\s+saati)?\s*[:]\s*(\d{2}[./]\d{2}[./]\d{4})", re.IGNORECASE),
+    tutar=r"TL\s*([\d\.,]+)",
+    giden_gonderen=r"GÖNDEREN\s*:\s*([^\n]+)",
+    alici=r"ALICI ÜNVANI\s*:\s*([^\n]+)",
+    alici_son_ek=(r'[,\.\s]*\bALICI\b[,\.\s]*$', re.I),
+    alici_iban=r"ALICI IBAN\s*:\s*(TR[0-9 ]+)",
+    gonderen_iban=(r"MÜŞTERİ ÜNVANI.*?IBAN\s*:\s*(TR[0-9 ]+)", re.S),
+    sube_adi=(r"Şube adı\s*:([^\n\r]+)", re.I),
+    sayin=(r"Sayın\s+(.+)", re.I),
+    vadesiz_iban=(r"(Vadesiz|Günlük)\s+TL\s+(TR[0-9 ]+)", re.I),
+    gelen_gonderen=(r"GÖNDEREN\s*:\s*([^\n]+)", re.I),
+)
+
+# QNB geçiyorsa ya da GÖNDEREN'den sonra iki nokta yoksa yeni (QNB) format
+FORMATS = Formats(
+    Format("qnb", when=("QNB", P.qnb_gonderen), tokens=("ENPARA", "İŞLEM TARIHI", "TUTARI", "IBAN", "ALICI")),
+    Format("legacy", tokens=("ENPARA", "İŞLEM TARIHI", "TL ", "GÖNDEREN :")),
+)
+
 class EnparaParser(BaseParser):
-    def __init__(self, text):
-        super().__init__(text, "ENPARA")
+    formats = FORMATS
+
+    def __init__(self, doc, fields=None):
+        super().__init__(doc, "ENPARA", fields)
 
     def parse(self):
         raw = self.text
@@ -19,32 +60,31 @@ class EnparaParser(BaseParser):
         if "MAAŞ" in up or "MAAS" in up: self.data["is_maas"] = True
 
         # --- SEÇİCİ MANTIK: QNB / YENİ FORMAT MI? ---
-        # Eğer metinde QNB geçiyorsa veya GÖNDEREN'den sonra iki nokta yoksa yeni kodu çalıştır
-        is_qnb_format = "QNB" in up or re.search(r"GONDEREN\s+[^:]", raw, re.I)
+        fp = self.classify()
 
-        if is_qnb_format:
+        if fp.variant.name == "qnb":
             # ---------------------------------------------------------
             # YENİ QNB FORMATI İÇİN ÇALIŞAN KODUN (İKİNCİ KOD)
             # ---------------------------------------------------------
             # 2. Tarih
-            m_tarih = re.search(r"İşlem\s+Tarihi\s+(\d{2}/\d{2}/\d{4})", raw, re.I)
+            m_tarih = P.qnb_tarih.search(raw)
             if m_tarih:
                 self.data["islemtarihi"] = m_tarih.group(1).replace("/", ".")
             else:
-                m = re.search(r"(\d{2}[./]\d{2}[./]\d{4})", raw)
+                m = P.tarih_genel.search(raw)
                 if m: self.data["islemtarihi"] = m.group(1).replace("/", ".")
 
             # 3. Tutar
             # Önce gerçek EFT tutarı
-            m_tutar = re.search(r"EFT\s*TUTARI\s*:\s*([\d\.,]+)", raw, re.I)
+            m_tutar = P.qnb_eft_tutari.search(raw)
 
             # yoksa genel TUTARI
             if not m_tutar:
-                m_tutar = re.search(r"TUTARI\s*:\s*([\d\.,]+)", raw, re.I)
+                m_tutar = P.qnb_tutari.search(raw)
 
             # son fallback
             if not m_tutar:
-                m_tutar = re.search(r"TL\s+([\d\.,]+)", raw)
+                m_tutar = P.qnb_tl_tutar.search(raw)
 
             if m_tutar:
                 amount = m_tutar.group(1)
@@ -54,27 +94,30 @@ class EnparaParser(BaseParser):
 
                 self.data["tutar"] = parse_amount(amount)
 
+            if self.can_stop(*PARTY_FIELDS):
+                return self.finalize()
+
             # 4. Giden İşlem
             if self.data["is_giden"]:
-                m_g = re.search(r"G[ÖO]NDEREN\s*[:\s]\s*([^\n]+)", raw, re.I)
+                m_g = P.qnb_giden_gonderen.search(raw)
                 if m_g:
-                    self.data["gonderen"] = re.split(r"AÇIKLAMA|IBAN", m_g.group(1), flags=re.I)[0].strip()
+                    self.data["gonderen"] = P.qnb_aciklama_iban.split(m_g.group(1))[0].strip()
 
-                m_g_iban = re.search(r"TR10\d{22}", raw.replace(" ", ""))
+                m_g_iban = P.qnb_iban_tr10.search(self.doc.no_space)
                 if m_g_iban:
                     self.data["gondereniban"] = m_g_iban.group(0)
                 else:
-                    m_alt_iban = re.search(r"MUSTERI\s+UNVANI.*?IBAN\s*:\s*(TR[0-9 ]+)", raw, re.S | re.I)
+                    m_alt_iban = P.qnb_musteri_iban.search(raw)
                     if m_alt_iban: self.data["gondereniban"] = m_alt_iban.group(1).replace(" ", "").strip()
 
-                m_alici = re.search(r"ALICI\s+Ü?NVANI\s*:\s*([^\n]+)", raw, re.I)
+                m_alici = P.qnb_alici.search(raw)
                 if m_alici:
-                    self.data["alici"] = re.split(r"ALICI\s+IBAN|IBAN", m_alici.group(1), flags=re.I)[0].strip()
+                    self.data["alici"] = P.qnb_alici_iban_ayrac.split(m_alici.group(1))[0].strip()
                 else:
-                    m_alici2 = re.search(r"Alıcı\s*:\s*([^\n]+?)(?:\s+Türkiye|\s+TL|\s+IBAN|$)", raw, re.I)
+                    m_alici2 = P.qnb_alici2.search(raw)
                     if m_alici2: self.data["alici"] = m_alici2.group(1).strip()
 
-                m_a_iban = re.search(r"ALICI\s+IBAN\s*:\s*(TR[0-9 ]+)", raw, re.I)
+                m_a_iban = P.qnb_alici_iban.search(raw)
                 if m_a_iban:
                     self.data["aliciiban"] = m_a_iban.group(1).replace(" ", "").strip()
 
@@ -83,48 +126,50 @@ class EnparaParser(BaseParser):
             # 3 FARKLI DEKONTU OKUYAN ESKİ KODUN (BİRİNCİ KOD)
             # ---------------------------------------------------------
             # 2. Tarih
-            p1 = r"[İIıi]şlem\s+tarihi(?:\s+ve\s+saati)?\s*[:]\s*(\d{2}[./]\d{2}[./]\d{4})"
-            m = re.search(p1, raw, flags=re.IGNORECASE)
+            m = P.tarih.search(raw)
             if m: 
                 self.data["islemtarihi"] = m.group(1).replace("/", ".")
             else:
-                m = re.search(r"(\d{2}[./]\d{2}[./]\d{4})", raw)
+                m = P.tarih_genel.search(raw)
                 if m: self.data["islemtarihi"] = m.group(1).replace("/", ".")
 
             # 3. Tutar
-            m = re.search(r"TL\s*([\d\.,]+)", raw)
+            m = P.tutar.search(raw)
             if m:
                 self.data["tutar"] = parse_amount(m.group(1))
 
+            if self.can_stop(*PARTY_FIELDS):
+                return self.finalize()
+
             # 4. Giden İşlem
             if self.data["is_giden"]:
-                m = re.search(r"GÖNDEREN\s*:\s*([^\n]+)", raw)
+                m = P.giden_gonderen.search(raw)
                 if m: self.data["gonderen"] = m.group(1).split("AÇIKLAMA")[0].strip()
 
-                m = re.search(r"ALICI ÜNVANI\s*:\s*([^\n]+)", raw)
+                m = P.alici.search(raw)
                 if m:
                     name = m.group(1).split("IBAN")[0].strip()
-                    self.data["alici"] = re.sub(r'[,\.\s]*\bALICI\b[,\.\s]*$', '', name, flags=re.I).strip()
+                    self.data["alici"] = P.alici_son_ek.sub('', name).strip()
 
-                m = re.search(r"ALICI IBAN\s*:\s*(TR[0-9 ]+)", raw)
+                m = P.alici_iban.search(raw)
                 if m: self.data["aliciiban"] = m.group(1).replace(" ", "")
 
-                m = re.search(r"MÜŞTERİ ÜNVANI.*?IBAN\s*:\s*(TR[0-9 ]+)", raw, re.S)
+                m = P.gonderen_iban.search(raw)
                 if m: self.data["gondereniban"] = m.group(1).replace(" ", "")
 
             # 5. Gelen İşlem
             elif self.data["is_gelen"]:
-                m = re.search(r"Şube adı\s*:([^\n\r]+)", raw, flags=re.I)
+                m = P.sube_adi.search(raw)
                 if m:
                     line = m.group(1).strip()
-                    m2 = re.search(r"Sayın\s+(.+)", line, flags=re.I)
+                    m2 = P.sayin.search(line)
                     if m2: self.data["alici"] = m2.group(1).strip()
 
-                m_iban = re.search(r"(Vadesiz|Günlük)\s+TL\s+(TR[0-9 ]+)", raw, re.I)
+                m_iban = P.vadesiz_iban.search(raw)
                 if m_iban:
                     self.data["gondereniban"] = m_iban.group(2).replace(" ", "").strip()
                 
-                m_g = re.search(r"GÖNDEREN\s*:\s*([^\n]+)", raw, re.I)
+                m_g = P.gelen_gonderen.search(raw)
                 if m_g: self.data["gonderen"] = m_g.group(1).split("AÇIKLAMA")[0].strip()
 
         return self.finalize()
@@ -1,115 +1,151 @@
 # -*- coding: utf-8 -*-
 import re
-from parsers.base import BaseParser
+from fingerprint import Format, Formats
+from parsers.base import BaseParser, PARTY_FIELDS
+from patterns import table
 from utils import dbg, parse_amount
 
+P = table(
+    "garanti",
+    # _clean_name_line
+    bosluk=r"\s+",
+    yildiz_ayrac=r"\*{2,}\s*/\s*\*{2,}",
+    yildiz=r"\*{2,}",
+    musteri_no=(r"\bMÜŞTERİ(?:\s*NUMARASI|\s*NO)?\s*[:\-]?\s*\d+\b", re.I),
+    kimlik_no=(r"\b(TC|TCKN|VKN|SIRA\s*NO|SIRA)\s*[:\-]?\s*[\d\w\-\/]+\b", re.I),
+    bas_gurultu=r"^[\*\s\/\-\d]+",
+    sube_hesap=r"\b\d{2,6}\s*\/\s*\d{3,10}\b",
+    yildiz_onek=r"\*{2,}.*?(?=[A-ZÇĞİÖŞÜ])",
+    adres=(r"\b(MAH|MAH\.|SOK|SOK\.|CAD|CAD\.|SK|SK\.|NO:|NO|KAPI|BULVAR|BLV|APT|DAIRE|DAİRE)\b", re.I),
+    iban_sonrasi=(r"\bIBAN\b.*", re.I),
+    # genel
+    iban=(r"IBAN\s*[:]?\s*(TR[0-9 ]{20,34})", re.I),
+    tarih=(r"(İŞLEM|ISLEM)\s*TAR(İ|I)H(İ|I)\s*[: ]+(\d{2}[./]\d{2}[./]\d{4})", re.I),
+    tutar=(r"TUTAR\s*[:]?\s*[+\- ]*\s*([\d\.,]+)", re.I),
+    sayin=(r"SAYIN\s+([^\n\r]+)", re.I),
+    # etiket indeksinden gelen değerler (başından eşleşir)
+    tarih_degeri=r"(\d{2}[./]\d{2}[./]\d{4})",
+    iban_degeri=r"(TR[0-9 ]+)",
+    maskeli_iban_degeri=r"(TR[0-9 *]+)",
+)
+
+def _clean_name_line(s):
+    # İsim satırındaki yıldız maskeleri, müşteri/kimlik no, şube/hesap no ve adresi atar
+    if not s: return s
+    s = s.strip()
+    s = P.bosluk.sub(" ", s)
+    s = P.yildiz_ayrac.sub("", s)
+    s = P.yildiz.sub("", s)
+    s = P.musteri_no.sub("", s)
+    s = P.kimlik_no.sub("", s)
+    s = P.bas_gurultu.sub("", s)
+    s = P.sube_hesap.sub("", s)
+    s = P.yildiz_onek.sub("", s)
+    s = P.adres.split(s)[0].strip()
+    s = P.iban_sonrasi.sub("", s).strip()
+    return s
+
+# Sıra önemli: GELEN FAST yeni formatın anahtarı, FAST geçen diğerleri eski
+# giden FAST; maaş dekontu KURUM ya da MAAS ÖDEMESİ de içerir
+FORMATS = Formats(
+    Format("gelen_fast", when=("GELEN FAST",), tokens=("SAYIN", "IBAN", "TUTAR", "GÖNDEREN")),
+    Format("fast", when=("FAST",), tokens=("SAYIN", "IBAN", "TUTAR", "ALACAKLI", "ALACAKLI IBAN")),
+    Format("maas", when=("MAAŞ", "MAAS"), also=("KURUM", "MAAS ÖDEMESİ"), tokens=("ADI", "ALICI IBAN", "TUTAR")),
+    Format("havale", tokens=("HAVALE", "SAYIN", "TUTAR", "HESAP")),
+)
+
 class GarantiParser(BaseParser):
-    def __init__(self, text):
-        super().__init__(text, "garanti")
+    formats = FORMATS
+
+    def __init__(self, doc, fields=None):
+        super().__init__(doc, "garanti", fields)
 
     def parse(self):
         t = self.text
-        TU = self.up
-        
-        # --- Dahili Yardımcı Fonksiyon ---
-        def clean_name_line(s):
-            if not s: return s
-            s = s.strip()
-            s = re.sub(r"\s+", " ", s)
-            s = re.sub(r"\*{2,}\s*/\s*\*{2,}", "", s)
-            s = re.sub(r"\*{2,}", "", s)
-            s = re.sub(r"\bMÜŞTERİ(?:\s*NUMARASI|\s*NO)?\s*[:\-]?\s*\d+\b", "", s, flags=re.I)
-            s = re.sub(r"\b(TC|TCKN|VKN|SIRA\s*NO|SIRA)\s*[:\-]?\s*[\d\w\-\/]+\b", "", s, flags=re.I)
-            s = re.sub(r"^[\*\s\/\-\d]+", "", s)
-            s = re.sub(r"\b\d{2,6}\s*\/\s*\d{3,10}\b", "", s)
-            s = re.sub(r"\*{2,}.*?(?=[A-ZÇĞİÖŞÜ])", "", s)
-            s = re.split(r"\b(MAH|MAH\.|SOK|SOK\.|CAD|CAD\.|SK|SK\.|NO:|NO|KAPI|BULVAR|BLV|APT|DAIRE|DAİRE)\b", s, flags=re.I)[0].strip()
-            s = re.sub(r"\bIBAN\b.*", "", s, flags=re.I).strip()
-            return s
+        L = self.doc.labels
+        # Format Tespiti (dallanma aşağıda, 3. adımda)
+        fp = self.classify()
+        variant = fp.variant.name
 
         # 1. Genel Bilgiler
-        # IBAN: Hem tek satır hem de etiketli aramayı kapsar
-        m = re.search(r"IBAN\s*[:]?\s*(TR[0-9 ]{20,34})", t, re.I)
-        top_iban = m.group(1).replace(" ", "") if m else None
-
-        m = re.search(r"(İŞLEM|ISLEM)\s*TAR(İ|I)H(İ|I)\s*[: ]+(\d{2}[./]\d{2}[./]\d{4})", t, re.I)
+        m = P.tarih.search(t)
         if m: 
             self.data["islemtarihi"] = m.group(4).replace("/", ".")
         else:
-            m = re.search(r"DÜZENLENME TARİHİ\s*[:]\s*(\d{2}[./]\d{2}[./]\d{4})", t, re.I)
+            m = L.match(P.tarih_degeri, "DÜZENLENME TARİHİ")
             if m: self.data["islemtarihi"] = m.group(1).replace("/", ".")
 
         # Tutar Yakalama: SIRA NO içeren yeni satır yapısı için esnetildi
-        m = re.search(r"TUTAR\s*[:]?\s*[+\- ]*\s*([\d\.,]+)", t, re.I)
+        m = P.tutar.search(t)
         if m: self.data["tutar"] = parse_amount(m.group(1))
 
-        sayin = None
-        m = re.search(r"SAYIN\s+([^\n\r]+)", t, re.I)
-        if m: sayin = clean_name_line(m.group(1))
+        if self.can_stop(*PARTY_FIELDS):
+            return self.finalize()
+
+        # IBAN: Hem tek satır hem de etiketli aramayı kapsar
+        m = P.iban.search(t)
+        top_iban = m.group(1).replace(" ", "") if m else None
 
-        # 2. Format Tespiti
-        is_fast = "FAST" in TU
-        is_gelen_fast = "GELEN FAST" in TU # Yeni formatın anahtarı
-        is_maas = (("MAAŞ" in TU or "MAAS" in TU) and ("KURUM" in TU or "MAAS ÖDEMESİ" in TU))
-        has_borclu = ("BORÇLU" in TU) or ("BORCLU" in TU)
-        has_alacakli = "ALACAKLI" in TU
+        sayin = None
+        m = P.sayin.search(t)
+        if m: sayin = _clean_name_line(m.group(1))
 
         # 3. Branşlara Göre Ayrıştırma
-        if is_gelen_fast:
+        if variant == "gelen_fast":
             # --- YENİ GELEN FAST FORMATI ---
             # Bu formatta 'SAYIN' olan kişi ALICI'dır.
             if sayin: self.data["alici"] = sayin
             self.data["aliciiban"] = top_iban
             
-            m = re.search(r"GÖNDEREN\s*:\s*([^\n\r]+)", t, re.I)
-            if m: self.data["gonderen"] = clean_name_line(m.group(1))
+            v = L.first("GÖNDEREN")
+            if v: self.data["gonderen"] = _clean_name_line(v)
             
             # Gönderen IBAN bu dekontta genellikle yer almaz, alıcı IBAN'ı kaydedilir.
             self.data["gondereniban"] = ""
 
-        elif is_fast:
+        elif variant == "fast":
             # --- ESKİ GİDEN FAST FORMATI ---
             if sayin: self.data["gonderen"] = sayin
             if top_iban: self.data["gondereniban"] = top_iban
             
-            m = re.search(r"ALACAKLI\s*:\s*([^\n\r]+)", t, re.I)
-            if m: self.data["alici"] = clean_name_line(m.group(1))
-            m = re.search(r"ALACAKLI IBAN\s*:\s*(TR[0-9 ]+)", t)
+            v = L.first("ALACAKLI")
+            if v: self.data["alici"] = _clean_name_line(v)
+            m = L.match(P.iban_degeri, "ALACAKLI IBAN")
             self.data["aliciiban"] = m.group(1).replace(" ", "") if m else top_iban
         
-        elif is_maas:
+        elif variant == "maas":
             # --- MAAŞ FORMATI ---
 
             # Önce ADI satırını yakala (ŞUBE ADI hariç)
-            m = re.search(r"(?m)^\s*ADI\s*:\s*([^\n\r]+)", t, re.I)
-            if m:
-                self.data["alici"] = clean_name_line(m.group(1))
+            v = L.first("ADI", line_start=True)
+            if v:
+                self.data["alici"] = _clean_name_line(v)
             elif sayin:
                 self.data["alici"] = sayin
 
-            m = re.search(r"KURUM\s*:\s*([^\n\r]+)", t, re.I)
-            if m:
-                self.data["gonderen"] = clean_name_line(m.group(1))
+            v = L.first("KURUM")
+            if v:
+                self.data["gonderen"] = _clean_name_line(v)
 
-            m = re.search(r"ALICI\s*IBAN\s*:\s*(TR[0-9 ]+)", t)
+            m = L.match(P.iban_degeri, "ALICI IBAN")
             self.data["aliciiban"] = m.group(1).replace(" ", "") if m else top_iban
 
             self.data["gondereniban"] = ""
             
         else: # Havale Branch
-            if has_borclu:
-                m = re.search(r"BOR[ÇC]LU HESAP\s*:\s*([^\n\r]+)", t, re.I)
-                if m: self.data["gonderen"] = clean_name_line(m.group(1))
+            if fp.any(("BORÇLU", "BORCLU")):
+                v = L.first("BORÇLU HESAP")
+                if v: self.data["gonderen"] = _clean_name_line(v)
                 if sayin: self.data["alici"] = sayin
                 self.data["aliciiban"] = top_iban
                 self.data["gondereniban"] = ""
-            elif has_alacakli:
-                m = re.search(r"ALACAKLI HESAP\s*:\s*([^\n\r]+)", t, re.I)
-                if m: self.data["alici"] = clean_name_line(m.group(1))
-                m = re.search(r"ALACAKLI IBAN\s*:\s*(TR[0-9 ]+)", t)
+            elif fp.has("ALACAKLI"):
+                v = L.first("ALACAKLI HESAP")
+                if v: self.data["alici"] = _clean_name_line(v)
+                m = L.match(P.iban_degeri, "ALACAKLI IBAN")
                 self.data["aliciiban"] = m.group(1).replace(" ", "") if m else top_iban
                 if sayin: self.data["gonderen"] = sayin
-                m = re.search(r"BORÇLU IBAN\s*:\s*(TR[0-9 *]+)", t, re.I)
+                m = L.match(P.maskeli_iban_degeri, "BORÇLU IBAN")
                 if m: self.data["gondereniban"] = m.group(1).replace(" ", "").replace("*", "")
             else:
                 if sayin: self.data["alici"] = sayin
@@ -1,30 +1,40 @@
 # -*- coding: utf-8 -*-
 import re
-from parsers.base import BaseParser
+from parsers.base import BaseParser, PARTY_FIELDS
+from patterns import table
 from utils import parse_amount
 
+P = table(
+    "bilinmiyor",
+    tarih=r"(\d{2}[./]\d{2}[./]\d{4})",
+    tutar=(r"([\d\.,]+)\s*(?:TL|TRY|TUTAR)", re.I),
+)
+
 class GenericParser(BaseParser):
-    def __init__(self, text):
-        super().__init__(text, "bilinmiyor")
+    def __init__(self, doc, fields=None):
+        super().__init__(doc, "bilinmiyor", fields)
 
     def parse(self):
         t = self.text
         
         # 1. Genel Tarih Yakalama (31.10.2025 veya 31/10/2025)
-        m_date = re.search(r"(\d{2}[./]\d{2}[./]\d{4})", t)
+        m_date = P.tarih.search(t)
         if m_date:
             self.data["islemtarihi"] = m_date.group(1).replace("/", ".")
 
         # 2. Genel Tutar Yakalama (TL/TRY ibaresinden önceki rakamlar)
-        m_tutar = re.search(r"([\d\.,]+)\s*(?:TL|TRY|TUTAR)", t, re.I)
+        m_tutar = P.tutar.search(t)
         if m_tutar:
             self.data["tutar"] = parse_amount(m_tutar.group(1))
 
+        if self.can_stop(*PARTY_FIELDS):
+            return self.finalize()
+
         # 3. Genel IBAN Yakalama (İlk iki IBAN'ı gönderen/alıcı olarak ata)
-        ibans = re.findall(r"TR[0-9 ]{20,34}", t)
+        ibans = self.iban_candidates
         if ibans:
-            self.data["gondereniban"] = ibans[0].replace(" ", "").strip()[:26]
+            self.data["gondereniban"] = ibans[0]
             if len(ibans) > 1:
-                self.data["aliciiban"] = ibans[1].replace(" ", "").strip()[:26]
+                self.data["aliciiban"] = ibans[1]
 
         return self.finalize()
\ No newline at end of file
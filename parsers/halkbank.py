@@ -1,15 +1,34 @@
 # -*- coding: utf-8 -*-
 import re
-from parsers.base import BaseParser
+from parsers.base import BaseParser, PARTY_FIELDS
+from patterns import table
 from utils import parse_amount
 
+P = table(
+    "halkbank",
+    islem_tutari=(r"İŞLEM\s*TUTARI\s*(?:\(TL\))?\s*[:\-]?\s*([\d\.,]+)", re.I),
+    tl_tutar=(r"([\d\.,]+)\s*TL", re.I),
+    lehdar=r"LEHDAR\s*:\s*\d+\s*\n([^\n]+)",
+    bas_sayi=r"^\d+\s+",
+    amir=r"AM[İIıi]R\s*:[^\n]*\n([^\n]+)",
+    son_sayi=r"\s+\d{3,}$",
+    toplam=r"TOPLAM\s+([\d\.,]+)",
+    toplu_tarih=r"Tarih\s*:\s*(\d{2}/\d{2}/\d{4})",
+    # etiket indeksinden gelen değerler (başından eşleşir)
+    tarih_degeri=r"(\d{2}/\d{2}/\d{4})",
+    iban_degeri=r"(TR[0-9 ]+)",
+)
+
 class HalkbankParser(BaseParser):
-    def __init__(self, text):
-        super().__init__(text, "halkbank")
+    extract_backend = "pdfplumber"  # satır kırılımlarına göre çalışıyor
+
+    def __init__(self, doc, fields=None):
+        super().__init__(doc, "halkbank", fields)
 
     def parse(self):
         raw = self.text
         up = self.up
+        L = self.doc.labels
 
         if "FAST" in up:
             self.data["is_fast"] = True
@@ -17,35 +36,39 @@ class HalkbankParser(BaseParser):
             self.data["is_havale"] = True
 
         # --- Tarih ---
-        m = re.search(r"İŞLEM TARİHİ\s*:\s*(\d{2}/\d{2}/\d{4})", raw)
+        m = L.match(P.tarih_degeri, "İŞLEM TARİHİ")
         if m:
             self.data["islemtarihi"] = m.group(1).replace("/", ".")
 
         # --- Tutar ---
-        m = re.search(r"İŞLEM\s*TUTARI\s*(?:\(TL\))?\s*[:\-]?\s*([\d\.,]+)", raw, re.I)
+        m = P.islem_tutari.search(raw)
         if not m:
-            m = re.search(r"([\d\.,]+)\s*TL", raw, re.I)
+            m = P.tl_tutar.search(raw)
 
         if m:
             self.data["tutar"] = parse_amount(m.group(1))
 
+        # Aşağıdaki AMİR/LEHDAR bloğu tutar ve tarih için de yedek kaynak
+        if self.can_stop(*PARTY_FIELDS, "tutar", "islemtarihi"):
+            return self.finalize()
+
         # --- Gönderen ---
-        m = re.search(r"GÖNDEREN\s*:\s*([^\n]+)", raw)
-        if m:
-            self.data["gonderen"] = m.group(1).strip()
+        v = L.first("GÖNDEREN")
+        if v:
+            self.data["gonderen"] = v.strip()
 
         # --- Gönderen IBAN ---
-        m = re.search(r"GÖNDEREN IBAN\s*:\s*(TR[0-9 ]+)", raw)
+        m = L.match(P.iban_degeri, "GÖNDEREN IBAN")
         if m:
             self.data["gondereniban"] = m.group(1).replace(" ", "")
 
         # --- Alıcı ---
-        m = re.search(r"ALICI\s*:\s*([^\n]+)", raw)
-        if m:
-            self.data["alici"] = m.group(1).strip()
+        v = L.first("ALICI")
+        if v:
+            self.data["alici"] = v.strip()
 
         # --- Alıcı IBAN ---
-        m = re.search(r"ALICI IBAN\s*:\s*(TR[0-9 ]+)", raw)
+        m = L.match(P.iban_degeri, "ALICI IBAN")
         if m:
             self.data["aliciiban"] = m.group(1).replace(" ", "")
 
@@ -54,7 +77,7 @@ class HalkbankParser(BaseParser):
         # ======================================================
 
         # IBAN'ları sırayla yakala
-        ibans = re.findall(r"IBAN\s*:\s*(TR[0-9 ]+)", raw)
+        ibans = [m.group(1) for m in L.match_all(P.iban_degeri, "IBAN")]
 
         if ibans:
             if not self.data["gondereniban"]:
@@ -64,35 +87,35 @@ class HalkbankParser(BaseParser):
 
         # LEHDAR → alıcı
         if not self.data["alici"]:
-            m = re.search(r"LEHDAR\s*:\s*\d+\s*\n([^\n]+)", raw)
+            m = P.lehdar.search(raw)
             if m:
                 name = m.group(1).strip()
-                name = re.sub(r"^\d+\s+", "", name)   # baştaki sayıyı sil
+                name = P.bas_sayi.sub("", name)   # baştaki sayıyı sil
                 self.data["alici"] = name
 
         # AMİR → gönderen
         if not self.data["gonderen"]:
-            m = re.search(r"AM[İIıi]R\s*:[^\n]*\n([^\n]+)", raw)
+            m = P.amir.search(raw)
             if m:
                 line = m.group(1).strip()
 
                 # baştaki müşteri numarasını sil
-                line = re.sub(r"^\d+\s+", "", line)
+                line = P.bas_sayi.sub("", line)
 
                 # sondaki şube kodunu sil
-                line = re.sub(r"\s+\d{3,}$", "", line)
+                line = P.son_sayi.sub("", line)
 
                 self.data["gonderen"] = line
 
         # TOPLAM satırından tutar fallback
         if not self.data["tutar"]:
-            m = re.search(r"TOPLAM\s+([\d\.,]+)", raw)
+            m = P.toplam.search(raw)
             if m:
                 self.data["tutar"] = parse_amount(m.group(1))
 
         # Tarih fallback
         if not self.data["islemtarihi"]:
-            m = re.search(r"Tarih\s*:\s*(\d{2}/\d{2}/\d{4})", raw)
+            m = P.toplu_tarih.search(raw)
             if m:
                 self.data["islemtarihi"] = m.group(1).replace("/", ".")
 
@@ -1,69 +1,109 @@
 # -*- coding: utf-8 -*-
 import re
-import unicodedata
-from parsers.base import BaseParser
+from document import Document
+from fingerprint import Format, Formats
+from parsers.base import BaseParser, PARTY_FIELDS
+from patterns import table
 from utils import parse_amount, to_turkish_upper
 
+P = table(
+    "vakif",
+    havale=r"\bHAVALE\b",
+    eft=r"\bEFT\b",
+    maas=r"\bMAAŞ\b|\bMAAS\b|\bMAAŞ ÖDEMESİ\b",
+    gelen=r"\bGELEN\b",
+    giden=r"\bGİDEN\b|\bGIDEN\b",
+    tarih=(r"İŞLEM(?:\s+TARİHİ|\s+TARİHİ\s+)?\s*[:]*\s*([0-9]{2}[./][0-9]{2}[./][0-9]{4})", re.I),
+    islem_tutari=(r"İŞLEM\s*TUTARI\s*[:\-]?\s*([0-9\.,]+)\s*TL", re.I),
+    tl_tutar=(r"([0-9\.,]+)\s*TL", re.I),
+    alici=(r"ALICI AD SOYAD/UNVAN\s+([A-ZÇĞİÖŞÜa-zçğıöşü\s]+)", re.I),
+    iban_satiri=(r"^(TR[0-9 ]{10,34})\s*$", re.M),
+    hesap_no_satiri=(r"^\s*([0-9]{2,}\s*[0-9]{2,})\s*$", re.M),
+    maskeli_iban=r"TR[0-9 ]*\*+",
+    harf=r"[A-Za-zÇĞİÖŞÜçğışöüİ]",
+    iban_tam=r"^TR\d[\d ]+$",
+    etiket=(r"HESAP NUMARASI|ADSOYAD/UNVAN1|ADSOYAD|UNVAN1", re.I),
+    rakam_bosluk=r"[0-9 ]+",
+    musteri_unvani=(r"MÜŞTERİ\s+ÜNVANI\s*[:\-]?\s*([^\n\r]+)", re.I),
+)
+
+# Tür 1: maskeli gönderen IBAN'ı, tür 2: ADSOYAD/UNVAN1 etiketi, tür 3: GÖNDEREN
+# AD SOYAD başlığı. Tür 2/3 satır döngüleri etiketleri belgede yoksa hiç çalışmaz.
+# Bu iki etikette "i" olmadığı için up'ta aramak satırların tr büyük harfiyle aynı
+# sonucu verir, tüm belgenin tr_up'ı hesaplanmaz.
+FORMATS = Formats(
+    Format("tur1", when=(P.maskeli_iban,), tokens=("İŞLEM TUTARI", "ALICI AD SOYAD/UNVAN")),
+    Format("tur2", when=("ADSOYAD/UNVAN1",), tokens=("HESAP NUMARASI", "İŞLEM TARİHİ")),
+    Format("tur3", when=("GÖNDEREN AD SOYAD",), tokens=("İŞLEM TUTARI", "ALICI AD SOYAD", "MÜŞTERİ ÜNVANI")),
+    Format("default", tokens=("VAKIFBANK", "İŞLEM TARİHİ", "İŞLEM TUTARI")),
+)
+
 class VakifBankParser(BaseParser):
-    def __init__(self, text):
-        normalized_text = unicodedata.normalize("NFKC", text)
-        super().__init__(normalized_text, "vakifbank")
+    extract_backend = "pdfplumber"  # satır kırılımlarına göre çalışıyor
+    formats = FORMATS
+
+    def __init__(self, doc, fields=None):
+        super().__init__(Document.of(doc).nfkc, "vakifbank", fields)
 
     def parse(self):
         t = self.text
         TU = self.up
+        fp = self.classify()
         
         # 1. Tür Tespiti
-        if re.search(r"\bHAVALE\b", TU): self.data["is_havale"] = True
-        if re.search(r"\bEFT\b", TU): self.data["is_eft"] = True
-        if re.search(r"\bMAAŞ\b|\bMAAS\b|\bMAAŞ ÖDEMESİ\b", TU): self.data["is_maas"] = True
-        if re.search(r"\bGELEN\b", TU): self.data["is_gelen"] = True
-        if re.search(r"\bGİDEN\b|\bGIDEN\b", TU): self.data["is_giden"] = True
+        if P.havale.search(TU): self.data["is_havale"] = True
+        if P.eft.search(TU): self.data["is_eft"] = True
+        if P.maas.search(TU): self.data["is_maas"] = True
+        if P.gelen.search(TU): self.data["is_gelen"] = True
+        if P.giden.search(TU): self.data["is_giden"] = True
 
         # 2. Tarih ve Tutar
-        m_date = re.search(r"İŞLEM(?:\s+TARİHİ|\s+TARİHİ\s+)?\s*[:]*\s*([0-9]{2}[./][0-9]{2}[./][0-9]{4})", t, flags=re.I)
+        m_date = P.tarih.search(t)
         if m_date: self.data["islemtarihi"] = m_date.group(1).replace("/", ".")
 
-        m_tutar = re.search(r"İŞLEM\s*TUTARI\s*[:\-]?\s*([0-9\.,]+)\s*TL", t, flags=re.I)
-        if not m_tutar: m_tutar = re.search(r"([0-9\.,]+)\s*TL", t, flags=re.I)
+        m_tutar = P.islem_tutari.search(t)
+        if not m_tutar: m_tutar = P.tl_tutar.search(t)
         if m_tutar: self.data["tutar"] = parse_amount(m_tutar.group(1))
 
+        if self.can_stop(*PARTY_FIELDS):
+            return self.finalize()
+
         # 3. Alıcı (eski yöntem)
-        m_alici = re.search(r"ALICI AD SOYAD/UNVAN\s+([A-ZÇĞİÖŞÜa-zçğıöşü\s]+)", t, flags=re.I)
+        m_alici = P.alici.search(t)
         if m_alici: self.data["alici"] = m_alici.group(1).strip()
 
         # IBAN birleştirme
-        m_top = re.search(r"^(TR[0-9 ]{10,34})\s*$", t, flags=re.M)
-        m_bottom = re.search(r"^\s*([0-9]{2,}\s*[0-9]{2,})\s*$", t, flags=re.M)
+        m_top = P.iban_satiri.search(t)
+        m_bottom = P.hesap_no_satiri.search(t)
         if m_top and m_bottom:
             self.data["aliciiban"] = (m_top.group(1).replace(" ", "") + m_bottom.group(1).replace(" ", "")).strip()
 
         # Maskeli gönderen
-        lines = [ln.strip() for ln in t.splitlines()]
+        lines = self.doc.stripped_lines
         for i, ln in enumerate(lines):
-            if re.search(r"TR[0-9 ]*\*+", ln):
+            if P.maskeli_iban.search(ln):
                 if i > 0:
                     prev = lines[i-1].strip()
-                    if re.search(r"[A-Za-zÇĞİÖŞÜçğışöüİ]", prev):
+                    if P.harf.search(prev):
                         self.data["gonderen"] = prev
                 break
 
         # ----------------------------------------------------
         # FORMAT TÜR 2 (eski kod - aynen duruyor)
         # ----------------------------------------------------
-        if self.data["gonderen"] == "":
-            lines = [l.strip() for l in t.splitlines() if l.strip()]
+        if self.data["gonderen"] == "" and fp.has("ADSOYAD/UNVAN1"):
+            lines = self.doc.nonempty_lines
 
             for i, ln in enumerate(lines):
-                if re.match(r"^TR\d[\d ]+$", ln):
+                if P.iban_tam.match(ln):
                     iban_part1 = ln.replace(" ", "")
                     
                     if i+1 < len(lines) and "ADSOYAD/UNVAN1" in to_turkish_upper(lines[i+1]):
-                        name = re.sub(r"HESAP NUMARASI|ADSOYAD/UNVAN1|ADSOYAD|UNVAN1", "", lines[i+1], flags=re.I).strip()
+                        name = P.etiket.sub("", lines[i+1]).strip()
                         
                         self.data["gonderen"] = name
                         
-                        if i+2 < len(lines) and re.fullmatch(r"[0-9 ]+", lines[i+2]):
+                        if i+2 < len(lines) and P.rakam_bosluk.fullmatch(lines[i+2]):
                             self.data["gondereniban"] = iban_part1 + lines[i+2].replace(" ", "")
                         else:
                             self.data["gondereniban"] = iban_part1
@@ -75,8 +115,8 @@ class VakifBankParser(BaseParser):
         # ----------------------------------------------------
         # ✅ FORMAT TÜR 3 (YENİ EKLENEN - ALT SATIR İSİM)
         # ----------------------------------------------------
-        if self.data["gonderen"] == "" and self.data["alici"] == "":
-            lines = [l.strip() for l in t.splitlines() if l.strip()]
+        if self.data["gonderen"] == "" and self.data["alici"] == "" and fp.has("GÖNDEREN AD SOYAD"):
+            lines = self.doc.nonempty_lines
             
             for i, ln in enumerate(lines):
                 if "GÖNDEREN AD SOYAD" in to_turkish_upper(ln):
@@ -108,7 +148,7 @@ class VakifBankParser(BaseParser):
 
         # 5. Gelen işlem
         if self.data["is_gelen"]:
-            m_mus = re.search(r"MÜŞTERİ\s+ÜNVANI\s*[:\-]?\s*([^\n\r]+)", t, flags=re.I)
+            m_mus = P.musteri_unvani.search(t)
             if m_mus: self.data["alici"] = m_mus.group(1).strip()
 
         # 6. Final
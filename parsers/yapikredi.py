@@ -1,71 +1,114 @@
 # -*- coding: utf-8 -*-
 import re
-from parsers.base import BaseParser
+from fingerprint import Format, Formats
+from parsers.base import BaseParser, PARTY_FIELDS
+from patterns import table
 from utils import parse_amount, to_turkish_upper
 
+P = table(
+    "yapikredi",
+    ticari_unvan=(r"\n([A-ZÇĞİÖŞÜ\s]+)\s+Ticari Unvan", re.I),
+    alacakli_iban_no=(r"IBAN NO\s*:\s*(TR[0-9 ]+)", re.I),
+    alacakli_iban=(r"ALACAKLI HESAP\s*:[^:]*IBAN\s*:\s*(TR[0-9 ]+)", re.I),
+    satir_tutar=r"(\d{1,3}(?:\.\d{3})*,\d{2})",
+    satir_tarih=r"(\d{2}/\d{2}/\d{4})",
+    satir_unvan=(r"TL\s+([A-ZÇĞİÖŞÜ\s]+?)\s+\d+", re.I),
+    gonderen=(r"GÖNDEREN\s*ADI\s*:\s*(.+?)(?=\s*ÖDEMENİN|\s*ALICI|$)", re.I),
+    odeme_yapan=(r"ÖDEME\s*YAPAN\s*İSİM/ÜNVAN\s*:\s*(.+?)(?=\s*YUKARIDAKİ|$)", re.I),
+    alici=(r"ALICI\s*ADI\s*:\s*(.+?)(?=\s*ALICI\s*TCKN|\s*AÇIKLAMA|$)", re.I),
+    aciklama_unvan=(r"AÇIKLAMA:.*?/\s*([A-ZÇĞİÖŞÜ\s]+?)(?=\s*Ticari\s*Unvan|$)", re.I),
+    gonderen_iban=(r"GÖNDEREN\s+HESAP\s+NO\s*:[^:]*IBAN\s*:\s*(TR[0-9 ]+)", re.I),
+    alici_iban=(r"ALICI\s+HESAP\s*:\s*(TR[0-9 ]+)", re.I),
+    # etiket indeksinden gelen değerler (başından eşleşir)
+    tarih_degeri=r"(\d{2}\.\d{2}\.\d{4})",
+    tutar_degeri=r"-?([\d\.,]+)",
+    isaretli_tutar_degeri=r"(-?[\d\.,]+)",
+)
+
+# gelen ve default aynı standart dekont kodundan geçer, gelen'de yön ters
+FORMATS = Formats(
+    Format("havale_borc", when=("HESAPTAN HESABA HAVALE-BORÇ",),
+           tokens=("İŞLEM TARİHİ", "ISLEM TUTARI", "IBAN NO", "ALACAKLI ADI", "TİCARİ UNVAN")),
+    Format("maas_raporu", when=("MAAŞ ÖDEME RAPORU", "FIRMA ÜNVANI"), tokens=("ÖDENDİ",)),
+    Format("gelen", when=("ALACAK DEKONTU", "ÖDEME YAPAN"), tokens=("İŞLEM TARİHİ", "TUTAR", "ÖDEME YAPAN")),
+    Format("default", tokens=("İŞLEM TARİHİ", "TUTAR", "GÖNDEREN ADI", "ALICI ADI", "ALICI HESAP")),
+    view="flat_tr_up",
+)
+
 class YapiKrediParser(BaseParser):
-    def __init__(self, text):
-        super().__init__(text, "yapikredi")
+    extract_backend = "pdfplumber"  # satır kırılımlarına göre çalışıyor
+    needs_all_pages = True  # MAAŞ ÖDEME RAPORU satırları sayfalar boyunca devam eder
+    formats = FORMATS
+
+    def __init__(self, doc, fields=None):
+        super().__init__(doc, "yapikredi", fields)
 
     def parse(self):
         raw = self.text
-        lines = raw.split('\n')
-        clean_raw = raw.replace("\n", "  ").replace("\t", " ")
-        up = to_turkish_upper(clean_raw)
+        lines = self.doc.lines
+        clean_raw = self.doc.flat
+        up = self.doc.flat_tr_up
+        L = self.doc.labels
+        variant = self.classify().variant.name
 
         # 🎯 YENİ FORMAT: HESAPTAN HESABA HAVALE-BORÇ (2026 e-dekont)
-        if "HESAPTAN HESABA HAVALE-BORÇ" in up:
-
+        if variant == "havale_borc":
             self.data["is_giden"] = True
 
             # tutar
-            m_t = re.search(r"ISLEM TUTARI\s*:\s*-?([\d\.,]+)", clean_raw, re.I)
+            m_t = L.match(P.tutar_degeri, "ISLEM TUTARI")
             if m_t:
                 self.data["tutar"] = parse_amount(m_t.group(1))
 
             # tarih
-            m_dt = re.search(r"İŞLEM TARİHİ\s*:\s*(\d{2}\.\d{2}\.\d{4})", clean_raw, re.I)
+            m_dt = L.match(P.tarih_degeri, "İŞLEM TARİHİ")
             if m_dt:
                 self.data["islemtarihi"] = m_dt.group(1)
 
+            if self.can_stop(*PARTY_FIELDS):
+                return self.finalize()
+
             # gönderen (footer’dan kesin yakalama)
-            m_g = re.search(r"\n([A-ZÇĞİÖŞÜ\s]+)\s+Ticari Unvan", raw, re.I)
+            m_g = P.ticari_unvan.search(raw)
             if m_g:
                 self.data["gonderen"] = to_turkish_upper(m_g.group(1).strip())
 
             # alıcı (net alan var)
-            m_a = re.search(r"ALACAKLI ADI\s*:\s*([^\n\r]+)", raw, re.I)
-            if m_a:
-                self.data["alici"] = to_turkish_upper(m_a.group(1).strip())
+            v = L.first("ALACAKLI ADI")
+            if v:
+                self.data["alici"] = to_turkish_upper(v.strip())
 
             # IBAN
-            m_gi = re.search(r"IBAN NO\s*:\s*(TR[0-9 ]+)", clean_raw, re.I)
+            m_gi = P.alacakli_iban_no.search(clean_raw)
             if m_gi:
                 self.data["gondereniban"] = m_gi.group(1).replace(" ", "")[:26]
 
-            m_ai = re.search(r"ALACAKLI HESAP\s*:[^:]*IBAN\s*:\s*(TR[0-9 ]+)", clean_raw, re.I)
+            m_ai = P.alacakli_iban.search(clean_raw)
             if m_ai:
                 self.data["aliciiban"] = m_ai.group(1).replace(" ", "")[:26]
 
             return self.finalize()
 
         # --- BURADAN AŞAĞISI SENİN ESKİ KODUN ---
-        if "MAAŞ ÖDEME RAPORU" in up or "FIRMA ÜNVANI" in up:
+        if variant == "maas_raporu":
             self.data["is_maas"] = True
             self.data["is_giden"] = True
             
-            m_firma = re.search(r"Firma Ünvanı\s*:\s*([^\n\r]+)", raw, re.I)
-            if m_firma: self.data["gonderen"] = to_turkish_upper(m_firma.group(1).strip())
-            
+            if self.wants("gonderen"):
+                v = L.first("Firma Ünvanı")
+                if v: self.data["gonderen"] = to_turkish_upper(v.strip())
+
+            # Rapor satırlarında son eşleşen satır kazanır; erken çıkış yok
+            want_alici = self.wants("alici")
             for line in lines:
                 if "ÖDENDİ" in line.upper() or "ÖDEMESİ" in line.upper():
-                    m_val = re.search(r"(\d{1,3}(?:\.\d{3})*,\d{2})", line)
+                    m_val = P.satir_tutar.search(line)
                     if m_val: self.data["tutar"] = parse_amount(m_val.group(1))
                     
-                    m_dt = re.search(r"(\d{2}/\d{2}/\d{4})", line)
+                    m_dt = P.satir_tarih.search(line)
                     if m_dt: self.data["islemtarihi"] = m_dt.group(1).replace("/", ".")
                     
-                    m_name = re.search(r"TL\s+([A-ZÇĞİÖŞÜ\s]+?)\s+\d+", line, re.I)
+                    m_name = want_alici and P.satir_unvan.search(line)
                     if m_name: self.data["alici"] = to_turkish_upper(m_name.group(1).strip())
             
             return self.finalize()
@@ -75,30 +118,33 @@ class YapiKrediParser(BaseParser):
         if "EFT" in up: self.data["is_eft"] = True
         if "MAAŞ" in up or "MAAS" in up: self.data["is_maas"] = True
         
-        if "ALACAK DEKONTU" in up or "ÖDEME YAPAN" in up:
+        if variant == "gelen":
             self.data["is_gelen"] = True
             self.data["is_giden"] = False
         else:
             self.data["is_giden"] = True
 
-        m_date = re.search(r"İŞLEM\s*TARİHİ\s*:\s*(\d{2}\.\d{2}\.\d{4})", clean_raw, re.I)
+        m_date = L.match(P.tarih_degeri, "İŞLEM TARİHİ")
         if m_date: self.data["islemtarihi"] = m_date.group(1)
 
-        m_tutar = re.search(r"TUTARI?\s*:\s*(-?[\d\.,]+)", clean_raw, re.I)
+        m_tutar = L.match(P.isaretli_tutar_degeri, "TUTAR", "TUTARI")
         if m_tutar:
             val = m_tutar.group(1).replace("-", "").strip()
             self.data["tutar"] = parse_amount(val)
 
-        m_g1 = re.search(r"GÖNDEREN\s*ADI\s*:\s*(.+?)(?=\s*ÖDEMENİN|\s*ALICI|$)", clean_raw, re.I)
-        m_g2 = re.search(r"ÖDEME\s*YAPAN\s*İSİM/ÜNVAN\s*:\s*(.+?)(?=\s*YUKARIDAKİ|$)", clean_raw, re.I)
+        if self.can_stop(*PARTY_FIELDS):
+            return self.finalize()
+
+        m_g1 = P.gonderen.search(clean_raw)
+        m_g2 = P.odeme_yapan.search(clean_raw)
         self.data["gonderen"] = to_turkish_upper((m_g1.group(1) if m_g1 else m_g2.group(1) if m_g2 else "").strip())
 
-        m_a1 = re.search(r"ALICI\s*ADI\s*:\s*(.+?)(?=\s*ALICI\s*TCKN|\s*AÇIKLAMA|$)", clean_raw, re.I)
-        m_a2 = re.search(r"AÇIKLAMA:.*?/\s*([A-ZÇĞİÖŞÜ\s]+?)(?=\s*Ticari\s*Unvan|$)", clean_raw, re.I)
+        m_a1 = P.alici.search(clean_raw)
+        m_a2 = P.aciklama_unvan.search(clean_raw)
         self.data["alici"] = to_turkish_upper((m_a1.group(1) if m_a1 else m_a2.group(1) if m_a2 else "").strip())
 
-        m_sender_iban = re.search(r"GÖNDEREN\s+HESAP\s+NO\s*:[^:]*IBAN\s*:\s*(TR[0-9 ]+)", clean_raw, re.I)
-        m_receiver_iban = re.search(r"ALICI\s+HESAP\s*:\s*(TR[0-9 ]+)", clean_raw, re.I)
+        m_sender_iban = P.gonderen_iban.search(clean_raw)
+        m_receiver_iban = P.alici_iban.search(clean_raw)
 
         if m_sender_iban:
             self.data["gondereniban"] = m_sender_iban.group(1).replace(" ", "").strip()[:26]
@@ -106,9 +152,8 @@ class YapiKrediParser(BaseParser):
             self.data["aliciiban"] = m_receiver_iban.group(1).replace(" ", "").strip()[:26]
 
         if not self.data["is_giden"]:
-            current_ibans = re.findall(r"TR[0-9 ]{20,34}", clean_raw)
-            if current_ibans:
-                self.data["gondereniban"] = current_ibans[0].replace(" ", "").strip()[:26]
+            if self.iban_candidates:
+                self.data["gondereniban"] = self.iban_candidates[0]
                 self.data["aliciiban"] = ""
 
         return self.finalize()
@@ -0,0 +1,177 @@
+# -*- coding: utf-8 -*-
+import os
+import re
+import threading
+import time
+
+# Parser regex'leri modül seviyesinde, banka başına bir tabloda derlenir:
+#
+#   P = table("garanti", tarih=(r"İŞLEM TARİHİ\s*:\s*(...)", re.I), ...)
+#   m = P.tarih.search(t)
+#
+# Normalde tablo düz re.Pattern nesneleri tutar (ek maliyet yok).
+# PARSER_PATTERN_STATS=1 ile (ya da instrument(True)) her pattern çağrı
+# sayısını, eşleşme oranını ve toplam süresini sayan bir sarmalayıcıyla
+# değiştirilir; report() en yavaş ve hiç eşleşmeyen pattern'leri listeler.
+PATTERN_STATS = os.environ.get("PARSER_PATTERN_STATS", "0") == "1"
+
+_TABLES = {}
+_lock = threading.Lock()
+
+
+class CountedPattern:
+    __slots__ = ("name", "regex", "calls", "matches", "seconds")
+
+    def __init__(self, name, regex):
+        self.name = name
+        self.regex = regex
+        self.calls = self.matches = 0
+        self.seconds = 0.0
+
+    @property
+    def pattern(self):
+        return self.regex.pattern
+
+    @property
+    def flags(self):
+        return self.regex.flags
+
+    def _record(self, start, matched):
+        self.seconds += time.perf_counter() - start
+        self.calls += 1
+        if matched:
+            self.matches += 1
+
+    def search(self, string, *args):
+        start = time.perf_counter()
+        m = self.regex.search(string, *args)
+        self._record(start, m is not None)
+        return m
+
+    def match(self, string, *args):
+        start = time.perf_counter()
+        m = self.regex.match(string, *args)
+        self._record(start, m is not None)
+        return m
+
+    def fullmatch(self, string, *args):
+        start = time.perf_counter()
+        m = self.regex.fullmatch(string, *args)
+        self._record(start, m is not None)
+        return m
+
+    def findall(self, string, *args):
+        start = time.perf_counter()
+        found = self.regex.findall(string, *args)
+        self._record(start, bool(found))
+        return found
+
+    def finditer(self, string, *args):
+        # Süre tüm eşleşmeler için ölçülsün diye liste üzerinden döner
+        start = time.perf_counter()
+        found = list(self.regex.finditer(string, *args))
+        self._record(start, bool(found))
+        return iter(found)
+
+    def sub(self, repl, string, count=0):
+        start = time.perf_counter()
+        out, n = self.regex.subn(repl, string, count)
+        self._record(start, n > 0)
+        return out
+
+    def split(self, string, maxsplit=0):
+        start = time.perf_counter()
+        parts = self.regex.split(string, maxsplit)
+        self._record(start, len(parts) > 1)
+        return parts
+
+
+class PatternTable:
+    def __init__(self, bank, patterns):
+        self.bank = bank
+        self._compiled = {}
+        self._counted = {}
+        for name, spec in patterns.items():
+            pattern, flags = spec if isinstance(spec, tuple) else (spec, 0)
+            regex = re.compile(pattern, flags)
+            self._compiled[name] = regex
+            self._counted[name] = CountedPattern(name, regex)
+        self._apply(PATTERN_STATS)
+
+    def _apply(self, counted):
+        for name in self._compiled:
+            setattr(self, name, self._counted[name] if counted else self._compiled[name])
+
+    def name_of(self, regex):
+        # Tablodaki pattern'in (düz ya da sayaçlı hali) adı; tabloda yoksa None
+        for name, compiled in self._compiled.items():
+            if regex is compiled or regex is self._counted[name]:
+                return name
+        return None
+
+    def add(self, name, regex):
+        # Başka yerde derlenen bir regex'i tabloya ekler (ör. spec.py'nin
+        # etiket tarayıcısı); sayaçlar ve raporda diğerleri gibi görünür
+        self._compiled[name] = regex
+        self._counted[name] = CountedPattern(name, regex)
+        setattr(self, name, self._counted[name] if PATTERN_STATS else regex)
+
+    def stats(self):
+        return [
+            {"bank": self.bank, "name": p.name, "calls": p.calls, "matches": p.matches,
+             "match_rate": round(p.matches / p.calls, 4) if p.calls else None,
+             "total_ms": round(p.seconds * 1000, 4),
+             "avg_us": round(p.seconds / p.calls * 1e6, 3) if p.calls else None}
+            for p in self._counted.values()
+        ]
+
+    def reset(self):
+        for p in self._counted.values():
+            p.calls = p.matches = 0
+            p.seconds = 0.0
+
+
+def table(bank, **patterns):
+    # Banka başına bir tablo; parser modülü import edilirken derlenir
+    t = PatternTable(bank, patterns)
+    with _lock:
+        _TABLES[bank] = t
+    return t
+
+
+def instrument(enabled=True):
+    # Tüm tabloları sayaçlı/sayaçsız hale getirir (sonradan yüklenen tablolar PATTERN_STATS'e uyar)
+    global PATTERN_STATS
+    PATTERN_STATS = enabled
+    for t in list(_TABLES.values()):
+        t._apply(enabled)
+
+
+def reset():
+    for t in list(_TABLES.values()):
+        t.reset()
+
+
+def stats():
+    out = []
+    for bank in sorted(_TABLES):
+        out.extend(_TABLES[bank].stats())
+    return out
+
+
+def report(top=5):
+    # {banka: {"slowest": [...], "never_matched": [...], "unused": [...]}}
+    # never_matched: çağrıldı ama hiç eşleşmedi; unused: hiç çağrılmadı
+    out = {}
+    for row in stats():
+        bank = out.setdefault(row["bank"], {"total_ms": 0.0, "slowest": [], "never_matched": [], "unused": []})
+        bank["total_ms"] = round(bank["total_ms"] + row["total_ms"], 4)
+        if not row["calls"]:
+            bank["unused"].append(row["name"])
+            continue
+        bank["slowest"].append(row)
+        if not row["matches"]:
+            bank["never_matched"].append(row["name"])
+    for bank in out.values():
+        bank["slowest"] = sorted(bank["slowest"], key=lambda r: -r["total_ms"])[:top]
+    return out
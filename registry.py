@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+import importlib
+import threading
+import time
+
+# banka_tespit anahtarı -> (modül, sınıf). Modüller ilk kullanımda yüklenir;
+# worker'lar warmup() ile hepsini baştan yükler.
+PARSERS = {
+    "enpara": ("parsers.enpara", "EnparaParser"),
+    "garanti": ("parsers.garanti", "GarantiParser"),
+    "vakif": ("parsers.vakif", "VakifBankParser"),
+    "yapikredi": ("parsers.yapikredi", "YapiKrediParser"),
+    "ziraat": ("parsers.ziraat", "ZiraatParser"),
+    "akbank": ("parsers.akbank", "AkbankParser"),
+    "isbank": ("parsers.isbank", "IsBankParser"),
+    "denizbank": ("parsers.denizbank", "DenizbankParser"),
+    "halkbank": ("parsers.halkbank", "HalkbankParser"),
+    "ing": ("parsers.ing", "IngParser"),
+    "teb": ("parsers.teb", "TebParser"),
+    "kuveytturk": ("parsers.kuveytturk", "KuveytTurkParser"),
+    "vakifkatilim": ("parsers.vakifkatilim", "VakifKatilimParser"),
+    "bilinmiyor": ("parsers.generic", "GenericParser"),
+}
+
+# Parser dışında worker'ın ilk işte ödemesin diye baştan yüklenen ağır modüller
+WARM_MODULES = ("pdfplumber", "fitz")
+
+_loaded = {}
+_import_seconds = {}
+_lock = threading.Lock()
+_warmup = {"ready": False, "seconds": None}
+
+
+def _import(module):
+    start = time.perf_counter()
+    mod = importlib.import_module(module)
+    _import_seconds.setdefault(module, time.perf_counter() - start)
+    return mod
+
+
+def get(bank_key):
+    # Parser sınıfı; bilinmeyen anahtar için None
+    cls = _loaded.get(bank_key)
+    if cls is None and bank_key in PARSERS:
+        module, name = PARSERS[bank_key]
+        with _lock:
+            cls = _loaded.get(bank_key)
+            if cls is None:
+                cls = _loaded[bank_key] = getattr(_import(module), name)
+    return cls
+
+
+def warmup():
+    # Tüm parser modüllerini ve extract kütüphanelerini yükler, her parser'ı
+    # boş bir belgeyle bir kez çalıştırarak regex'lerini derletir. Tekrar
+    # çağrılırsa bir şey yapmaz.
+    if _warmup["ready"]:
+        return status()
+    from document import Document
+
+    start = time.perf_counter()
+    for module in WARM_MODULES:
+        try:
+            _import(module)
+        except ImportError:
+            pass
+    for key in PARSERS:
+        cls = get(key)
+        try:
+            cls(Document("")).parse()
+        except Exception:
+            pass
+    _warmup["seconds"] = round(time.perf_counter() - start, 4)
+    _warmup["ready"] = True
+    return status()
+
+
+def ready():
+    return _warmup["ready"]
+
+
+def status():
+    return {
+        "ready": _warmup["ready"],
+        "warmup_seconds": _warmup["seconds"],
+        "loaded": sorted(_loaded),
+        "import_seconds": {m: round(s, 4) for m, s in sorted(_import_seconds.items())},
+    }
@@ -0,0 +1,146 @@
+# -*- coding: utf-8 -*-
+import json
+
+try:
+    import orjson
+except ImportError:  # opsiyonel; yoksa stdlib json
+    orjson = None
+
+# Parser sonucu. Her dekont için yeni bir 13 anahtarlı dict yerine alanlar
+# sabit slot'larda durur; parser'lar dict gibi kullanır (data["tutar"] = ...,
+# data.get("alici")). Set edilmemiş slot çıktıda yoktur: is_eft/aciklama
+# sadece yazan bankalarda, fields= projeksiyonunda sadece istenenler görünür.
+# Süreç havuzundan ana sürece ve cache'e anahtar isimleri olmadan
+# (bit maskesi + değerler) taşınır.
+KEYS = ("banka", "is_fast", "is_havale", "is_maas", "is_gelen", "is_giden", "gonderen", "gondereniban",
+        "alici", "aliciiban", "tutar", "islemtarihi", "is_eft", "aciklama")
+_SLOTS = frozenset(KEYS)
+_MISSING = object()
+
+
+class Result:
+    # _extra: slot dışındaki nadir anahtarlar (_debug_raw, _debug, raw_preview)
+    __slots__ = KEYS + ("_extra",)
+
+    def __init__(self, banka=None):
+        # Parser'ların başlangıç hali; banka verilmezse boş sonuç
+        self._extra = None
+        if banka is None:
+            return
+        self.banka = banka
+        self.is_fast = self.is_havale = self.is_maas = self.is_gelen = self.is_giden = False
+        self.gonderen = self.gondereniban = self.alici = self.aliciiban = ""
+        self.tutar = self.islemtarihi = ""
+
+    @classmethod
+    def of(cls, mapping):
+        r = cls()
+        for k, v in mapping.items():
+            r[k] = v
+        return r
+
+    def copy(self):
+        return Result.of(self)
+
+    def __getitem__(self, key):
+        if key in _SLOTS:
+            value = getattr(self, key, _MISSING)
+            if value is not _MISSING:
+                return value
+        elif self._extra is not None and key in self._extra:
+            return self._extra[key]
+        raise KeyError(key)
+
+    def __setitem__(self, key, value):
+        if key in _SLOTS:
+            setattr(self, key, value)
+        elif self._extra is None:
+            self._extra = {key: value}
+        else:
+            self._extra[key] = value
+
+    def get(self, key, default=None):
+        if key in _SLOTS:
+            return getattr(self, key, default)
+        return self._extra.get(key, default) if self._extra is not None else default
+
+    def pop(self, key, default=None):
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            return default
+        if key in _SLOTS:
+            delattr(self, key)
+        else:
+            del self._extra[key]
+        return value
+
+    def __contains__(self, key):
+        return self.get(key, _MISSING) is not _MISSING
+
+    def keys(self):
+        out = [k for k in KEYS if hasattr(self, k)]
+        if self._extra:
+            out.extend(self._extra)
+        return out
+
+    def __iter__(self):
+        return iter(self.keys())
+
+    def __len__(self):
+        return len(self.keys())
+
+    def items(self):
+        return self.to_dict().items()
+
+    def values(self):
+        return self.to_dict().values()
+
+    def to_dict(self):
+        out = {}
+        for k in KEYS:
+            value = getattr(self, k, _MISSING)
+            if value is not _MISSING:
+                out[k] = value
+        if self._extra:
+            out.update(self._extra)
+        return out
+
+    def __eq__(self, other):
+        if isinstance(other, (Result, dict)):
+            return self.to_dict() == dict(other)
+        return NotImplemented
+
+    def __repr__(self):
+        return f"Result({self.to_dict()!r})"
+
+    def __reduce__(self):
+        mask, values = 0, []
+        for i, k in enumerate(KEYS):
+            value = getattr(self, k, _MISSING)
+            if value is not _MISSING:
+                mask |= 1 << i
+                values.append(value)
+        return _restore, (mask, tuple(values), self._extra)
+
+
+def _restore(mask, values, extra):
+    r = Result()
+    it = iter(values)
+    for i, k in enumerate(KEYS):
+        if mask >> i & 1:
+            setattr(r, k, next(it))
+    r._extra = extra
+    return r
+
+
+def _default(obj):
+    if isinstance(obj, Result):
+        return obj.to_dict()
+    raise TypeError(f"JSON'a çevrilemiyor: {type(obj).__name__}")
+
+
+def dumps(obj):
+    # Result / dict -> JSON bytes (orjson varsa onunla)
+    if orjson is not None:
+        return orjson.dumps(obj, default=_default)
+    return json.dumps(obj, ensure_ascii=False, default=_default).encode("utf-8")
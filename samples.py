@@ -0,0 +1,53 @@
+# -*- coding: utf-8 -*-
+import os
+import random
+import threading
+import time
+import zlib
+from collections import deque
+
+# Ham metin örnekleri. Dekont metni yanıtlara gömülmez (yük ve PII); parse
+# edilen dekontların bir kısmı sınırlı bir halka tamponda zlib ile sıkıştırılmış
+# olarak tutulur ve /debug/samples ile okunur.
+#   PARSER_DEBUG_SAMPLE       örnekleme oranı 0..1 (varsayılan 0: kapalı);
+#                             açıkken banka tespit edilemeyenler ve format
+#                             parmak izi skoru düşük olanlar (PARSER_LOW_CONFIDENCE)
+#                             her zaman alınır
+#   PARSER_DEBUG_SAMPLE_SIZE  tamponda tutulan en fazla örnek
+#   PARSER_DEBUG_SAMPLE_CHARS örnek başına en fazla karakter
+SAMPLE_RATE = float(os.environ.get("PARSER_DEBUG_SAMPLE", "0"))
+SAMPLE_SIZE = int(os.environ.get("PARSER_DEBUG_SAMPLE_SIZE", "100"))
+SAMPLE_CHARS = int(os.environ.get("PARSER_DEBUG_SAMPLE_CHARS", "2000"))
+
+_buffer = deque(maxlen=SAMPLE_SIZE)
+_lock = threading.Lock()
+
+
+def take(text, unknown=False):
+    # Worker'da çağrılır: örneklenecekse sıkıştırılmış metin, değilse None
+    if SAMPLE_RATE <= 0 or not (unknown or random.random() < SAMPLE_RATE):
+        return None
+    return zlib.compress(text[:SAMPLE_CHARS].encode("utf-8"))
+
+
+def record(trace):
+    # Ana süreçte: trace'le gelen örneği tampona ekler (en eskisi düşer)
+    data = trace.get("sample")
+    if data:
+        with _lock:
+            _buffer.append((time.time(), trace["bank"], trace["branch"], trace.get("confidence"), data))
+
+
+def dump():
+    # En yeni örnek başta
+    with _lock:
+        items = list(_buffer)
+    return [{"time": ts, "bank": bank, "branch": branch, "confidence": confidence,
+             "text": zlib.decompress(data).decode("utf-8")}
+            for ts, bank, branch, confidence, data in reversed(items)]
+
+
+def stats():
+    with _lock:
+        return {"rate": SAMPLE_RATE, "size": SAMPLE_SIZE, "count": len(_buffer),
+                "compressed_bytes": sum(len(item[-1]) for item in _buffer)}
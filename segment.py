@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+import registry
+from detect import HEADER_LINES, detect_bank, header_bank
+from document import Document
+
+# Çok dekontlu PDF'ler (toplu e-dekont dökümleri, maaş ödeme raporları) için
+# bölütleme. İki seviye:
+#   sayfa: bir bankanın dekont başlığı olarak tanınan her sayfa yeni bir
+#          dekont başlatır; diğerleri (hesap hareketi, devam sayfası) önceki
+#          dekontun devamı sayılır. Banka adının gövdede (ör. alt bilgide)
+#          geçmesi yetmez: banka sayfanın header'ında (ilk 10 satır)
+#          tanınmalı, parser'ın parmak izi varsa (fingerprint.Formats)
+#          seçilen varyantın kelimelerinden biri de header'da geçmeli.
+#   blok : tek dekontun içinde işlemleri satır satır listeleyen formatlar
+#          (Yapı Kredi maaş ödeme raporu) "başlık + tek işlem satırı"
+#          metinlerine bölünür, her biri ayrı sonuç verir.
+
+
+def _starts_receipt(page):
+    doc = Document(page)
+    bank = detect_bank(doc)
+    if bank == "bilinmiyor" or header_bank(doc) != bank:
+        return False
+    formats = getattr(registry.get(bank), "formats", None)
+    if formats is None:
+        return True
+    fp = formats.classify(Document("\n".join(page.split("\n", HEADER_LINES)[:HEADER_LINES])))
+    return any(fp.any(group) for group in fp.variant.features)
+
+
+def page_segments(pages):
+    # pages: PageReader sayfaları (normalleştirilmiş; boş sayfalar None)
+    # -> [(başlangıç, bitiş)], bitiş hariç
+    starts = [0]
+    for i in range(1, len(pages)):
+        if pages[i] and _starts_receipt(pages[i]):
+            starts.append(i)
+    return list(zip(starts, starts[1:] + [len(pages)]))
+
+
+def _yapikredi_maas_raporu(text):
+    # YapiKrediParser'ın maas_raporu dalıyla aynı satır koşulu
+    up = text.upper()
+    if "MAAŞ ÖDEME RAPORU" not in up and "FIRMA ÜNVANI" not in up:
+        return None
+    lines = text.split("\n")
+    items = [i for i, line in enumerate(lines) if "ÖDENDİ" in line.upper() or "ÖDEMESİ" in line.upper()]
+    if len(items) < 2:
+        return None
+    skip = set(items)
+    head = [line for i, line in enumerate(lines) if i not in skip]
+    return ["\n".join(head + [lines[i]]) for i in items]
+
+
+# banka -> metni bloklara bölen fonksiyon (bölünmüyorsa None döner)
+BLOCK_SPLITTERS = {
+    "yapikredi": _yapikredi_maas_raporu,
+}
+
+
+def blocks(bank, text):
+    splitter = BLOCK_SPLITTERS.get(bank)
+    return (splitter(text) if splitter else None) or [text]
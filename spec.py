@@ -0,0 +1,223 @@
+# -*- coding: utf-8 -*-
+import re
+
+from labels import label_initials, label_regex, line_value
+
+# Bildirimsel dekont formatları. Parser elle dallanma ve alan başına regex
+# araması yerine formatı tarif eder:
+#
+#   P = table("ziraat", tutar_degeri=r"([\d\.,]+)", ...)
+#   SPEC = Spec("ziraat",
+#       variant("havale", when=("HESAPTAN HESABA HAVALE",), fields=(
+#           label("tutar", "Havale Tutarı", P.tutar_degeri, parse_amount),
+#           ...)),
+#       variant("fast", fields=(...)),
+#       patterns=P)
+#
+#   class ZiraatParser(SpecParser):
+#       spec = SPEC
+#
+# variant(ad, when, flags, always, fields): when'deki kelimelerden biri geçerse
+# bu varyant seçilir (sırayla; when'i boş olan varsayılandır). flags:
+# {bayrak: kelimeler}, kelimelerden biri geçerse True; always: her zaman True.
+# Kelimeler büyük harf metinde (Document.up) sabit alt dizgi olarak aranır.
+#
+# Alan türleri (her alanda ilk başarılı eşleşme kazanır):
+#   label(alan, etiket, pattern, dönüşüm)
+#       "ETİKET : değer", LabelIndex ile aynı kural: satırın geri kalanı, satır
+#       boşsa sonraki boş olmayan satır. pattern verilirse değerin başından
+#       eşleşmeli, ilk grubu alınır (L.match gibi).
+#   after(alan, etiket, pattern, dönüşüm, upper=False)
+#       Etiketin hemen arkasından pattern (re.I, satır sonunu geçebilir), ilk
+#       grubu alınır; upper=True: büyük harf metinde.
+#   join(alan, etiket, until, dönüşüm)
+#       Etiketten until etiketlerinden ilkine kadar olan (çok satırlı) metin,
+#       boşluklar teke indirilmiş.
+# Etiketler labels.py'deki gibi büyük/küçük harf, Türkçe aksan ve kelime arası
+# boşluktan bağımsız eşleşir.
+#
+# patterns: bankanın patterns.table'ı. Alanların pattern'leri tablodan
+# verilir ve tarama anında tablodan adıyla okunur; her varyantın etiket
+# tarayıcısı da tabloya "spec_<varyant>" adıyla eklenir. Böylece
+# PARSER_PATTERN_STATS / patterns.instrument() sayaçları spec parser'larını
+# da kapsar.
+#
+# Varyant önce (kelimeleri `in` ile, C hızında) seçilir; varyantın tüm
+# etiketleri tek bir regex'te derlenmiştir ve belge bir kez, baştan sona
+# taranır: alan sayısı kadar tam metin araması yerine tek geçiş, Python'a
+# sadece etiket eşleşmelerinde dönülür. İstenen alanların hepsi bulununca
+# tarama durur (çok sayfalı belgelerde hesap hareketi sayfalarına inilmez).
+# Etiketler çakışmadan eşleşir; uzun bir etiketin içindeki kısa etiket (ör.
+# "Alacaklı IBAN :" içindeki "IBAN :") ayrıca tetiklenmez. Ziraat'te gönderen
+# IBAN'ı bu yüzden sadece kendi "IBAN :" satırından okunur; eski regex araması
+# alacaklı satırı önce geldiğinde alıcının IBAN'ını alıyordu. Varyant ve bayrak
+# kelimeleri etiketlerle aynı metni paylaşabildiği için (ör. "HAVALE TUTARI")
+# taramaya katılmaz.
+
+
+class _Field:
+    __slots__ = ("name", "kind", "label", "pattern", "convert", "until", "upper", "table", "ref")
+
+    def __init__(self, name, kind, label, pattern=None, convert=None, until=(), upper=False):
+        self.name = name
+        self.kind = kind
+        self.label = label
+        # pattern: regex kaynağı (re.I ile derlenir) ya da derlenmiş pattern
+        self.pattern = re.compile(pattern, re.I) if isinstance(pattern, str) else pattern
+        self.convert = convert
+        self.until = until
+        self.upper = upper
+        self.table = self.ref = None
+
+    def bind(self, table):
+        # pattern tablodansa tarama anında oradan (sayaçlıysa sayaçlı hali) okunur
+        self.ref = table.name_of(self.pattern) if self.pattern is not None else None
+        if self.ref is not None:
+            self.table = table
+
+    def regex(self):
+        return self.pattern if self.ref is None else getattr(self.table, self.ref)
+
+    def token(self):
+        return label_regex(self.label) + (r"\s*:" if self.kind == "label" else "")
+
+    def value(self, text, up, end):
+        # Etiket eşleşmesinin bittiği yerden değer; eşleşmezse None
+        if self.kind == "label":
+            value = line_value(text, end)
+            if self.pattern is not None:
+                m = self.regex().match(value)
+                if not m:
+                    return None
+                value = m.group(1)
+        else:
+            m = self.regex().match(up if self.upper else text, end)
+            if not m:
+                return None
+            value = m.group(1)
+        return self.convert(value) if self.convert else value
+
+    def joined(self, value):
+        value = " ".join(value.split())
+        return self.convert(value) if self.convert else value
+
+
+def label(name, label, pattern=None, convert=None):
+    return _Field(name, "label", label, pattern, convert)
+
+
+def after(name, label, pattern, convert=None, upper=False):
+    return _Field(name, "after", label, pattern, convert, upper=upper)
+
+
+def join(name, label, until, convert=None):
+    return _Field(name, "join", label, convert=convert, until=tuple(until))
+
+
+class _Variant:
+    __slots__ = ("name", "when", "flags", "always", "fields", "names", "_source", "_regex", "_regex_i",
+                 "_actions", "_table", "_ref")
+
+    def __init__(self, name, when, flags, always, fields):
+        self.name = name
+        self.when = tuple(when)
+        self.flags = dict(flags or {})
+        self.always = tuple(always)
+        self.fields = tuple(fields)
+        # Aynı alanın birden çok etiketi olabilir (ilk bulunan kazanır)
+        self.names = frozenset(f.name for f in self.fields)
+        # Etiket regex kaynağı -> (o etiketle okunan alanlar, o etiketle kapanan join'ler)
+        tokens = {}
+        initials = set()
+        for f in self.fields:
+            tokens.setdefault(f.token(), ([], []))[0].append(f)
+            initials.add(label_initials(f.label))
+            for end in f.until:
+                tokens.setdefault(label_regex(end), ([], []))[1].append(f)
+                initials.add(label_initials(end))
+        # Aynı konumda eşleşen etiketlerden uzun olan kazansın. Baştaki ilk harf
+        # sınıfı sre'nin etiket olamayacak konumları hızla atlamasını sağlar
+        # (alternation için bunu kendisi çıkarmıyor).
+        order = sorted(tokens, key=len, reverse=True)
+        self._source = "(?=[" + "".join(sorted(initials)) + "])(?:" + "|".join(f"({src})" for src in order) + ")"
+        self._regex = re.compile(self._source)
+        self._regex_i = None
+        # Grup numarası (m.lastindex) -> eylemler
+        self._actions = [None] + [tokens[src] for src in order]
+        self._table = None
+        self._ref = f"spec_{name}"
+
+    def bind(self, table):
+        for f in self.fields:
+            f.bind(table)
+        table.add(self._ref, self._regex)
+        self._table = table
+
+    def _haystack(self, doc):
+        # Konumlar metinle birebir olmalı; "ß" -> "SS" gibi uzunluk değiştiren
+        # harf varsa tarama metnin kendisinde re.I ile yapılır (LabelIndex gibi)
+        text, up = doc.text, doc.up
+        if len(up) == len(text):
+            if self._table is not None:
+                return getattr(self._table, self._ref), up
+            return self._regex, up
+        if self._regex_i is None:
+            self._regex_i = re.compile(self._source, re.I)
+        return self._regex_i, text
+
+    def scan(self, doc, fields=None):
+        text = doc.text
+        regex, hay = self._haystack(doc)
+        wanted = len(self.names if fields is None else self.names & fields)
+        values = {}
+        opened = {}
+        for m in regex.finditer(hay):
+            reads, closes = self._actions[m.lastindex]
+            for f in closes:
+                start = opened.pop(f.name, None)
+                if start is not None:
+                    values[f.name] = f.joined(text[start:m.start()])
+            for f in reads:
+                name = f.name
+                if name in values or name in opened or (fields is not None and name not in fields):
+                    continue
+                if f.kind == "join":
+                    opened[name] = m.end()
+                    continue
+                value = f.value(text, hay, m.end())
+                if value is not None:
+                    values[name] = value
+            if len(values) == wanted:
+                # İstenen alanların hepsi bulundu; belgenin gerisine bakılmaz
+                break
+        return values
+
+
+def variant(name="default", when=(), flags=None, always=(), fields=()):
+    return _Variant(name, when, flags, always, fields)
+
+
+class Spec:
+    def __init__(self, bank, *variants, patterns=None):
+        # bank: sonuçtaki banka adı; patterns: bankanın patterns.table'ı
+        self.bank = bank
+        self.variants = variants
+        if patterns is not None:
+            for v in variants:
+                v.bind(patterns)
+
+    def scan(self, doc, fields=None):
+        # Document -> (varyant adı, True olan bayraklar, {alan: değer}, güven).
+        # fields: sadece bu alanlar çıkarılır (None: hepsi). Güven: varyantın
+        # istenen alanlarından bulunanların oranı; varyant seçilemediyse 0
+        up = doc.up
+        for v in self.variants:
+            if not v.when or any(word in up for word in v.when):
+                break
+        else:
+            return self.variants[-1].name, (), {}, 0.0
+        flags = list(v.always)
+        flags.extend(flag for flag, words in v.flags.items() if any(word in up for word in words))
+        values = v.scan(doc, fields)
+        wanted = len(v.names if fields is None else v.names & fields)
+        return v.name, flags, values, round(len(values) / wanted, 3) if wanted else 1.0
@@ -7,11 +7,16 @@ def to_turkish_upper(text):
     mapping = {"i": "İ", "ı": "I", "ğ": "Ğ", "ü": "Ü", "ş": "Ş", "ö": "Ö", "ç": "Ç"}
     return "".join(mapping.get(c, c.upper()) for c in text)
 
-def normalize_text(t):
-    if not t: return ""
+def normalize_page(t):
+    # normalize_text'in strip'siz hali. Sayfalar ayrı ayrı normalleştirilip
+    # "\n" ile birleştirilince tüm metni normalleştirmekle aynı sonuç çıkar.
     t = unicodedata.normalize("NFKC", t)
     t = t.replace("\u00A0", " ")
-    return re.sub(r"[ \t]+", " ", t).strip()
+    return re.sub(r"[ \t]+", " ", t)
+
+def normalize_text(t):
+    if not t: return ""
+    return normalize_page(t).strip()
 
 def parse_amount(s):
     if not s: